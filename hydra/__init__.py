@@ -5,12 +5,26 @@ A Python3 tool for evaluating design systems.
 
 from flask import Flask
 
+from hydra.cli import build_command, hydra_command
+from hydra.internal import blueprint as internal_blueprint
+from hydra.utils.highlight_utils import configure_highlight_cache
+from hydra.utils.markdown_utils import (
+    configure_markdown,
+    configure_parallel_highlighting,
+)
+from hydra.utils.profile_utils import init_profiling
+from hydra.utils.pygments_utils import preload_lexers
+from hydra.utils.section_utils import configure_section_rendering
+from hydra.utils.timing_utils import init_timings
+from hydra.utils.warm_utils import init_cache_warming
+
 
 __version__ = '0.1.0'
 
 
 def create_app(injected_config=None):
     app = Flask(__name__, instance_relative_config=True)
+    app.config.from_object('hydra.defaults')
     app.config.from_mapping(SECRET_KEY='dev')
 
     if injected_config is None:
@@ -18,9 +32,53 @@ def create_app(injected_config=None):
     else:
         app.config.from_mapping(injected_config)
 
+    preload_lexers(app.config['HYDRA_PRELOAD_LANGUAGES'])
+    configure_highlight_cache(
+        app,
+        max_entries=app.config['HYDRA_HIGHLIGHT_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['HYDRA_HIGHLIGHT_CACHE_MAX_BYTES'],
+        directory=app.config['HYDRA_HIGHLIGHT_CACHE_DIR'],
+        max_disk_bytes=app.config['HYDRA_HIGHLIGHT_CACHE_MAX_DISK_BYTES'],
+        backend=app.config['HYDRA_CACHE_BACKEND'],
+        path=app.config['HYDRA_CACHE_PATH'],
+    )
+    configure_markdown(
+        app,
+        extensions=app.config['HYDRA_MARKDOWN_EXTENSIONS'],
+        extension_configs=app.config['HYDRA_MARKDOWN_EXTENSION_CONFIGS'],
+    )
+    configure_parallel_highlighting(
+        app,
+        executor=app.config['HYDRA_HIGHLIGHT_EXECUTOR'],
+        max_workers=app.config['HYDRA_HIGHLIGHT_WORKERS'],
+        min_blocks=app.config['HYDRA_HIGHLIGHT_PARALLEL_MIN_BLOCKS'],
+        min_bytes=app.config['HYDRA_HIGHLIGHT_PARALLEL_MIN_BYTES'],
+    )
+
+    configure_section_rendering(
+        app,
+        max_entries=app.config['HYDRA_SECTION_CACHE_MAX_ENTRIES'],
+        max_bytes=app.config['HYDRA_SECTION_CACHE_MAX_BYTES'],
+        min_sections=app.config['HYDRA_SECTION_MIN_SECTIONS'],
+        extensions=app.config['HYDRA_MARKDOWN_EXTENSIONS'],
+    )
+
+    if app.config['HYDRA_SERVER_TIMING']:
+        init_timings(app)
+
+    if app.config['HYDRA_PROFILE']:
+        init_profiling(app)
+
+    app.register_blueprint(internal_blueprint)
+    app.cli.add_command(build_command)
+    app.cli.add_command(hydra_command)
+
     # Application views, configuration will be defined here.
     @app.route('/')
     def index():
         return 'Greetings, programs!'
 
+    if app.config['HYDRA_WARM_CACHE']:
+        init_cache_warming(app)
+
     return app
@@ -0,0 +1,5 @@
+"""
+Benchmarks for the Hydra rendering pipeline.
+
+Run the suite using `python -m hydra.bench`.
+"""
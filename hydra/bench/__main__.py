@@ -0,0 +1,148 @@
+"""
+Runs the Hydra rendering benchmarks.
+
+Usage:
+
+    python -m hydra.bench [--sizes small,medium] [--filter render_page]
+        [--repeat 5] [--output results.json]
+        [--baseline baseline.json] [--threshold 0.1] [--memory]
+
+Writes the results as JSON to the output file, or to stdout. If a baseline
+is given, exits with a non-zero status if any benchmark's median duration
+regressed by more than the threshold. With --memory, reports the memory
+allocated and retained by each benchmark, by stage, instead of timing it.
+"""
+
+
+from argparse import ArgumentParser, ArgumentTypeError
+from json import dump, load
+from sys import stderr, stdout
+
+from hydra.bench.documents import DEFAULT_SIZES, SIZES
+from hydra.bench.suite import compare_results, run_memory_suite, run_suite
+
+
+def _positive_int(value: str) -> int:
+    number = int(value)
+
+    if number < 1:
+        raise ArgumentTypeError(f'must be at least 1, got {number}')
+
+    return number
+
+
+def _parse_arguments(argv: list[str] | None):
+    parser = ArgumentParser(
+        prog='python -m hydra.bench',
+        description='Benchmarks the Hydra rendering pipeline.',
+    )
+    parser.add_argument(
+        '--sizes',
+        default=','.join(DEFAULT_SIZES),
+        help='Comma-separated synthetic document sizes (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--filter',
+        default=None,
+        help='Only run benchmarks whose names contain this string.'
+    )
+    parser.add_argument(
+        '--repeat',
+        default=5,
+        type=_positive_int,
+        help='The number of timed runs per benchmark (default: %(default)s).'
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Write the JSON results to this file instead of stdout.'
+    )
+    parser.add_argument(
+        '--baseline',
+        default=None,
+        help='Compare the results against a saved JSON results file.'
+    )
+    parser.add_argument(
+        '--threshold',
+        default=0.1,
+        type=float,
+        help='The allowed slowdown against the baseline (default: 0.1).'
+    )
+    parser.add_argument(
+        '--memory',
+        action='store_true',
+        help='Report the memory allocated by each stage instead of timings.'
+    )
+
+    return parser.parse_args(argv)
+
+
+def _report_memory_result(result: dict) -> None:
+    print(
+        f"{result['peak'] / 1024:>10.1f} KiB peak  "
+        f"{result['retained'] / 1024:>10.1f} KiB retained  {result['name']}",
+        file=stderr
+    )
+
+
+def _report_result(result: dict) -> None:
+    print(
+        f"{result['median'] * 1000:>10.3f} ms  {result['name']}",
+        file=stderr
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = _parse_arguments(argv)
+    sizes = [size for size in arguments.sizes.split(',') if size]
+
+    for size in sizes:
+        if size not in SIZES:
+            print(f'Unknown size {size!r}', file=stderr)
+
+            return 2
+
+    if arguments.memory:
+        results = run_memory_suite(
+            sizes=sizes,
+            pattern=arguments.filter,
+            on_result=_report_memory_result,
+        )
+    else:
+        results = run_suite(
+            sizes=sizes,
+            pattern=arguments.filter,
+            repeat=arguments.repeat,
+            on_result=_report_result,
+        )
+
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            dump(results, file, indent=2)
+    else:
+        dump(results, stdout, indent=2)
+        stdout.write('\n')
+
+    if arguments.memory or not arguments.baseline:
+        return 0
+
+    with open(arguments.baseline, encoding='utf-8') as file:
+        baseline = load(file)
+
+    comparisons = compare_results(results, baseline, arguments.threshold)
+    regressions = [
+        comparison for comparison in comparisons if comparison['regressed']
+    ]
+
+    for comparison in regressions:
+        print(
+            f"Regression: {comparison['name']} took "
+            f"{comparison['ratio']:.2f}x the baseline median",
+            file=stderr
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
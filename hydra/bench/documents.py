@@ -0,0 +1,126 @@
+from itertools import cycle
+
+
+DEFAULT_LANGUAGES = ('python', 'javascript', 'ruby', 'bash', 'html', '')
+
+DEFAULT_SIZES = ('small', 'medium', 'large')
+
+# Synthetic document shapes, from a short reference page to a generated API
+# reference. The huge size is not run by default.
+SIZES = {
+    'small': {
+        'headings': 5,
+        'depth': 2,
+        'blocks': 2,
+        'block_lines': 5,
+    },
+    'medium': {
+        'headings': 25,
+        'depth': 3,
+        'blocks': 20,
+        'block_lines': 15,
+    },
+    'large': {
+        'headings': 100,
+        'depth': 4,
+        'blocks': 100,
+        'block_lines': 25,
+    },
+    'huge': {
+        'headings': 400,
+        'depth': 5,
+        'blocks': 400,
+        'block_lines': 40,
+    },
+}
+
+_CODE_LINES = {
+    'python': "value_{index} = compute('{name}', retries={index})",
+    'javascript': "const value{index} = compute('{name}', {index});",
+    'ruby': "value_{index} = compute('{name}', retries: {index})",
+    'bash': "pip install '{name}=={index}.0' --quiet",
+    'html': '<button class="{name}" data-index="{index}">Button</button>',
+    '': 'Plain text line {index} for {name}.',
+}
+
+
+def _generate_code_block(index: int, language: str, lines: int) -> str:
+    template = _CODE_LINES.get(language, _CODE_LINES[''])
+    code = '\n'.join(
+        template.format(index=line, name=f'component-{index}')
+        for line in range(lines)
+    )
+
+    return f'```{language}\n{code}\n```'
+
+
+def generate_document(
+    headings: int = 10,
+    depth: int = 3,
+    blocks: int = 5,
+    block_lines: int = 10,
+    languages: tuple[str, ...] = DEFAULT_LANGUAGES,
+) -> str:
+    """
+    Generates a synthetic Markdown document.
+
+    The headings cycle through levels h2 to h(depth + 1), each followed by a
+    paragraph. The code blocks are spread evenly between the headings, and
+    cycle through the given languages.
+
+    Arguments:
+        headings (int): The number of headings, excluding the title.
+        depth (int): The number of heading levels below the title.
+        blocks (int): The number of fenced code blocks.
+        block_lines (int): The number of lines in each code block.
+        languages (tuple[str, ...]): The language identifiers for the code
+            blocks. An empty string generates an unhighlighted block.
+
+    Returns:
+        str: The generated document.
+    """
+    sections = ['# Synthetic Reference Page']
+    language_cycle = cycle(languages)
+    block_index = 0
+
+    for index in range(max(headings, 1)):
+        if index < headings:
+            level = 2 + index % max(depth, 1)
+            sections.append(f"{'#' * level} Example Section {index}")
+
+        sections.append(
+            f'Section {index} describes the *component* and its `options`, '
+            'with a [link](#top) for good measure.'
+        )
+
+        # Spread the blocks across the sections.
+        target = (index + 1) * blocks // max(headings, 1)
+
+        while block_index < target:
+            sections.append(
+                _generate_code_block(
+                    block_index,
+                    next(language_cycle),
+                    block_lines
+                )
+            )
+            block_index += 1
+
+    return '\n\n'.join(sections) + '\n'
+
+
+def generate_documents(sizes: list[str] | None = None) -> dict[str, str]:
+    """
+    Generates the synthetic documents for the named sizes.
+
+    Arguments:
+        sizes (list[str] | None): The names of the sizes to generate, from
+            SIZES. Defaults to DEFAULT_SIZES.
+
+    Returns:
+        dict[str, str]: The generated documents, by size.
+    """
+    if sizes is None:
+        sizes = DEFAULT_SIZES
+
+    return {size: generate_document(**SIZES[size]) for size in sizes}
@@ -0,0 +1,589 @@
+"""
+Load tests Hydra applications under concurrent requests.
+
+Usage:
+
+    python -m hydra.bench.loadtest [scenario.json] [--target client]
+        [--output results.json]
+
+Each workload in the scenario is run against a new application, through
+the in-process WSGI test client, a local HTTP server, or both. Writes the
+throughput, latency percentiles and per-stage Server-Timing breakdowns as
+JSON to the output file, or to stdout.
+
+A scenario is a JSON object:
+
+    {
+        "config": {"HYDRA_PAGE_CACHE_MAX_ENTRIES": 256},
+        "sizes": ["small", "huge"],
+        "pages": {"/small": "bench/small.md", "/huge": "bench/huge.md"},
+        "workloads": [
+            {
+                "name": "warm-mixed",
+                "cache": "warm",
+                "pages": {"/small": 9, "/huge": 1},
+                "requests": 500,
+                "concurrency": 8
+            }
+        ]
+    }
+
+The config is passed to create_app(). The sizes are synthetic documents
+(see hydra.bench.documents), available as the templates "bench/<size>.md",
+and the pages map URL paths to the templates they render. Each workload
+requests its pages, a list or a mapping of paths to relative weights, in a
+seeded random order. Warm workloads request each page once before timing,
+while cold workloads disable the page, navigation, section, fragment and
+highlight caches.
+"""
+
+
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from http.client import HTTPConnection
+from json import dump, load
+from platform import platform, python_version
+from random import Random
+from statistics import mean
+from sys import stderr, stdout
+from threading import Thread
+from time import perf_counter
+from typing import Callable, Iterator, NamedTuple
+
+import flask
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from hydra.bench.documents import SIZES, generate_documents
+from hydra.bench.suite import build_app
+from hydra.utils.response_utils import render_page_response
+from hydra.utils.version_utils import render_version
+
+
+TARGETS = ('client', 'server')
+
+# Disables every rendering cache, so each request runs the full pipeline.
+COLD_CONFIG = {
+    'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_NAVIGATION_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_SECTION_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_FRAGMENT_CACHE_DIR': None,
+    'HYDRA_HIGHLIGHT_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_HIGHLIGHT_CACHE_DIR': None,
+}
+
+DEFAULT_SCENARIO = {
+    'config': {},
+    'sizes': ['small', 'large'],
+    'pages': {
+        '/small': 'bench/small.md',
+        '/large': 'bench/large.md',
+    },
+    'workloads': [
+        {
+            'name': 'warm-small',
+            'cache': 'warm',
+            'pages': ['/small'],
+            'requests': 200,
+            'concurrency': 8,
+        },
+        {
+            'name': 'warm-mixed',
+            'cache': 'warm',
+            'pages': {'/small': 9, '/large': 1},
+            'requests': 200,
+            'concurrency': 8,
+        },
+        {
+            'name': 'cold-mixed',
+            'cache': 'cold',
+            'pages': {'/small': 9, '/large': 1},
+            'requests': 10,
+            'concurrency': 2,
+        },
+    ],
+}
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    # Request logging would dominate the measured latency.
+
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+class Sample(NamedTuple):
+    """
+    The outcome of a single request.
+
+    Arguments:
+        latency (float): The time until the response was read, in seconds.
+        status (int | None): The response status, or None if the request
+            failed.
+        stages (dict[str, float]): The stage durations reported in the
+            Server-Timing header, in seconds.
+    """
+    latency: float
+    status: int | None
+    stages: dict[str, float]
+
+
+def _client_requester(app: flask.Flask) -> Callable[[], Callable]:
+    def create():
+        client = app.test_client()
+
+        def request(path: str) -> tuple[int, str | None]:
+            response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+            response.get_data()
+
+            return (
+                response.status_code,
+                response.headers.get('Server-Timing')
+            )
+
+        return request
+
+    return create
+
+
+def _distribution(values: list[float]) -> dict:
+    ordered = sorted(values)
+
+    return {
+        'mean': mean(ordered) if ordered else 0.0,
+        'p50': _percentile(ordered, 50),
+        'p95': _percentile(ordered, 95),
+        'p99': _percentile(ordered, 99),
+        'max': ordered[-1] if ordered else 0.0,
+    }
+
+
+def _page_sequence(pages: list | dict, requests: int, seed: int) -> list[str]:
+    if isinstance(pages, dict):
+        paths, weights = list(pages), list(pages.values())
+    else:
+        paths, weights = list(pages), None
+
+    return Random(seed).choices(paths, weights=weights, k=requests)
+
+
+def _parse_arguments(argv: list[str] | None):
+    parser = ArgumentParser(
+        prog='python -m hydra.bench.loadtest',
+        description='Load tests Hydra applications.',
+    )
+    parser.add_argument(
+        'scenario',
+        nargs='?',
+        default=None,
+        help='The JSON scenario file. Defaults to a built-in scenario.'
+    )
+    parser.add_argument(
+        '--target',
+        choices=TARGETS,
+        action='append',
+        default=None,
+        help='Run against the test client or a local server (default: both).'
+    )
+    parser.add_argument(
+        '--workload',
+        action='append',
+        default=None,
+        help='Only run the workloads with these names.'
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help='Write the JSON results to this file instead of stdout.'
+    )
+
+    return parser.parse_args(argv)
+
+
+def _parse_server_timing(header: str | None) -> dict[str, float]:
+    stages = {}
+
+    if not header:
+        return stages
+
+    for metric in header.split(','):
+        name, *parameters = metric.strip().split(';')
+
+        for parameter in parameters:
+            key, _, value = parameter.strip().partition('=')
+
+            if key == 'dur':
+                try:
+                    stages[name] = stages.get(name, 0.0) + float(value) / 1000
+                except ValueError:
+                    pass
+
+    return stages
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    # Nearest-rank percentile of sorted values.
+    if not ordered:
+        return 0.0
+
+    rank = max(1, -(-len(ordered) * percent // 100))
+
+    return ordered[int(rank) - 1]
+
+
+def _report_result(result: dict) -> None:
+    latency = result['latency']
+
+    print(
+        f"{result['throughput']:>9.1f} req/s  "
+        f"p50 {latency['p50'] * 1000:>8.2f} ms  "
+        f"p95 {latency['p95'] * 1000:>8.2f} ms  "
+        f"p99 {latency['p99'] * 1000:>8.2f} ms  "
+        f"{result['name']} [{result['target']}]",
+        file=stderr
+    )
+
+
+@contextmanager
+def _serve(app: flask.Flask) -> Iterator[int]:
+    server = make_server(
+        '127.0.0.1',
+        0,
+        app,
+        threaded=True,
+        request_handler=_QuietRequestHandler
+    )
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server.server_port
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _server_requester(port: int) -> Callable[[], Callable]:
+    def create():
+        def request(path: str) -> tuple[int, str | None]:
+            connection = HTTPConnection('127.0.0.1', port, timeout=60)
+
+            try:
+                connection.request(
+                    'GET',
+                    path,
+                    headers={'Accept-Encoding': 'gzip'}
+                )
+                response = connection.getresponse()
+                response.read()
+
+                return response.status, response.getheader('Server-Timing')
+            finally:
+                connection.close()
+
+        return request
+
+    return create
+
+
+def build_loadtest_app(
+    scenario: dict,
+    cache: str,
+    documents: dict[str, str] | None = None,
+    config: dict | None = None,
+) -> flask.Flask:
+    """
+    Creates the application for a workload, with a route for each page.
+
+    Server timings are always enabled, and background cache warming is
+    always disabled.
+
+    Arguments:
+        scenario (dict): The scenario.
+        cache (str): Either "warm", to use the scenario's configuration, or
+            "cold", to disable the rendering caches.
+        documents (dict[str, str] | None): The synthetic documents. Defaults
+            to those for the scenario's sizes.
+        config (dict | None): Configuration overriding the scenario's.
+
+    Returns:
+        Flask: The application.
+    """
+    if cache not in ('cold', 'warm'):
+        raise ValueError(f'invalid cache state {cache!r}')
+
+    if documents is None:
+        documents = generate_documents(scenario.get('sizes', []))
+
+    app = build_app(
+        documents,
+        config={
+            **scenario.get('config', {}),
+            **(config or {}),
+            **(COLD_CONFIG if cache == 'cold' else {}),
+            'HYDRA_SERVER_TIMING': True,
+            'HYDRA_WARM_CACHE': False,
+        },
+        base_config={},
+    )
+
+    for index, (path, template_name) in enumerate(
+        scenario_pages(scenario).items()
+    ):
+        app.add_url_rule(
+            path,
+            f'loadtest_{index}',
+            lambda template_name=template_name: render_page_response(
+                template_name
+            )
+        )
+
+    return app
+
+
+def run_requests(
+    create_requester: Callable[[], Callable],
+    paths: list[str],
+    concurrency: int,
+) -> tuple[list[Sample], float]:
+    """
+    Requests the paths using concurrent threads.
+
+    Arguments:
+        create_requester (Callable): Creates the function each thread uses
+            to request a path, returning the status and Server-Timing
+            header.
+        paths (list[str]): The paths to request, in order.
+        concurrency (int): The number of threads.
+
+    Returns:
+        tuple[list[Sample], float]: The samples, in no particular order, and
+            the total duration in seconds.
+    """
+    samples = []
+    # Threads take the next path from the shared iterator as they finish
+    # their previous request, so slow pages do not hold up the others.
+    remaining = iter(paths)
+
+    def work():
+        request = create_requester()
+
+        for path in remaining:
+            start = perf_counter()
+
+            try:
+                status, server_timing = request(path)
+            except Exception:
+                samples.append(Sample(perf_counter() - start, None, {}))
+
+                continue
+
+            samples.append(
+                Sample(
+                    perf_counter() - start,
+                    status,
+                    _parse_server_timing(server_timing)
+                )
+            )
+
+    threads = [
+        Thread(target=work, name=f'hydra-loadtest-{index}')
+        for index in range(max(1, concurrency))
+    ]
+    start = perf_counter()
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    return samples, perf_counter() - start
+
+
+def run_scenario(
+    scenario: dict,
+    targets: tuple[str, ...] = TARGETS,
+    workloads: list[str] | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Runs the scenario's workloads.
+
+    Arguments:
+        scenario (dict): The scenario.
+        targets (tuple[str, ...]): Where to send the requests: "client" for
+            the in-process test client, "server" for a local HTTP server.
+        workloads (list[str] | None): If given, only the workloads with
+            these names are run.
+        on_result (Callable | None): Called with each result as it completes.
+
+    Returns:
+        dict: The environment metadata and the results for each workload and
+            target.
+    """
+    documents = generate_documents(scenario.get('sizes', []))
+    results = []
+
+    for workload in scenario['workloads']:
+        if workloads is not None and workload['name'] not in workloads:
+            continue
+
+        for target in targets:
+            result = run_workload(scenario, workload, target, documents)
+            results.append(result)
+
+            if on_result is not None:
+                on_result(result)
+
+    return {
+        'meta': {
+            'version': render_version(),
+            'python': python_version(),
+            'platform': platform(),
+            'config': scenario.get('config', {}),
+        },
+        'results': results,
+    }
+
+
+def run_workload(
+    scenario: dict,
+    workload: dict,
+    target: str,
+    documents: dict[str, str] | None = None,
+) -> dict:
+    """
+    Runs a workload against a new application.
+
+    Arguments:
+        scenario (dict): The scenario.
+        workload (dict): The workload, see the module documentation.
+        target (str): Either "client" or "server".
+        documents (dict[str, str] | None): The synthetic documents. Defaults
+            to those for the scenario's sizes.
+
+    Returns:
+        dict: The number of requests and errors, the throughput in requests
+            per second, and the distributions of the latency and of each
+            Server-Timing stage, in seconds.
+    """
+    if target not in TARGETS:
+        raise ValueError(f'invalid target {target!r}')
+
+    cache = workload.get('cache', 'warm')
+    concurrency = workload.get('concurrency', 1)
+    app = build_loadtest_app(
+        scenario,
+        cache,
+        documents=documents,
+        config=workload.get('config'),
+    )
+    pages = workload.get('pages') or list(scenario_pages(scenario))
+    paths = _page_sequence(
+        pages,
+        workload.get('requests', 100),
+        workload.get('seed', 0)
+    )
+
+    if cache == 'warm':
+        request = _client_requester(app)()
+
+        for path in dict.fromkeys(paths):
+            request(path)
+
+    if target == 'client':
+        samples, duration = run_requests(
+            _client_requester(app),
+            paths,
+            concurrency
+        )
+    else:
+        with _serve(app) as port:
+            samples, duration = run_requests(
+                _server_requester(port),
+                paths,
+                concurrency
+            )
+
+    stages = {}
+
+    for sample in samples:
+        for stage, value in sample.stages.items():
+            stages.setdefault(stage, []).append(value)
+
+    return {
+        'name': workload.get('name', cache),
+        'target': target,
+        'cache': cache,
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': sum(
+            1 for sample in samples
+            if sample.status is None or sample.status >= 400
+        ),
+        'duration': duration,
+        'throughput': len(samples) / duration if duration else 0.0,
+        'latency': _distribution([sample.latency for sample in samples]),
+        'stages': {
+            stage: _distribution(values) for stage, values in stages.items()
+        },
+    }
+
+
+def scenario_pages(scenario: dict) -> dict[str, str]:
+    """
+    Returns the pages of a scenario.
+
+    Arguments:
+        scenario (dict): The scenario.
+
+    Returns:
+        dict[str, str]: The template name for each URL path. Defaults to
+            "/bench/<size>" for each of the scenario's sizes.
+    """
+    pages = scenario.get('pages')
+
+    if pages is not None:
+        return pages
+
+    return {
+        f'/bench/{size}': f'bench/{size}.md'
+        for size in scenario.get('sizes', [])
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    arguments = _parse_arguments(argv)
+
+    if arguments.scenario:
+        with open(arguments.scenario, encoding='utf-8') as file:
+            scenario = load(file)
+    else:
+        scenario = DEFAULT_SCENARIO
+
+    for size in scenario.get('sizes', []):
+        if size not in SIZES:
+            print(f'Unknown size {size!r}', file=stderr)
+
+            return 2
+
+    results = run_scenario(
+        scenario,
+        targets=tuple(arguments.target or TARGETS),
+        workloads=arguments.workload,
+        on_result=_report_result,
+    )
+
+    if arguments.output:
+        with open(arguments.output, 'w', encoding='utf-8') as file:
+            dump(results, file, indent=2)
+    else:
+        dump(results, stdout, indent=2)
+        stdout.write('\n')
+
+    return 1 if any(result['errors'] for result in results['results']) else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
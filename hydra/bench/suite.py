@@ -0,0 +1,369 @@
+from platform import platform, python_version
+from statistics import mean, median
+from time import perf_counter
+from typing import Any, Callable
+
+import flask
+from bs4 import BeautifulSoup
+from jinja2 import ChoiceLoader, DictLoader
+from markdown import markdown
+
+from hydra import __version__, create_app
+from hydra.bench.documents import generate_documents
+from hydra.utils.html_utils import add_header_ids, parse_headings
+from hydra.utils.markdown_utils import process_fenced_code_blocks
+from hydra.utils.memory_utils import profile_memory
+from hydra.utils.render_utils import parse_markdown, render_page
+from hydra.utils.string_utils import kebab_case
+from hydra.utils.version_utils import package_version
+
+
+MOCK_TEMPLATES = (
+    'mocks/markdown_template.md',
+    'mocks/code_block_template.md',
+    'mocks/highlighted_code_block_template.md',
+)
+
+# Minimal page templates, used if the application does not define them.
+PAGE_TEMPLATES = {
+    'page.html': (
+        '<html><body><nav>{{ navigation }}</nav>'
+        '<article>{{ content }}</article></body></html>'
+    ),
+    'page/navigation.html': (
+        '<ul>{% for item in navigation recursive %}'
+        '<li><a href="{{ item.url }}">{{ item.label }}</a>'
+        '{% if item.children %}<ul>{{ loop(item.children) }}</ul>{% endif %}'
+        '</li>{% endfor %}</ul>'
+    ),
+}
+
+# Disable the caches, so each run measures the full pipeline.
+BENCHMARK_CONFIG = {
+    'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_NAVIGATION_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_SECTION_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_HIGHLIGHT_CACHE_MAX_ENTRIES': 0,
+    'HYDRA_HIGHLIGHT_CACHE_DIR': None,
+    'HYDRA_SERVER_TIMING': False,
+}
+
+
+class Benchmark:
+    """
+    A named operation to time.
+
+    Arguments:
+        name (str): The name of the benchmark.
+        function (Callable): Performs the timed operation. Receives the
+            value returned by setup, if any.
+        setup (Callable | None): Prepares the input for each run. Not
+            included in the timing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        function: Callable[..., Any],
+        setup: Callable[[], Any] | None = None,
+    ):
+        self.name = name
+        self.function = function
+        self.setup = setup
+
+    def run(self, repeat: int) -> dict:
+        """
+        Times the benchmark.
+
+        Arguments:
+            repeat (int): The number of timed runs, after one warmup run.
+
+        Returns:
+            dict: The name and the min, median and mean durations in seconds.
+        """
+        durations = []
+
+        for index in range(repeat + 1):
+            args = () if self.setup is None else (self.setup(),)
+            start = perf_counter()
+
+            self.function(*args)
+
+            duration = perf_counter() - start
+
+            if index > 0:
+                durations.append(duration)
+
+        return {
+            'name': self.name,
+            'runs': repeat,
+            'min': min(durations),
+            'median': median(durations),
+            'mean': mean(durations),
+        }
+
+
+def _meta() -> dict:
+    return {
+        'hydra': __version__,
+        'python': python_version(),
+        'platform': platform(),
+        'markdown': package_version('markdown'),
+        'pygments': package_version('pygments'),
+        'beautifulsoup4': package_version('beautifulsoup4'),
+    }
+
+
+def _string_benchmarks(label: str, document: str) -> list[Benchmark]:
+    processed = process_fenced_code_blocks(document)
+    rendered = markdown(processed)
+    headings = [
+        tag.text
+        for tag in BeautifulSoup(rendered, features='html.parser').find_all(
+            ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+        )
+    ]
+
+    def parse_fragment():
+        return BeautifulSoup(rendered, features='html.parser')
+
+    def parse_processed_fragment():
+        return add_header_ids(parse_fragment())
+
+    return [
+        Benchmark(
+            f'process_fenced_code_blocks[{label}]',
+            lambda: process_fenced_code_blocks(document),
+        ),
+        Benchmark(
+            f'kebab_case[{label}]',
+            lambda: [kebab_case(heading) for heading in headings],
+        ),
+        Benchmark(
+            f'add_header_ids[{label}]',
+            add_header_ids,
+            setup=parse_fragment,
+        ),
+        Benchmark(
+            f'parse_headings[{label}]',
+            parse_headings,
+            setup=parse_processed_fragment,
+        ),
+    ]
+
+
+def _template_benchmarks(label: str, template_name: str) -> list[Benchmark]:
+    return [
+        Benchmark(
+            f'parse_markdown[{label}]',
+            lambda: parse_markdown(template_name, name='Starfighter'),
+        ),
+        Benchmark(
+            f'render_page[{label}]',
+            lambda: render_page(template_name, name='Starfighter'),
+        ),
+    ]
+
+
+def build_app(
+    documents: dict[str, str],
+    config: dict | None = None,
+    base_config: dict | None = None,
+) -> flask.Flask:
+    """
+    Creates an application that can render the benchmark documents.
+
+    Each document is available as the template "bench/<name>.md". Minimal
+    page templates are provided if the application does not define them.
+
+    Arguments:
+        documents (dict[str, str]): The synthetic documents, by name.
+        config (dict | None): Additional configuration for the application.
+        base_config (dict | None): The configuration that config extends.
+            Defaults to BENCHMARK_CONFIG, which disables the caches.
+
+    Returns:
+        Flask: The application.
+    """
+    if base_config is None:
+        base_config = BENCHMARK_CONFIG
+
+    app = create_app(injected_config={**base_config, **(config or {})})
+    templates = {
+        f'bench/{name}.md': document
+        for name, document in documents.items()
+    }
+
+    app.jinja_env.loader = ChoiceLoader([
+        DictLoader(templates),
+        app.jinja_env.loader,
+        DictLoader(PAGE_TEMPLATES),
+    ])
+
+    return app
+
+
+def collect_benchmarks(
+    sizes: list[str] | None = None,
+    pattern: str | None = None
+) -> tuple[flask.Flask, list[Benchmark]]:
+    """
+    Builds the benchmarks for the mock templates and synthetic documents.
+
+    Arguments:
+        sizes (list[str] | None): The synthetic document sizes to include.
+            Defaults to DEFAULT_SIZES.
+        pattern (str | None): If given, only benchmarks whose names contain
+            the pattern are included.
+
+    Returns:
+        tuple[Flask, list[Benchmark]]: The application used to render the
+            templates and the benchmarks.
+    """
+    documents = generate_documents(sizes)
+    app = build_app(documents)
+    benchmarks = []
+
+    with app.app_context():
+        for template_name in MOCK_TEMPLATES:
+            source, _, _ = app.jinja_env.loader.get_source(
+                app.jinja_env,
+                template_name
+            )
+            label = template_name.removeprefix('mocks/').removesuffix('.md')
+
+            benchmarks.extend(_string_benchmarks(label, source))
+            benchmarks.extend(_template_benchmarks(label, template_name))
+
+        for size, document in documents.items():
+            benchmarks.extend(_string_benchmarks(size, document))
+            benchmarks.extend(_template_benchmarks(size, f'bench/{size}.md'))
+
+    if pattern:
+        benchmarks = [
+            benchmark for benchmark in benchmarks if pattern in benchmark.name
+        ]
+
+    return app, benchmarks
+
+
+def compare_results(
+    results: dict,
+    baseline: dict,
+    threshold: float
+) -> list[dict]:
+    """
+    Compares benchmark results against a saved baseline.
+
+    Benchmarks are compared by their median duration. Benchmarks missing
+    from either set of results are ignored.
+
+    Arguments:
+        results (dict): The current results, as returned by run_suite().
+        baseline (dict): The baseline results, as returned by run_suite().
+        threshold (float): The allowed slowdown, e.g. 0.1 for 10%.
+
+    Returns:
+        list[dict]: The comparison for each benchmark, including the ratio of
+            the current to the baseline median and whether it regressed.
+    """
+    baseline_medians = {
+        result['name']: result['median'] for result in baseline['results']
+    }
+    comparisons = []
+
+    for result in results['results']:
+        baseline_median = baseline_medians.get(result['name'])
+
+        if not baseline_median:
+            continue
+
+        ratio = result['median'] / baseline_median
+
+        comparisons.append({
+            'name': result['name'],
+            'baseline': baseline_median,
+            'median': result['median'],
+            'ratio': ratio,
+            'regressed': ratio > 1 + threshold,
+        })
+
+    return comparisons
+
+
+def run_memory_suite(
+    sizes: list[str] | None = None,
+    pattern: str | None = None,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Reports the memory allocated by each benchmark, by rendering stage.
+
+    Each benchmark runs once untraced, then once under tracemalloc, see
+    memory_utils.profile_memory().
+
+    Arguments:
+        sizes (list[str] | None): The synthetic document sizes to include.
+            Defaults to DEFAULT_SIZES.
+        pattern (str | None): If given, only benchmarks whose names contain
+            the pattern are run.
+        on_result (Callable | None): Called with each result as it completes.
+
+    Returns:
+        dict: The environment metadata and the memory report for each
+            benchmark.
+    """
+    app, benchmarks = collect_benchmarks(sizes=sizes, pattern=pattern)
+    results = []
+
+    with app.app_context():
+        for benchmark in benchmarks:
+            args = () if benchmark.setup is None else (benchmark.setup(),)
+
+            benchmark.function(*args)
+
+            if benchmark.setup is not None:
+                args = (benchmark.setup(),)
+
+            report = profile_memory(benchmark.function, *args)
+            result = {'name': benchmark.name, **report.to_dict()}
+            results.append(result)
+
+            if on_result is not None:
+                on_result(result)
+
+    return {'meta': _meta(), 'results': results}
+
+
+def run_suite(
+    sizes: list[str] | None = None,
+    pattern: str | None = None,
+    repeat: int = 5,
+    on_result: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Runs the benchmark suite.
+
+    Arguments:
+        sizes (list[str] | None): The synthetic document sizes to include.
+            Defaults to DEFAULT_SIZES.
+        pattern (str | None): If given, only benchmarks whose names contain
+            the pattern are run.
+        repeat (int): The number of timed runs for each benchmark.
+        on_result (Callable | None): Called with each result as it completes.
+
+    Returns:
+        dict: The environment metadata and the results for each benchmark.
+    """
+    app, benchmarks = collect_benchmarks(sizes=sizes, pattern=pattern)
+    results = []
+
+    with app.app_context():
+        for benchmark in benchmarks:
+            result = benchmark.run(repeat)
+            results.append(result)
+
+            if on_result is not None:
+                on_result(result)
+
+    return {'meta': {**_meta(), 'repeat': repeat}, 'results': results}
@@ -0,0 +1,224 @@
+"""
+Command line tools for Hydra applications.
+"""
+
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from json import dump, load
+from os import cpu_count, makedirs
+from os.path import dirname, exists, join, splitext
+from time import perf_counter
+
+import click
+import flask
+from flask.cli import with_appcontext
+
+from hydra.utils.process_utils import (
+    get_worker_app,
+    get_worker_config,
+    init_worker_app,
+)
+from hydra.utils.render_utils import page_cache_key, render_page
+from hydra.utils.startup_utils import (
+    ImportTiming,
+    package_times,
+    profile_startup,
+)
+from hydra.utils.template_utils import list_markdown_templates
+
+
+_MANIFEST_NAME = '.hydra-build.json'
+
+
+def _build_page(template_name: str, output_path: str) -> float:
+    start = perf_counter()
+    page = render_page(template_name)
+
+    makedirs(dirname(output_path), exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as file:
+        file.write(page)
+
+    return perf_counter() - start
+
+
+def _build_page_in_worker(template_name: str, output_path: str) -> float:
+    with get_worker_app().app_context():
+        return _build_page(template_name, output_path)
+
+
+def _build_pages(pages: dict, jobs: int):
+    if jobs == 1:
+        for template_name, output_path in pages.items():
+            try:
+                yield template_name, _build_page(template_name, output_path)
+            except Exception as exception:
+                yield template_name, exception
+
+        return
+
+    config = get_worker_config(flask.current_app)
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=init_worker_app,
+        initargs=(config,),
+    ) as executor:
+        futures = {
+            executor.submit(_build_page_in_worker, name, path): name
+            for name, path in pages.items()
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as exception:
+                yield futures[future], exception
+
+
+def _echo_imports(imports: list[ImportTiming], limit: int) -> None:
+    for package, duration in list(package_times(imports).items())[:limit]:
+        click.echo(f'{duration * 1000:>9.1f} ms  {package}')
+
+    click.echo('  slowest modules (self / cumulative):')
+
+    slowest = sorted(imports, key=lambda timing: -timing.self_time)
+
+    for timing in slowest[:limit]:
+        click.echo(
+            f'{timing.self_time * 1000:>9.1f} ms  {timing.module} '
+            f'({timing.cumulative_time * 1000:.1f} ms)'
+        )
+
+
+def _output_path(output: str, template_name: str) -> str:
+    return join(output, f'{splitext(template_name)[0]}.html')
+
+
+def _read_manifest(output: str) -> dict:
+    try:
+        with open(join(output, _MANIFEST_NAME), encoding='utf-8') as file:
+            return load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(output: str, manifest: dict) -> None:
+    makedirs(output, exist_ok=True)
+
+    with open(join(output, _MANIFEST_NAME), 'w', encoding='utf-8') as file:
+        dump(manifest, file, indent=2, sort_keys=True)
+
+
+@click.command('build')
+@click.option(
+    '--output',
+    '-o',
+    default='build',
+    show_default=True,
+    type=click.Path(file_okay=False),
+    help='The directory to write the rendered pages to.',
+)
+@click.option(
+    '--jobs',
+    '-j',
+    default=None,
+    type=click.IntRange(min=1),
+    help='The number of worker processes. Defaults to the number of CPUs.',
+)
+@click.option(
+    '--force',
+    is_flag=True,
+    help='Render every page, even if its templates have not changed.',
+)
+@with_appcontext
+def build_command(output: str, jobs: int | None, force: bool) -> None:
+    """
+    Renders every Markdown template to a static HTML page.
+
+    Pages whose templates (including any referenced templates) are unchanged
+    since the last build are skipped. Templates matching the glob patterns
+    in HYDRA_BUILD_EXCLUDE are not rendered.
+    """
+    app = flask.current_app
+    template_names = list_markdown_templates(
+        app.jinja_env,
+        exclude=app.config['HYDRA_BUILD_EXCLUDE']
+    )
+    manifest = {} if force else _read_manifest(output)
+    digests = {}
+    pages = {}
+
+    for template_name in template_names:
+        digest = page_cache_key(template_name)
+        output_path = _output_path(output, template_name)
+        digests[template_name] = digest
+
+        if manifest.get(template_name) == digest and exists(output_path):
+            click.echo(f'{"skipped":>10}  {template_name}')
+
+            continue
+
+        pages[template_name] = output_path
+
+    jobs = min(jobs or cpu_count() or 1, max(len(pages), 1))
+    failures = 0
+    start = perf_counter()
+
+    for template_name, result in _build_pages(pages, jobs):
+        if isinstance(result, Exception):
+            failures += 1
+            manifest.pop(template_name, None)
+
+            click.echo(f'{"failed":>10}  {template_name}: {result!r}')
+
+            continue
+
+        manifest[template_name] = digests[template_name]
+
+        click.echo(f'{result * 1000:>7.1f} ms  {template_name}')
+
+    _write_manifest(
+        output,
+        {name: manifest[name] for name in template_names if name in manifest}
+    )
+
+    click.echo(
+        f'Rendered {len(pages) - failures} of {len(template_names)} pages '
+        f'({len(template_names) - len(pages)} unchanged, {failures} failed) '
+        f'in {perf_counter() - start:.2f} s with {jobs} worker(s).'
+    )
+
+    if failures:
+        raise click.exceptions.Exit(1)
+
+
+@click.group('hydra')
+def hydra_command() -> None:
+    """
+    Tools for developing Hydra.
+    """
+
+
+@hydra_command.command('startup-profile')
+@click.option(
+    '--limit',
+    '-n',
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help='The number of packages and modules to list for each phase.',
+)
+def startup_profile_command(limit: int) -> None:
+    """
+    Reports the time spent importing Hydra and creating the application.
+
+    The profile runs in a fresh interpreter using -X importtime, and breaks
+    down each phase by package and by module.
+    """
+    profile = profile_startup()
+
+    click.echo(f'import hydra: {profile.import_time * 1000:.1f} ms')
+    _echo_imports(profile.imports, limit)
+    click.echo(f'create_app(): {profile.factory_time * 1000:.1f} ms')
+    _echo_imports(profile.factory_imports, limit)
@@ -0,0 +1,156 @@
+"""
+Default configuration values for Hydra applications.
+"""
+
+
+# The maximum number of rendered pages to cache. Set to 0 to disable caching.
+# Pages are keyed by their templates and the context passed to render_page(),
+# not by the variables Flask adds to every template (request, session, g and
+# context processors). The page templates must not depend on those, or
+# caching must be disabled.
+HYDRA_PAGE_CACHE_MAX_ENTRIES = 256
+
+# The maximum total size in bytes of the cached pages, or None for no limit.
+HYDRA_PAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# The maximum number of rendered navigation menus to cache, keyed by the
+# heading tree. The navigation template must only depend on the navigation
+# variable. Set to 0 to render the navigation for every page.
+HYDRA_NAVIGATION_CACHE_MAX_ENTRIES = 256
+
+# The zlib compression level (1-9) of the gzip copy stored with each cached
+# page, or None to store uncompressed pages only.
+HYDRA_PAGE_GZIP_LEVEL = 6
+
+# The backend of the page and highlight caches: "memory" for caches private
+# to each process, or "sqlite" for caches shared by all processes on the
+# host, stored in the SQLite database at HYDRA_CACHE_PATH.
+HYDRA_CACHE_BACKEND = 'memory'
+
+# The path of the shared cache database, for the sqlite backend.
+HYDRA_CACHE_PATH = None
+
+# Language aliases whose Pygments lexers are resolved when the app is created.
+HYDRA_PRELOAD_LANGUAGES = []
+
+# The maximum number of highlighted code blocks to keep in memory.
+HYDRA_HIGHLIGHT_CACHE_MAX_ENTRIES = 1024
+
+# The maximum total size in bytes of the highlighted code kept in memory.
+HYDRA_HIGHLIGHT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# A local directory used to persist highlighted code between processes.
+HYDRA_HIGHLIGHT_CACHE_DIR = None
+
+# The maximum total size in bytes of the persisted highlighted code.
+HYDRA_HIGHLIGHT_CACHE_MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# The maximum number of rendered document sections to cache. Documents with
+# at least HYDRA_SECTION_MIN_SECTIONS h1 or h2 sections are rendered section
+# by section, so editing a section only re-renders that section. Set to 0 to
+# always render documents as a whole. Documents are also rendered as a whole
+# if HYDRA_MARKDOWN_EXTENSIONS includes an extension that depends on the whole
+# document, such as toc or footnotes.
+HYDRA_SECTION_CACHE_MAX_ENTRIES = 1024
+
+# The maximum total size in bytes of the cached sections.
+HYDRA_SECTION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# The minimum number of sections in a document rendered section by section.
+HYDRA_SECTION_MIN_SECTIONS = 8
+
+# A local directory used to persist converted Markdown (the body HTML and
+# headings of each template and context) between processes, or None. Each
+# rendering version has its own files, so processes running different versions
+# can share the directory. The files of the three most recently written
+# versions are kept.
+HYDRA_FRAGMENT_CACHE_DIR = None
+
+# The maximum size in bytes of the persisted fragments. The directory is
+# cleared once the limit is reached.
+HYDRA_FRAGMENT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# The engine used to convert Markdown to HTML. Either "soup", which parses and
+# post-processes the converted HTML using BeautifulSoup, or "tree", which
+# processes the document inside the Markdown conversion. The "tree" engine
+# cannot see headings written as raw HTML, so documents containing them are
+# converted by the "soup" engine.
+HYDRA_MARKDOWN_ENGINE = 'soup'
+
+# If true, records the time spent in each rendering stage, returns it in a
+# Server-Timing response header and aggregates it at /_hydra/timings. The
+# header and endpoint expose internal timings to every client, so only
+# enable this for debugging or behind a trusted proxy.
+HYDRA_SERVER_TIMING = False
+
+# If true, selected requests are profiled with cProfile, see HYDRA_PROFILE_*.
+# When false, requests carry no profiling overhead.
+HYDRA_PROFILE = False
+
+# A secret token. Requests whose X-Hydra-Profile header matches it are
+# profiled. None disables profiling on demand.
+HYDRA_PROFILE_TOKEN = None
+
+# The fraction of all requests profiled at random, from 0 to 1.
+HYDRA_PROFILE_SAMPLE_RATE = 0.0
+
+# The directory the profiles are written to. Defaults to "profiles" in the
+# instance folder.
+HYDRA_PROFILE_DIR = None
+
+# The number of profiles kept in the directory, or None to keep them all.
+HYDRA_PROFILE_MAX_FILES = 100
+
+# If true, /_hydra/memory?template=<name> renders a Markdown template under
+# tracemalloc and reports the memory allocated and retained by each stage.
+# Reports are slow and can render any Markdown template, so only enable this
+# for debugging.
+HYDRA_MEMORY_REPORT = False
+
+# Glob patterns for the Markdown templates skipped by the build command and
+# the cache warmer.
+HYDRA_BUILD_EXCLUDE = ['mocks/*']
+
+# If true, the app renders every Markdown template into the page and
+# highlight caches in background threads when it is created, and again in
+# each process forked from it (e.g. by gunicorn --preload) on the process's
+# first request. Until HYDRA_WARM_CACHE_READY_RATIO of the templates are
+# rendered, /_hydra/ready responds with 503 Service Unavailable. Without
+# warming, /_hydra/ready is not served.
+HYDRA_WARM_CACHE = False
+
+# The number of threads rendering templates into the caches.
+HYDRA_WARM_CACHE_WORKERS = 2
+
+# The fraction of the templates rendered (or failed) before the app is ready.
+HYDRA_WARM_CACHE_READY_RATIO = 1.0
+
+# A JSON file mapping template names to request counts, e.g. exported from
+# access logs, so that the most requested templates are warmed first.
+HYDRA_WARM_CACHE_HINTS = None
+
+# The pool used to highlight the code blocks of large documents concurrently.
+# Either "thread", "process", or None to always highlight serially.
+HYDRA_HIGHLIGHT_EXECUTOR = None
+
+# The number of workers in the highlighting pool, or None for the default.
+HYDRA_HIGHLIGHT_WORKERS = None
+
+# The executor running the CPU-bound stages of the async rendering functions:
+# "thread" for a thread pool, or "process" for a process pool.
+HYDRA_ASYNC_EXECUTOR = 'thread'
+
+# The number of workers in the async rendering pool, or None for the default.
+HYDRA_ASYNC_WORKERS = None
+
+# The minimum number of code blocks in a document highlighted concurrently.
+HYDRA_HIGHLIGHT_PARALLEL_MIN_BLOCKS = 16
+
+# The minimum total size of the code in a document highlighted concurrently.
+HYDRA_HIGHLIGHT_PARALLEL_MIN_BYTES = 16 * 1024
+
+# The names of the Python-Markdown extensions used to convert documents.
+HYDRA_MARKDOWN_EXTENSIONS = []
+
+# The configuration for each Python-Markdown extension, by name.
+HYDRA_MARKDOWN_EXTENSION_CONFIGS = {}
@@ -0,0 +1,72 @@
+"""
+Internal endpoints for monitoring Hydra applications.
+"""
+
+
+import flask
+
+from hydra.utils.memory_utils import profile_memory
+from hydra.utils.render_utils import parse_markdown, render_page
+from hydra.utils.template_utils import list_markdown_templates
+from hydra.utils.timing_utils import get_timing_histogram
+from hydra.utils.warm_utils import get_cache_warmer
+
+
+blueprint = flask.Blueprint('hydra_internal', __name__, url_prefix='/_hydra')
+
+_MEMORY_FUNCTIONS = {
+    'parse_markdown': parse_markdown,
+    'render_page': render_page,
+}
+
+
+@blueprint.route('/memory')
+def memory():
+    app = flask.current_app
+
+    if not app.config['HYDRA_MEMORY_REPORT']:
+        flask.abort(404)
+
+    template_name = flask.request.args.get('template', '')
+    function = _MEMORY_FUNCTIONS.get(
+        flask.request.args.get('function', 'render_page')
+    )
+
+    if function is None:
+        flask.abort(400)
+
+    if template_name not in list_markdown_templates(app.jinja_env):
+        flask.abort(404)
+
+    # The first call fills the caches, so the report shows what every
+    # later request allocates and retains.
+    if flask.request.args.get('warm', '1') != '0':
+        function(template_name)
+
+    report = profile_memory(function, template_name)
+
+    return flask.jsonify(report.to_dict())
+
+
+@blueprint.route('/ready')
+def ready():
+    warmer = get_cache_warmer(flask.current_app)
+
+    if warmer is None:
+        flask.abort(404)
+
+    progress = warmer.progress()
+
+    return flask.jsonify(progress), 200 if progress['ready'] else 503
+
+
+@blueprint.route('/timings')
+def timings():
+    app = flask.current_app
+
+    if not app.config['HYDRA_SERVER_TIMING']:
+        flask.abort(404)
+
+    histogram = get_timing_histogram(app)
+
+    return flask.jsonify(histogram.to_dict())
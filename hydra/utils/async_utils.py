@@ -0,0 +1,354 @@
+from asyncio import CancelledError, get_running_loop, wrap_future
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import partial
+from os import getpid
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+import flask
+from markupsafe import Markup
+
+from hydra.utils.process_utils import (
+    get_worker_app,
+    get_worker_config,
+    init_worker_app,
+)
+from hydra.utils.render_utils import (
+    RenderedPage,
+    compress_page,
+    convert_fragment,
+    convert_markdown,
+    fragment_key,
+    get_page_cache,
+    load_fragment,
+    page_cache_key,
+    render_jinja,
+    render_layout,
+    save_fragment,
+)
+from hydra.utils.timing_utils import timed
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+class _AsyncRenderer:
+    __slots__ = ('app', 'lock', 'executor', 'executor_pid', 'in_flight')
+
+    def __init__(self, app: flask.Flask):
+        self.app = app
+        self.lock = Lock()
+        self.executor = None
+        self.executor_pid = None
+        self.in_flight = {}
+
+    def get_executor(self) -> Executor:
+        # Executors do not survive a fork, so each process creates its own.
+        with self.lock:
+            if self.executor is None or self.executor_pid != getpid():
+                self.executor = self._build_executor()
+                self.executor_pid = getpid()
+
+            return self.executor
+
+    def _build_executor(self) -> Executor:
+        config = self.app.config
+        executor = config['HYDRA_ASYNC_EXECUTOR']
+        max_workers = config['HYDRA_ASYNC_WORKERS']
+
+        if executor == 'thread':
+            return ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix='hydra-async'
+            )
+
+        if executor == 'process':
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=init_worker_app,
+                initargs=(get_worker_config(self.app),),
+            )
+
+        raise ValueError(f'invalid HYDRA_ASYNC_EXECUTOR {executor!r}')
+
+
+def _call_in_app_context(
+    app: flask.Flask,
+    function: Callable[..., Any],
+    *args: Any
+) -> Any:
+    with app.app_context():
+        return function(*args)
+
+
+def _call_in_worker(function: Callable[..., Any], *args: Any) -> Any:
+    with get_worker_app().app_context():
+        return function(*args)
+
+
+def _convert_content(
+    raw_text: str,
+    engine: str,
+    key: str | None
+) -> tuple[str, tuple]:
+    content = convert_markdown(raw_text, engine)
+
+    save_fragment(key, *content)
+
+    return content
+
+
+def _convert_fragment(
+    raw_text: str,
+    key: str | None
+) -> 'BeautifulSoup':
+    fragment, headings = convert_fragment(raw_text)
+
+    save_fragment(key, str(fragment), headings)
+
+    return fragment
+
+
+def _get_async_renderer(app: flask.Flask) -> _AsyncRenderer:
+    renderer = app.extensions.get('hydra.async_renderer')
+
+    if renderer is None:
+        renderer = app.extensions.setdefault(
+            'hydra.async_renderer',
+            _AsyncRenderer(app)
+        )
+
+    return renderer
+
+
+async def _deduplicated(
+    renderer: _AsyncRenderer,
+    key: str,
+    render: Callable[[], Awaitable[RenderedPage]],
+) -> RenderedPage:
+    # Concurrent futures can be awaited from any event loop, which matters
+    # because Flask runs each async view in its own loop and thread.
+    with renderer.lock:
+        future = renderer.in_flight.get(key)
+        owner = future is None
+
+        if owner:
+            future = renderer.in_flight[key] = Future()
+
+    if not owner:
+        return await wrap_future(future)
+
+    try:
+        page = await render()
+    except CancelledError:
+        future.cancel()
+
+        raise
+    except Exception as exception:
+        future.set_exception(exception)
+
+        raise
+    else:
+        future.set_result(page)
+
+        return page
+    finally:
+        with renderer.lock:
+            renderer.in_flight.pop(key, None)
+
+
+async def _offload(
+    renderer: _AsyncRenderer,
+    function: Callable[..., Any],
+    *args: Any
+) -> Any:
+    # The offloaded stages read the application's configuration and caches,
+    # so they run in an app context of the renderer's or worker's app.
+    executor = renderer.get_executor()
+
+    if isinstance(executor, ProcessPoolExecutor):
+        return await get_running_loop().run_in_executor(
+            executor,
+            partial(_call_in_worker, function, *args)
+        )
+
+    return await get_running_loop().run_in_executor(
+        executor,
+        partial(_call_in_app_context, renderer.app, function, *args)
+    )
+
+
+def _parse_html(html: str) -> 'BeautifulSoup':
+    from bs4 import BeautifulSoup
+
+    with timed('parse'):
+        return BeautifulSoup(html, features='html.parser')
+
+
+async def _render_content(
+    renderer: _AsyncRenderer,
+    template_name: str,
+    context: dict,
+) -> tuple[str, tuple]:
+    # The fragment store and the conversion are blocking, so both run on the
+    # executor. Only the Jinja template is rendered on the calling thread.
+    engine = renderer.app.config['HYDRA_MARKDOWN_ENGINE']
+    key = fragment_key(template_name, engine, context)
+
+    if key is not None:
+        stored = await _offload(renderer, load_fragment, key)
+
+        if stored is not None:
+            return stored
+
+    raw_text = render_jinja(template_name, **context)
+
+    with timed('convert'):
+        return await _offload(
+            renderer,
+            _convert_content,
+            raw_text,
+            engine,
+            key
+        )
+
+
+async def _render_page(
+    renderer: _AsyncRenderer,
+    template_name: str,
+    context: dict,
+) -> str:
+    content, headings = await _render_content(
+        renderer,
+        template_name,
+        context
+    )
+
+    return render_layout(content, headings)
+
+
+async def _render_cached_page(
+    renderer: _AsyncRenderer,
+    cache,
+    key: str,
+    template_name: str,
+    context: dict,
+) -> RenderedPage:
+    html = await _render_page(renderer, template_name, context)
+    level = renderer.app.config['HYDRA_PAGE_GZIP_LEVEL']
+
+    if cache is None or level is None:
+        page = RenderedPage(html)
+    else:
+        page = RenderedPage(
+            html,
+            await _offload(renderer, compress_page, html, level)
+        )
+
+    if cache is not None:
+        cache.set(key, page)
+
+    return page
+
+
+async def async_parse_markdown(
+    template_name: str,
+    **context: Any
+) -> 'BeautifulSoup':
+    """
+    Renders a Markdown file to intermediate HTML, without blocking the loop.
+
+    The Jinja template is rendered on the calling thread, while the fenced
+    code blocks, Markdown conversion and HTML post-processing run on the
+    executor set in HYDRA_ASYNC_EXECUTOR. Like parse_markdown(), converted
+    documents are loaded from and saved to the fragment store, on the
+    executor.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        BeautifulSoup: The intermediate HTML representation.
+    """
+    renderer = _get_async_renderer(flask.current_app._get_current_object())
+    key = fragment_key(template_name, 'soup', context)
+
+    if key is not None:
+        stored = await _offload(renderer, load_fragment, key)
+
+        if stored is not None:
+            return await _offload(renderer, _parse_html, stored[0])
+
+    raw_text = render_jinja(template_name, **context)
+
+    with timed('convert'):
+        return await _offload(renderer, _convert_fragment, raw_text, key)
+
+
+async def async_render_markdown(template_name: str, **context: Any) -> Markup:
+    """
+    Renders a Markdown file to HTML, without blocking the loop.
+
+    See async_parse_markdown() for where each stage runs, and
+    render_markdown() for the output.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        Markup: The generated HTML.
+    """
+    renderer = _get_async_renderer(flask.current_app._get_current_object())
+    content, _ = await _render_content(renderer, template_name, context)
+
+    return Markup(content)
+
+
+async def async_render_page(template_name: str, **context: Any) -> str:
+    """
+    Renders a template to a page, without blocking the loop.
+
+    Pages are cached like those rendered by render_page(). Concurrent calls
+    for the same page, from any thread or event loop, share a single render.
+    See async_parse_markdown() for where each stage runs.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        str: The rendered page.
+    """
+    app = flask.current_app._get_current_object()
+    renderer = _get_async_renderer(app)
+
+    with timed('render'):
+        key = page_cache_key(template_name, **context)
+
+        if key is None:
+            return await _render_page(renderer, template_name, context)
+
+        cache = get_page_cache(app)
+        page = None if cache is None else cache.get(key)
+
+        if page is None:
+            page = await _deduplicated(
+                renderer,
+                key,
+                lambda: _render_cached_page(
+                    renderer,
+                    cache,
+                    key,
+                    template_name,
+                    context
+                )
+            )
+
+        return page.html
@@ -0,0 +1,555 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from hashlib import sha256
+from json import dumps
+from logging import getLogger
+from os import getpid
+from pickle import HIGHEST_PROTOCOL, dumps as pickle, loads as unpickle
+from sys import getsizeof
+from threading import Lock, local
+from time import time
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+
+if TYPE_CHECKING:
+    from sqlite3 import Connection
+
+
+_MISSING = object()
+
+_logger = getLogger(__name__)
+
+# Reads refresh the access time of a shared cache entry at most this often,
+# in seconds, so that hits rarely need to write to the database.
+_ACCESS_RESOLUTION = 1.0
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (namespace, accessed);
+'''
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded least-recently-used cache.
+
+    Entries are evicted, oldest first, once either the number of entries
+    exceeds max_entries or the total size of the stored values exceeds
+    max_bytes. A bound of None disables that limit.
+
+    Arguments:
+        max_entries (int | None): The maximum number of cached entries.
+        max_bytes (int | None): The maximum total size of cached values.
+        sizeof (Callable): Returns the size in bytes of a cached value.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = getsizeof,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """
+        int: The total size in bytes of the cached values.
+        """
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Removes all entries from the cache.
+
+        The hit, miss and eviction counters are not reset.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def delete(self, key: Any) -> None:
+        """
+        Removes the entry with the given key, if any.
+
+        Arguments:
+            key: The key of the entry to remove.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+
+            if entry is not _MISSING:
+                self._size -= entry[1]
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """
+        Returns the cached value for the key and marks it as recently used.
+
+        Arguments:
+            key: The key of the entry to find.
+            default: The value to return if the key is not cached.
+
+        Returns:
+            The cached value, or the default value.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+
+            if entry is _MISSING:
+                self.misses += 1
+
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[0]
+
+    def set(self, key: Any, value: Any) -> None:
+        """
+        Caches the value, evicting the least recently used entries as needed.
+
+        Values larger than max_bytes on their own are not cached.
+
+        Arguments:
+            key: The key of the entry.
+            value: The value to cache.
+        """
+        size = self._sizeof(value)
+
+        with self._lock:
+            previous = self._entries.pop(key, _MISSING)
+
+            if previous is not _MISSING:
+                self._size -= previous[1]
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._size += size
+
+            self._evict()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The hits, misses, evictions, entries and bytes.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._size,
+        }
+
+    def _evict(self) -> None:
+        while self._entries and self._is_over_limit():
+            _, (_, size) = self._entries.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+
+    def _is_over_limit(self) -> bool:
+        if self.max_entries is not None:
+            if len(self._entries) > self.max_entries:
+                return True
+
+        if self.max_bytes is not None:
+            if self._size > self.max_bytes:
+                return True
+
+        return False
+
+
+class SQLiteCache:
+    """
+    A size-bounded least-recently-used cache shared by processes on a host.
+
+    Entries are pickled and stored in a local SQLite database in WAL mode,
+    so any number of processes can read concurrently while writers are
+    serialized by SQLite. Each process and thread uses its own connection.
+    Caches with different namespaces can share a database, each with its own
+    bounds. The database must only be writable by trusted processes, as the
+    values are unpickled. Database errors, such as a lock held for longer
+    than the timeout, are logged: a failed read is a miss, and a failed
+    write is skipped.
+
+    The interface matches LRUCache, except that keys must be strings.
+
+    Arguments:
+        path (str): The path of the database file.
+        namespace (str): The namespace of the cache's entries.
+        max_entries (int | None): The maximum number of cached entries.
+        max_bytes (int | None): The maximum total size of the pickled values.
+        timeout (float): The time to wait for a lock held by another
+            process, in seconds.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = 'default',
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        timeout: float = 5.0,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._connections = local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._connection().executescript(_SCHEMA)
+
+    def __contains__(self, key: str) -> bool:
+        row = self._connection().execute(
+            'SELECT 1 FROM entries WHERE namespace = ? AND key = ?',
+            (self.namespace, key)
+        ).fetchone()
+
+        return row is not None
+
+    def __len__(self) -> int:
+        return self._totals()[0]
+
+    @property
+    def size(self) -> int:
+        """
+        int: The total size in bytes of the cached values.
+        """
+        return self._totals()[1]
+
+    def clear(self) -> None:
+        """
+        Removes all entries in the namespace from the cache.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                'DELETE FROM entries WHERE namespace = ?',
+                (self.namespace,)
+            )
+
+    def delete(self, key: str) -> None:
+        """
+        Removes the entry with the given key, if any.
+
+        Arguments:
+            key (str): The key of the entry to remove.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                'DELETE FROM entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns the cached value for the key and marks it as recently used.
+
+        Arguments:
+            key (str): The key of the entry to find.
+            default: The value to return if the key is not cached.
+
+        Returns:
+            The cached value, or the default value.
+        """
+        from sqlite3 import Error
+
+        try:
+            row = self._connection().execute(
+                'SELECT value, accessed FROM entries '
+                'WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+        except Error:
+            _logger.warning(
+                'Unable to read %r from the cache %s',
+                key,
+                self.path,
+                exc_info=True
+            )
+            row = None
+
+        if row is None:
+            self.misses += 1
+
+            return default
+
+        value, accessed = row
+        now = time()
+
+        if now - accessed > _ACCESS_RESOLUTION:
+            try:
+                with self._transaction() as connection:
+                    connection.execute(
+                        'UPDATE entries SET accessed = ? '
+                        'WHERE namespace = ? AND key = ?',
+                        (now, self.namespace, key)
+                    )
+            except Error:
+                _logger.warning(
+                    'Unable to refresh %r in the cache %s',
+                    key,
+                    self.path,
+                    exc_info=True
+                )
+
+        self.hits += 1
+
+        return unpickle(value)
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Caches the value, evicting the least recently used entries as needed.
+
+        Values larger than max_bytes on their own are not cached.
+
+        Arguments:
+            key (str): The key of the entry.
+            value: The value to cache.
+        """
+        from sqlite3 import Error
+
+        data = pickle(value, protocol=HIGHEST_PROTOCOL)
+
+        try:
+            with self._transaction() as connection:
+                if self.max_bytes is not None and len(data) > self.max_bytes:
+                    connection.execute(
+                        'DELETE FROM entries WHERE namespace = ? AND key = ?',
+                        (self.namespace, key)
+                    )
+
+                    return
+
+                connection.execute(
+                    'INSERT OR REPLACE INTO entries '
+                    '(namespace, key, value, size, accessed) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (self.namespace, key, data, len(data), time())
+                )
+
+                self._evict(connection)
+        except Error:
+            _logger.warning(
+                'Unable to write %r to the cache %s',
+                key,
+                self.path,
+                exc_info=True
+            )
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        The hits, misses and evictions are counted by this process, while
+        the entries and bytes are shared by all processes.
+
+        Returns:
+            dict: The hits, misses, evictions, entries and bytes.
+        """
+        entries, size = self._totals()
+
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': size,
+        }
+
+    def _connection(self) -> 'Connection':
+        from sqlite3 import connect
+
+        # Connections must not be shared by threads, or survive a fork.
+        connection = getattr(self._connections, 'connection', None)
+
+        if connection is None or self._connections.pid != getpid():
+            connection = connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+
+            self._connections.connection = connection
+            self._connections.pid = getpid()
+
+        return connection
+
+    def _evict(self, connection: 'Connection') -> None:
+        evicted = 0
+
+        if self.max_entries is not None:
+            evicted += connection.execute(
+                'DELETE FROM entries WHERE namespace = ? AND key IN ('
+                'SELECT key FROM entries WHERE namespace = ? '
+                'ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.namespace, self.namespace, self.max_entries)
+            ).rowcount
+
+        if self.max_bytes is not None:
+            evicted += connection.execute(
+                'DELETE FROM entries WHERE namespace = ? AND key IN ('
+                'SELECT key FROM (SELECT key, SUM(size) OVER ('
+                'ORDER BY accessed DESC, key ROWS UNBOUNDED PRECEDING'
+                ') AS total FROM entries WHERE namespace = ?) '
+                'WHERE total > ?)',
+                (self.namespace, self.namespace, self.max_bytes)
+            ).rowcount
+
+        self.evictions += evicted
+
+    def _totals(self) -> tuple[int, int]:
+        entries, size = self._connection().execute(
+            'SELECT COUNT(*), TOTAL(size) FROM entries WHERE namespace = ?',
+            (self.namespace,)
+        ).fetchone()
+
+        return entries, int(size)
+
+    @contextmanager
+    def _transaction(self) -> Iterator['Connection']:
+        # Takes the write lock up front, so concurrent writers wait for each
+        # other instead of failing to upgrade a read transaction.
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+
+        try:
+            yield connection
+            connection.execute('COMMIT')
+        except BaseException:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+
+            raise
+
+
+def _contains_html(value: Any) -> bool:
+    # Markup is a str subclass, so JSON serializes it like the plain string
+    # it would be escaped from. Any value marked safe for HTML is refused.
+    if hasattr(value, '__html__'):
+        return True
+
+    if isinstance(value, dict):
+        return any(
+            _contains_html(key) or _contains_html(item)
+            for key, item in value.items()
+        )
+
+    if isinstance(value, (list, tuple)):
+        return any(_contains_html(item) for item in value)
+
+    return False
+
+
+def _reject_value(value: Any) -> None:
+    raise TypeError(f'unable to hash value of type {type(value).__name__}')
+
+
+def create_cache(
+    backend: str = 'memory',
+    namespace: str = 'default',
+    path: str | None = None,
+    max_entries: int | None = None,
+    max_bytes: int | None = None,
+    sizeof: Callable[[Any], int] = getsizeof,
+) -> LRUCache | SQLiteCache:
+    """
+    Creates a cache using the given backend.
+
+    Arguments:
+        backend (str): Either "memory", for a cache private to the process,
+            or "sqlite", for a cache shared by the processes using the same
+            database file.
+        namespace (str): The namespace of the cache in a shared database.
+        path (str | None): The path of the database file, for the sqlite
+            backend.
+        max_entries (int | None): The maximum number of cached entries.
+        max_bytes (int | None): The maximum total size of cached values.
+        sizeof (Callable): Returns the size in bytes of a value cached in
+            memory. Shared caches measure the size of the pickled values.
+
+    Returns:
+        LRUCache | SQLiteCache: The new cache.
+    """
+    if backend == 'memory':
+        return LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=sizeof
+        )
+
+    if backend == 'sqlite':
+        if not path:
+            raise ValueError('the sqlite cache backend requires a path')
+
+        return SQLiteCache(
+            path,
+            namespace=namespace,
+            max_entries=max_entries,
+            max_bytes=max_bytes
+        )
+
+    raise ValueError(f'invalid cache backend {backend!r}')
+
+
+def stable_hash(value: Any) -> str | None:
+    """
+    Generates a hash of a JSON-compatible value that is stable across runs.
+
+    Mappings are hashed independent of key order. Values that cannot be
+    serialized as JSON cannot be hashed reliably, and return None. So do
+    values containing HTML marked as safe (such as Markup), which would
+    hash like the plain strings that render escaped.
+
+    Arguments:
+        value: The value to hash.
+
+    Returns:
+        str | None: The hex digest of the value, or None.
+    """
+    if _contains_html(value):
+        return None
+
+    try:
+        serialized = dumps(
+            value,
+            default=_reject_value,
+            separators=(',', ':'),
+            sort_keys=True,
+        )
+    except (TypeError, ValueError):
+        return None
+
+    return sha256(serialized.encode()).hexdigest()
@@ -0,0 +1,399 @@
+from hashlib import sha256
+from marshal import dumps, loads
+from os import (
+    O_APPEND,
+    O_CREAT,
+    O_RDWR,
+    O_TRUNC,
+    SEEK_SET,
+    close,
+    fstat,
+    lseek,
+    makedirs,
+    open as open_fd,
+    read,
+    remove,
+    replace,
+    scandir,
+    stat,
+    write,
+)
+from os.path import join
+from struct import Struct
+from threading import Lock
+
+from hydra.utils.navigation_utils import Heading
+from hydra.utils.version_utils import render_version
+
+# File locks serialize writers across processes where fcntl is available.
+# Elsewhere, e.g. on Windows, writers are only serialized within a process.
+try:
+    from fcntl import LOCK_EX, LOCK_UN, flock
+except ImportError:
+    flock = None
+
+# Windows opens files in text mode unless O_BINARY is set.
+try:
+    from os import O_BINARY
+except ImportError:
+    O_BINARY = 0
+
+_MARSHAL_VERSION = 4
+
+# The index starts with a header identifying the format and the rendering
+# code version, followed by fixed-size records pointing into the data file.
+_MAGIC = b'HYFRAG01'
+_HEADER = Struct('<8s32s')
+_RECORD = Struct('<32sQI')
+
+
+def _lock_file(fd: int) -> None:
+    if flock is not None:
+        flock(fd, LOCK_EX)
+
+
+def _plain_headings(headings: tuple) -> tuple:
+    return tuple(
+        (heading.label, heading.url, _plain_headings(heading.children))
+        for heading in headings
+    )
+
+
+def _read_at(fd: int, length: int, offset: int) -> bytes:
+    lseek(fd, offset, SEEK_SET)
+
+    return read(fd, length)
+
+
+def _restore_headings(items: tuple) -> tuple[Heading, ...]:
+    return tuple(
+        Heading(label, url, _restore_headings(children))
+        for label, url, children in items
+    )
+
+
+def _unlock_file(fd: int) -> None:
+    if flock is not None:
+        flock(fd, LOCK_UN)
+
+
+class FragmentStore:
+    """
+    Persists rendered Markdown fragments in a local directory.
+
+    Each fragment (the body HTML and its heading tree) is serialized with
+    marshal and appended to a data file, and its location is appended to a
+    fixed-record index file. Each process reads the index into a dict of
+    locations, one entry per fragment, and reads the records appended by
+    other processes before each lookup. Fragment data is only read when the
+    fragment is requested.
+
+    The files are named for a version stamp of the rendering code (see
+    version_utils.render_version), so upgrading Hydra, Pygments or Markdown
+    starts a new store. Stores of different versions can share a directory,
+    e.g. during a rolling deploy. When a store is created, only the files of
+    the max_versions most recently written versions, including its own, are
+    kept. Once the data file would exceed max_bytes, the store is cleared.
+    Writers across processes are serialized with a lock file.
+
+    Arguments:
+        directory (str): The directory to store the fragments in.
+        max_bytes (int | None): The maximum size of the data file.
+        version (str | None): The version stamp. Defaults to
+            render_version().
+        max_versions (int): The number of versions whose files are kept.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int | None = None,
+        version: str | None = None,
+        max_versions: int = 3,
+    ):
+        stamp = sha256((version or render_version()).encode()).digest()
+        name = f'fragments-{stamp.hex()[:16]}'
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_versions = max_versions
+        self._name = name
+        self._stamp = stamp
+        self._index_path = join(directory, f'{name}.index')
+        self._data_path = join(directory, f'{name}.data')
+        self._lock = Lock()
+        self._lock_fd = None
+        self._index_fd = None
+        self._data_fd = None
+        self._index_inode = None
+        self._scanned = _HEADER.size
+        self._locations = {}
+        self.hits = 0
+        self.misses = 0
+
+        makedirs(directory, exist_ok=True)
+        self._prune_versions()
+
+    def get(self, key: str) -> tuple[str, tuple[Heading, ...]] | None:
+        """
+        Loads a fragment.
+
+        Arguments:
+            key (str): The hex key of the fragment.
+
+        Returns:
+            tuple[str, tuple[Heading, ...]] | None: The body HTML and the
+                headings, or None if the fragment is not stored.
+        """
+        digest = bytes.fromhex(key)
+
+        with self._lock:
+            self._refresh()
+            location = self._locations.get(digest)
+
+            if location is None:
+                self.misses += 1
+
+                return None
+
+            offset, length = location
+            data = _read_at(self._data_fd, length, offset)
+
+        try:
+            html, headings = loads(data)
+        except (EOFError, TypeError, ValueError):
+            self.misses += 1
+
+            return None
+
+        self.hits += 1
+
+        return html, _restore_headings(headings)
+
+    def set(self, key: str, html: str, headings: tuple) -> None:
+        """
+        Stores a fragment.
+
+        Arguments:
+            key (str): The hex key of the fragment.
+            html (str): The body HTML.
+            headings (tuple): The heading tree.
+        """
+        digest = bytes.fromhex(key)
+        data = dumps((html, _plain_headings(headings)), _MARSHAL_VERSION)
+
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._ensure_open()
+            _lock_file(self._lock_fd)
+
+            try:
+                self._refresh_locked()
+
+                offset = fstat(self._data_fd).st_size
+
+                if (
+                    self.max_bytes is not None
+                    and offset + len(data) > self.max_bytes
+                ):
+                    self._reset()
+                    offset = 0
+
+                # The data is written before the index record, so readers
+                # never see a record for a partially written fragment.
+                write(self._data_fd, data)
+                write(
+                    self._index_fd,
+                    _RECORD.pack(digest, offset, len(data))
+                )
+            finally:
+                _unlock_file(self._lock_fd)
+
+            self._locations[digest] = (offset, len(data))
+
+    def stats(self) -> dict:
+        """
+        Returns the store's counters.
+
+        Returns:
+            dict: The hits, misses, entries and the size of the data file.
+        """
+        with self._lock:
+            self._refresh()
+
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._locations),
+                'bytes': fstat(self._data_fd).st_size,
+            }
+
+    def _close(self) -> None:
+        for fd in (self._index_fd, self._data_fd):
+            if fd is not None:
+                close(fd)
+
+        self._index_fd = None
+        self._data_fd = None
+        self._index_inode = None
+        self._scanned = _HEADER.size
+        self._locations = {}
+
+    def _create(self) -> None:
+        # Replaces both files, so processes reading the previous files keep
+        # valid descriptors and notice the new index inode on their next read.
+        for path, content in (
+            (self._data_path, b''),
+            (self._index_path, _HEADER.pack(_MAGIC, self._stamp)),
+        ):
+            temporary_path = f'{path}.tmp'
+            fd = open_fd(
+                temporary_path,
+                O_CREAT | O_RDWR | O_TRUNC | O_BINARY,
+                0o644
+            )
+
+            try:
+                write(fd, content)
+            finally:
+                close(fd)
+
+            replace(temporary_path, path)
+
+    def _ensure_lock_file(self) -> None:
+        if self._lock_fd is None:
+            self._lock_fd = open_fd(
+                join(self.directory, 'fragments.lock'),
+                O_CREAT | O_RDWR,
+                0o644
+            )
+
+    def _ensure_open(self) -> None:
+        self._ensure_lock_file()
+
+        if self._index_fd is not None:
+            return
+
+        _lock_file(self._lock_fd)
+
+        try:
+            if not self._is_valid():
+                self._create()
+
+            self._open()
+        finally:
+            _unlock_file(self._lock_fd)
+
+    def _is_valid(self) -> bool:
+        try:
+            with open(self._index_path, 'rb') as file:
+                header = file.read(_HEADER.size)
+
+            stat(self._data_path)
+        except OSError:
+            return False
+
+        return header == _HEADER.pack(_MAGIC, self._stamp)
+
+    def _open(self) -> None:
+        self._index_fd = open_fd(
+            self._index_path,
+            O_RDWR | O_APPEND | O_BINARY
+        )
+        self._data_fd = open_fd(
+            self._data_path,
+            O_RDWR | O_APPEND | O_BINARY
+        )
+        self._index_inode = fstat(self._index_fd).st_ino
+
+    def _prune_versions(self) -> None:
+        # Other versions may still be in use by processes that have not been
+        # replaced yet, so only the least recently written ones are removed.
+        versions = {}
+
+        for entry in scandir(self.directory):
+            if entry.name.startswith('fragments-'):
+                name = entry.name.split('.', 1)[0]
+
+                try:
+                    modified = entry.stat().st_mtime
+                except OSError:
+                    continue
+
+                paths, latest = versions.get(name, ([], modified))
+                paths.append(entry.path)
+                versions[name] = paths, max(latest, modified)
+
+        versions.pop(self._name, None)
+        stale = sorted(
+            versions.values(),
+            key=lambda version: version[1],
+            reverse=True
+        )[max(self.max_versions - 1, 0):]
+
+        if not stale:
+            return
+
+        self._ensure_lock_file()
+        _lock_file(self._lock_fd)
+
+        try:
+            for paths, _ in stale:
+                for path in paths:
+                    try:
+                        remove(path)
+                    except OSError:
+                        pass
+        finally:
+            _unlock_file(self._lock_fd)
+
+    def _refresh(self) -> None:
+        self._ensure_open()
+
+        try:
+            inode = stat(self._index_path).st_ino
+        except OSError:
+            inode = None
+
+        if inode != self._index_inode:
+            self._close()
+            self._ensure_open()
+
+        self._scan()
+
+    def _refresh_locked(self) -> None:
+        try:
+            inode = stat(self._index_path).st_ino
+        except OSError:
+            inode = None
+
+        if inode != self._index_inode:
+            self._close()
+
+            if not self._is_valid():
+                self._create()
+
+            self._open()
+
+        self._scan()
+
+    def _reset(self) -> None:
+        self._close()
+        self._create()
+        self._open()
+
+    def _scan(self) -> None:
+        size = fstat(self._index_fd).st_size
+        end = size - (size - _HEADER.size) % _RECORD.size
+
+        if end <= self._scanned:
+            return
+
+        records = _read_at(self._index_fd, end - self._scanned, self._scanned)
+
+        for digest, offset, length in _RECORD.iter_unpack(records):
+            self._locations[digest] = (offset, length)
+
+        self._scanned = end
@@ -0,0 +1,447 @@
+from concurrent.futures import Executor
+from hashlib import sha256
+from itertools import repeat
+from os import makedirs, remove, replace, scandir, utime
+from os.path import getsize, join
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from time import monotonic
+from typing import Any, Iterable
+
+import flask
+
+from hydra.utils.cache_utils import create_cache
+from hydra.utils.pygments_utils import get_formatter, get_lexer
+
+
+# Processes sharing a disk store only count their own writes, so each
+# re-measures the directory once this many seconds have passed since the last
+# measurement.
+_RESCAN_INTERVAL = 1.0
+
+
+class _DiskStore:
+    """
+    Stores highlighted code as files in a local directory.
+
+    Each entry is written to a file named for its key. Once the total size
+    of the stored files exceeds max_bytes, the least recently used files (by
+    modification time, which is refreshed on each read) are removed. The
+    total size is re-measured periodically, to include the files written by
+    other processes sharing the directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int | None = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        self._size = None
+        self._scanned_at = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> str | None:
+        path = self._path_for(key)
+
+        try:
+            with open(path, encoding='utf-8') as file:
+                value = file.read()
+        except OSError:
+            self.misses += 1
+
+            return None
+
+        try:
+            utime(path)
+        except OSError:
+            pass
+
+        self.hits += 1
+
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        data = value.encode('utf-8')
+
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+
+        path = self._path_for(key)
+        file = NamedTemporaryFile(
+            dir=self.directory,
+            prefix='.',
+            suffix='.tmp',
+            delete=False,
+        )
+        temporary = file.name
+
+        try:
+            with file:
+                file.write(data)
+
+            with self._lock:
+                try:
+                    previous = getsize(path)
+                except OSError:
+                    previous = 0
+
+                replace(temporary, path)
+                temporary = None
+
+                if self._is_stale():
+                    self._rescan()
+                else:
+                    self._size += len(data) - previous
+
+                if self.max_bytes is not None and self._size > self.max_bytes:
+                    self._evict()
+        finally:
+            if temporary is not None:
+                try:
+                    remove(temporary)
+                except OSError:
+                    pass
+
+    def size(self) -> int:
+        with self._lock:
+            if self._is_stale():
+                self._rescan()
+
+            return self._size
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bytes': self.size(),
+        }
+
+    def _entries(self) -> list:
+        return [
+            entry for entry in scandir(self.directory)
+            if entry.is_file() and entry.name.endswith('.html')
+        ]
+
+    def _evict(self) -> None:
+        # Evict down to 90% of the limit, so that a full store does not have
+        # to scan the directory on every write.
+        target = self.max_bytes * 9 // 10
+        entries = sorted(
+            ((entry.stat(), entry.path) for entry in self._entries()),
+            key=lambda item: item[0].st_mtime_ns,
+        )
+        size = sum(stat.st_size for stat, _ in entries)
+
+        for stat, path in entries:
+            if size <= target:
+                break
+
+            try:
+                remove(path)
+            except OSError:
+                continue
+
+            size -= stat.st_size
+            self.evictions += 1
+
+        self._size = size
+        self._scanned_at = monotonic()
+
+    def _is_stale(self) -> bool:
+        return (
+            self._size is None
+            or monotonic() - self._scanned_at >= _RESCAN_INTERVAL
+        )
+
+    def _path_for(self, key: str) -> str:
+        return join(self.directory, f'{key}.html')
+
+    def _rescan(self) -> None:
+        self._size = sum(entry.stat().st_size for entry in self._entries())
+        self._scanned_at = monotonic()
+
+
+class HighlightCache:
+    """
+    A content-addressed cache of highlighted code blocks.
+
+    Highlighted HTML is kept in memory with least-recently-used eviction,
+    and optionally persisted to a local directory so that new processes can
+    reuse code highlighted by earlier ones. With the sqlite backend, the
+    least-recently-used layer is shared by all processes using the database.
+
+    Arguments:
+        max_entries (int | None): The maximum number of blocks to keep in
+            memory. Set to 0 to disable the memory cache.
+        max_bytes (int | None): The maximum total size of the blocks kept in
+            memory.
+        directory (str | None): The directory used to persist blocks, if any.
+        max_disk_bytes (int | None): The maximum total size of the persisted
+            blocks.
+        backend (str): The backend of the least-recently-used layer, see
+            cache_utils.create_cache().
+        path (str | None): The path of the shared cache database, for the
+            sqlite backend.
+    """
+
+    def __init__(
+        self,
+        max_entries: int | None = 1024,
+        max_bytes: int | None = None,
+        directory: str | None = None,
+        max_disk_bytes: int | None = None,
+        backend: str = 'memory',
+        path: str | None = None,
+    ):
+        self._memory = None
+        self._disk = None
+
+        if max_entries != 0:
+            self._memory = create_cache(
+                backend,
+                namespace='highlight',
+                path=path,
+                max_entries=max_entries,
+                max_bytes=max_bytes
+            )
+
+        if directory:
+            self._disk = _DiskStore(directory, max_bytes=max_disk_bytes)
+
+    def get(self, key: str) -> str | None:
+        """
+        Finds the highlighted code for the given key.
+
+        Arguments:
+            key (str): The content key, see highlight_key().
+
+        Returns:
+            str | None: The highlighted HTML, if cached.
+        """
+        if self._memory is not None:
+            value = self._memory.get(key)
+
+            if value is not None:
+                return value
+
+        if self._disk is None:
+            return None
+
+        value = self._disk.get(key)
+
+        if value is not None and self._memory is not None:
+            self._memory.set(key, value)
+
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Caches the highlighted code for the given key.
+
+        Arguments:
+            key (str): The content key, see highlight_key().
+            value (str): The highlighted HTML.
+        """
+        if self._memory is not None:
+            self._memory.set(key, value)
+
+        if self._disk is not None:
+            self._disk.set(key, value)
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: The counters for the memory and disk stores, and the
+                overall hit rate.
+        """
+        memory = self._memory.stats() if self._memory is not None else None
+        disk = self._disk.stats() if self._disk is not None else None
+        hits = 0
+        lookups = 0
+
+        if memory is not None:
+            hits += memory['hits']
+            lookups += memory['hits'] + memory['misses']
+
+        if disk is not None:
+            hits += disk['hits']
+
+            if memory is None:
+                lookups += disk['hits'] + disk['misses']
+
+        return {
+            'memory': memory,
+            'disk': disk,
+            'hit_rate': hits / lookups if lookups else 0.0,
+        }
+
+
+# The cache used outside of an application context.
+_default_cache = HighlightCache()
+
+
+def _highlight(code: str, language: str, options: dict) -> str:
+    from pygments import highlight
+
+    return highlight(code, get_lexer(language), get_formatter(**options))
+
+
+def configure_highlight_cache(
+    app: flask.Flask,
+    **options: Any
+) -> HighlightCache:
+    """
+    Replaces an application's highlight cache.
+
+    Arguments:
+        app (Flask): The application.
+        options: The options to pass to HighlightCache.
+
+    Returns:
+        HighlightCache: The new cache.
+    """
+    cache = app.extensions['hydra.highlight_cache'] = HighlightCache(**options)
+
+    return cache
+
+
+def get_highlight_cache() -> HighlightCache:
+    """
+    Returns the current application's highlight cache.
+
+    Outside of an application context, or for an application without a
+    configured cache, a process-wide default cache is returned.
+
+    Returns:
+        HighlightCache: The current cache.
+    """
+    if flask.has_app_context():
+        cache = flask.current_app.extensions.get('hydra.highlight_cache')
+
+        if cache is not None:
+            return cache
+
+    return _default_cache
+
+
+def highlight_code(code: str, language: str, **options: Any) -> str | None:
+    """
+    Highlights code with Pygments, reusing previously highlighted output.
+
+    Arguments:
+        code (str): The code to highlight.
+        language (str): The language alias used to find the lexer.
+        options: The options to pass to the HTML formatter.
+
+    Returns:
+        str | None: The highlighted HTML, or None if there is no lexer for
+            the language.
+    """
+    lexer = get_lexer(language)
+
+    if lexer is None:
+        return None
+
+    key = highlight_key(code, language, **options)
+    cache = get_highlight_cache()
+    value = cache.get(key)
+
+    if value is not None:
+        return value
+
+    from pygments import highlight
+
+    value = highlight(code, lexer, get_formatter(**options))
+
+    cache.set(key, value)
+
+    return value
+
+
+def highlight_many(
+    blocks: Iterable[tuple[str, str]],
+    executor: Executor | None = None,
+    **options: Any
+) -> list[str | None]:
+    """
+    Highlights multiple code blocks, optionally using an executor.
+
+    Cached blocks are read from the highlight cache. The remaining blocks are
+    highlighted on the executor (a thread or process pool) if given, and the
+    results are stored in the cache of the calling process.
+
+    Arguments:
+        blocks (Iterable[tuple[str, str]]): The code and language alias of
+            each block.
+        executor (Executor | None): The executor used to highlight uncached
+            blocks.
+        options: The options to pass to the HTML formatter.
+
+    Returns:
+        list[str | None]: The highlighted HTML for each block, in order, or
+            None if there is no lexer for the block's language.
+    """
+    cache = get_highlight_cache()
+    results = []
+    pending = []
+
+    for code, language in blocks:
+        results.append(None)
+
+        if get_lexer(language) is None:
+            continue
+
+        key = highlight_key(code, language, **options)
+        value = cache.get(key)
+
+        if value is None:
+            pending.append((len(results) - 1, key, code, language))
+        else:
+            results[-1] = value
+
+    codes = [code for _, _, code, _ in pending]
+    languages = [language for _, _, _, language in pending]
+
+    if executor is None:
+        values = map(_highlight, codes, languages, repeat(options))
+    else:
+        values = executor.map(_highlight, codes, languages, repeat(options))
+
+    for (index, key, _, _), value in zip(pending, values):
+        cache.set(key, value)
+        results[index] = value
+
+    return results
+
+
+def highlight_key(code: str, language: str, **options: Any) -> str:
+    """
+    Generates the content address for a highlighted code block.
+
+    The key includes the Pygments version, so upgrading Pygments does not
+    reuse stale output from a persistent cache.
+
+    Arguments:
+        code (str): The code to highlight.
+        language (str): The language alias used to find the lexer.
+        options: The options to pass to the HTML formatter.
+
+    Returns:
+        str: The hex digest of the inputs.
+    """
+    from pygments import __version__ as pygments_version
+
+    hasher = sha256()
+
+    hasher.update(f'pygments={pygments_version}\0'.encode())
+    hasher.update(f'{language}\0'.encode())
+    hasher.update(f'{sorted(options.items())!r}\0'.encode())
+    hasher.update(code.encode())
+
+    return hasher.hexdigest()
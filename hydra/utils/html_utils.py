@@ -1,25 +1,20 @@
-from bs4 import BeautifulSoup
-from bs4.element import PageElement, Tag
+from typing import TYPE_CHECKING
 
-from hydra.utils.string_utils import kebab_case
+from hydra.utils.navigation_utils import Heading, build_headings
+from hydra.utils.string_utils import kebab_case_unique
 
+# BeautifulSoup is imported on first use, so importing Hydra stays cheap.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+    from bs4.element import PageElement
 
-_HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
-
-
-def _get_parent_children(headings: list, heading_level: int) -> list:
-    children = headings
 
-    for _ in range(1, heading_level):
-        if len(children) == 0:
-            return children
-
-        children = children[-1]['children']
+_HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
 
-    return children
 
+def _is_heading_tag(element: 'PageElement') -> bool:
+    from bs4.element import Tag
 
-def _is_heading_tag(element: PageElement) -> bool:
     if not isinstance(element, Tag):
         return False
 
@@ -29,7 +24,7 @@ def _is_heading_tag(element: PageElement) -> bool:
     return element.name in _HEADING_TAGS
 
 
-def add_header_ids(fragment: BeautifulSoup) -> BeautifulSoup:
+def add_header_ids(fragment: 'BeautifulSoup') -> 'BeautifulSoup':
     """
     Adds auto-generated id attributes to header tags.
 
@@ -39,28 +34,64 @@ def add_header_ids(fragment: BeautifulSoup) -> BeautifulSoup:
     Returns:
         BeautifulSoup: The processed HTML.
     """
-    for heading_tag in _HEADING_TAGS:
-        for tag in fragment.find_all(heading_tag):
-            tag.attrs['id'] = kebab_case(tag.text)
+    fragment, _ = process_headings(fragment)
 
     return fragment
 
 
-def parse_headings(fragment: BeautifulSoup) -> list:
-    headings = []
+def process_headings(
+    fragment: 'BeautifulSoup'
+) -> tuple['BeautifulSoup', tuple[Heading, ...]]:
+    """
+    Adds header ids and parses the navigation headings in a single pass.
+
+    Each header tag is given an auto-generated id attribute, deduplicated
+    within the fragment by adding a numeric suffix (e.g. "examples-1"). The
+    h2-h6 tags at the top level of the fragment are collected as nested
+    headings, in the format returned by parse_headings().
+
+    Arguments:
+        fragment (BeautifulSoup): The HTML to process.
+
+    Returns:
+        tuple[BeautifulSoup, tuple[Heading, ...]]: The processed HTML and
+            the headings.
+    """
+    entries = []
+    tags = fragment.find_all(_HEADING_TAGS)
+    texts = [tag.text for tag in tags]
+
+    for tag, text, slug in zip(tags, texts, kebab_case_unique(texts)):
+        tag.attrs['id'] = slug
 
-    for element in fragment.children:
-        if not _is_heading_tag(element):
+        if tag.parent is not fragment or tag.name == 'h1':
             continue
 
-        # Only generate headings for h2-h6 tags.
-        heading_level = _HEADING_TAGS.index(element.name)
-        heading = {
-            'label': element.text,
-            'url': f"#{element.attrs['id']}",
-            'children': []
-        }
-        children = _get_parent_children(headings, heading_level)
-        children.append(heading)
-
-    return headings
+        entries.append((_HEADING_TAGS.index(tag.name), text, f'#{slug}'))
+
+    return fragment, build_headings(entries)
+
+
+def parse_headings(fragment: 'BeautifulSoup') -> tuple[Heading, ...]:
+    """
+    Parses the navigation headings of a fragment.
+
+    The h2-h6 tags at the top level of the fragment are collected as nested
+    headings (see navigation_utils.build_headings). The tags must already
+    have id attributes, see add_header_ids().
+
+    Arguments:
+        fragment (BeautifulSoup): The HTML to parse.
+
+    Returns:
+        tuple[Heading, ...]: The top-level headings.
+    """
+    return build_headings(
+        (
+            _HEADING_TAGS.index(element.name),
+            element.text,
+            f"#{element.attrs['id']}",
+        )
+        for element in fragment.children
+        if _is_heading_tag(element)
+    )
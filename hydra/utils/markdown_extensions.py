@@ -0,0 +1,90 @@
+from html import unescape
+from re import compile
+from xml.etree.ElementTree import Element
+
+from markdown import Markdown
+from markdown.extensions import Extension
+from markdown.extensions.toc import render_inner_html
+from markdown.treeprocessors import Treeprocessor
+
+from hydra.utils.navigation_utils import build_headings
+from hydra.utils.string_utils import kebab_case_unique
+
+
+_HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+_raw_heading_pattern = compile(r'(?i)<h[1-6][\s/>]')
+_tag_pattern = compile(r'<[^>]+>')
+
+
+def _get_text(element: Element, md: Markdown) -> str:
+    inner_html = render_inner_html(element, md)
+
+    return unescape(_tag_pattern.sub('', inner_html))
+
+
+class HeadingsTreeprocessor(Treeprocessor):
+    """
+    Assigns header IDs and collects the navigation headings.
+
+    Every heading tag is given an auto-generated id attribute, deduplicated
+    within the document by adding a numeric suffix. The h2-h6 tags at the
+    top level of the document are collected as a tree of headings, matching
+    the output of html_utils.parse_headings(), and stored as the headings
+    attribute of the Markdown instance.
+
+    Headings written as raw HTML are stashed by Markdown, out of reach of
+    the treeprocessor. If the document contains any, no heading is
+    processed and the headings attribute is set to None instead.
+    """
+
+    def run(self, root: Element) -> None:
+        if any(
+            _raw_heading_pattern.search(str(block))
+            for block in self.md.htmlStash.rawHtmlBlocks
+        ):
+            self.md.headings = None
+
+            return
+
+        entries = []
+        elements = [
+            element for element in root.iter() if element.tag in _HEADING_TAGS
+        ]
+        texts = [_get_text(element, self.md) for element in elements]
+        top_level = set(root)
+
+        for element, text, slug in zip(
+            elements,
+            texts,
+            kebab_case_unique(texts)
+        ):
+            element.set('id', slug)
+
+            if element not in top_level or element.tag == 'h1':
+                continue
+
+            heading_level = _HEADING_TAGS.index(element.tag)
+
+            entries.append((heading_level, text, f'#{slug}'))
+
+        self.md.headings = build_headings(entries)
+
+
+class HeadingsExtension(Extension):
+    """
+    Processes document headings inside the Markdown ElementTree stage.
+
+    After converting a document, the navigation headings are available as
+    the headings attribute of the Markdown instance, or None if the document
+    contains raw HTML headings.
+    """
+
+    def extendMarkdown(self, md: Markdown) -> None:
+        self.md = md
+        md.registerExtension(self)
+        md.headings = ()
+        md.treeprocessors.register(HeadingsTreeprocessor(md), 'headings', 5)
+
+    def reset(self) -> None:
+        self.md.headings = ()
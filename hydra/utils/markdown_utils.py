@@ -1,55 +1,483 @@
-from re import compile, search
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import lru_cache
+from itertools import count
+from os import getpid
+from re import Pattern, compile, escape, sub
+from threading import Lock, local
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple
 
-from pygments import highlight
-from pygments.formatters import HtmlFormatter
-from pygments.lexer import Lexer
-from pygments.lexers import get_lexer_by_name
+import flask
 
+from hydra.utils.highlight_utils import highlight_code, highlight_many
+from hydra.utils.timing_utils import timed
 
-_fence_pattern = compile(r'```')
+# Python-Markdown is imported on first use, so importing Hydra stays cheap.
+if TYPE_CHECKING:
+    from markdown import Markdown
 
 
-def _get_lexer_for(language: str) -> Lexer | None:
-    if language == '' or language == 'none':
-        return None
+_FORMATTER_OPTIONS = {'linenos': False, 'style': 'native'}
 
-    return get_lexer_by_name(language, stripall=True)
+# Matches an opening code fence at the start of a line: three or more
+# backticks or tildes, followed by an optional info string. The info string
+# of a backtick fence may not contain backticks, so inline code spans such as
+# ```code``` are not treated as fences.
+_opening_fence_pattern = compile(
+    r'(?m)^(?P<indent>[ \t]*)'
+    r'(?:(?P<backticks>`{3,})(?P<backtick_info>[^`\n]*)'
+    r'|(?P<tildes>~{3,})(?P<tilde_info>[^\n]*))$'
+)
 
+# Numbers each Markdown configuration, see get_converter_generation().
+_generations = count()
 
-def _generate_code_block(lines: list[str], language: str) -> str:
-    lexer = _get_lexer_for(language)
 
-    if lexer:
-        code = '\n'.join(lines)
-        formatter = HtmlFormatter(linenos=False, style='native')
+class CodeSegment(NamedTuple):
+    """
+    A fenced code block in a Markdown document.
+
+    Arguments:
+        code (str): The contents of the code block, without the fences.
+        language (str): The language identifier, if any.
+    """
+    code: str
+    language: str
+
+
+class TextSegment(NamedTuple):
+    """
+    A span of Markdown text outside of any code block.
+
+    Arguments:
+        text (str): The text.
+    """
+    text: str
+
+
+class _Converters:
+    # The Markdown configuration of an application, and the converters each
+    # thread has built from it.
+
+    def __init__(
+        self,
+        extensions: list[str] | tuple[str, ...] = (),
+        extension_configs: dict[str, dict[str, Any]] | None = None,
+    ):
+        self.extensions = tuple(extensions)
+        self.extension_configs = dict(extension_configs or {})
+        self.generation = next(_generations)
+        self.local = local()
+
+    def get(self, headings: bool) -> 'Markdown':
+        converters = getattr(self.local, 'converters', None)
+
+        if converters is None:
+            converters = self.local.converters = {}
+
+        converter = converters.get(headings)
+
+        if converter is None:
+            converter = converters[headings] = self._build(headings)
+
+        return converter
+
+    def _build(self, headings: bool) -> 'Markdown':
+        from markdown import Markdown
+
+        from hydra.utils.markdown_extensions import HeadingsExtension
+
+        extensions = list(self.extensions)
+
+        if headings:
+            extensions.append(HeadingsExtension())
+
+        return Markdown(
+            extensions=extensions,
+            extension_configs=self.extension_configs,
+        )
+
+
+class _ParallelHighlighting:
+    # The parallel highlighting options of an application, and its executor.
+
+    def __init__(
+        self,
+        executor: str | None = None,
+        max_workers: int | None = None,
+        min_blocks: int = 16,
+        min_bytes: int = 16 * 1024,
+    ):
+        if executor not in (None, 'process', 'thread'):
+            raise ValueError(f'invalid executor {executor!r}')
+
+        self.executor = executor
+        self.max_workers = max_workers
+        self.min_blocks = min_blocks
+        self.min_bytes = min_bytes
+        self.lock = Lock()
+        self.pool = None
+        self.pool_pid = None
+
+    def get_executor(self, blocks: list['CodeSegment']) -> Executor | None:
+        if self.executor is None or len(blocks) < self.min_blocks:
+            return None
+
+        if sum(len(block.code) for block in blocks) < self.min_bytes:
+            return None
+
+        # Executors do not survive a fork, so each process creates its own.
+        with self.lock:
+            if self.pool is None or self.pool_pid != getpid():
+                executor_class = (
+                    ProcessPoolExecutor
+                    if self.executor == 'process'
+                    else ThreadPoolExecutor
+                )
+                self.pool = executor_class(max_workers=self.max_workers)
+                self.pool_pid = getpid()
+
+            return self.pool
+
+    def shutdown(self) -> None:
+        with self.lock:
+            if self.pool is not None and self.pool_pid == getpid():
+                self.pool.shutdown(wait=False)
+
+            self.pool = None
+
 
-        return highlight(code, lexer, formatter)
-    else:
-        return _generate_unhighlighted_block(lines)
+# The configuration used outside of an application context.
+_default_converters = _Converters()
+_default_parallel_highlighting = _ParallelHighlighting()
 
 
-def _generate_unhighlighted_block(lines: list[str]) -> str:
-    buffer = []
+@lru_cache(maxsize=32)
+def _closing_fence_pattern(fence: str) -> Pattern:
+    char = escape(fence[0])
 
-    buffer.append(f"<pre><code>{lines[0]}")
+    return compile(rf'(?m)^[ \t]*{char}{{{len(fence)},}}[ \t\r]*$')
 
-    if len(lines) == 1:
-        return f"{buffer[0]}</code></pre>"
 
-    for line in lines[1:-1]:
-        buffer.append(f"{line}")
+def _dedent(code: str, indent: int) -> str:
+    if indent == 0:
+        return code
 
-    buffer.append(f"{lines[-1]}</code></pre>")
+    return sub(rf'(?m)^[ \t]{{0,{indent}}}', '', code)
 
-    return '\n'.join(buffer)
+
+def _generate_code_block(code: str, language: str) -> str:
+    highlighted = None
+
+    if _is_highlighted(language):
+        with timed('highlight'):
+            highlighted = highlight_code(
+                code,
+                language,
+                **_FORMATTER_OPTIONS
+            )
+
+    if highlighted is None:
+        return _generate_unhighlighted_block(code)
+
+    return highlighted
+
+
+def _generate_code_blocks(blocks: list[CodeSegment]) -> list[str]:
+    executor = _get_parallel_executor(blocks)
+
+    if executor is None:
+        return [
+            _generate_code_block(block.code, language=block.language)
+            for block in blocks
+        ]
+
+    highlighted_blocks = [
+        (block.code, block.language)
+        for block in blocks
+        if _is_highlighted(block.language)
+    ]
+
+    with timed('highlight'):
+        highlighted = iter(
+            highlight_many(
+                highlighted_blocks,
+                executor=executor,
+                **_FORMATTER_OPTIONS
+            )
+        )
+
+    generated = []
+
+    for block in blocks:
+        html = next(highlighted) if _is_highlighted(block.language) else None
+
+        if html is None:
+            html = _generate_unhighlighted_block(block.code)
+
+        generated.append(html)
+
+    return generated
+
+
+def _generate_unhighlighted_block(code: str) -> str:
+    return f'<pre><code>{code}</code></pre>'
+
+
+def _get_converters() -> _Converters:
+    if flask.has_app_context():
+        converters = flask.current_app.extensions.get('hydra.markdown')
+
+        if converters is not None:
+            return converters
+
+    return _default_converters
+
+
+def _get_parallel_executor(blocks: list[CodeSegment]) -> Executor | None:
+    parallel = None
+
+    if flask.has_app_context():
+        parallel = flask.current_app.extensions.get(
+            'hydra.parallel_highlighting'
+        )
+
+    if parallel is None:
+        parallel = _default_parallel_highlighting
+
+    return parallel.get_executor(blocks)
+
+
+def _is_highlighted(language: str) -> bool:
+    return language != '' and language != 'none'
+
+
+def configure_markdown(
+    app: flask.Flask,
+    extensions: list[str] | tuple[str, ...] = (),
+    extension_configs: dict[str, dict[str, Any]] | None = None,
+) -> None:
+    """
+    Configures the Python-Markdown extensions an application converts with.
+
+    Converters built with the previous configuration are discarded.
+
+    Arguments:
+        app (Flask): The application.
+        extensions (list[str] | tuple[str, ...]): The names of the
+            extensions, e.g. "tables" or "markdown.extensions.attr_list".
+        extension_configs (dict | None): The configuration for each
+            extension, by name.
+    """
+    app.extensions['hydra.markdown'] = _Converters(
+        extensions,
+        extension_configs
+    )
+
+
+def configure_parallel_highlighting(
+    app: flask.Flask,
+    executor: str | None = None,
+    max_workers: int | None = None,
+    min_blocks: int = 16,
+    min_bytes: int = 16 * 1024,
+) -> None:
+    """
+    Configures an application's concurrent highlighting of code blocks.
+
+    Documents with at least min_blocks fenced code blocks, totalling at least
+    min_bytes of code, have their blocks highlighted concurrently. Smaller
+    documents are highlighted serially to avoid the overhead of the pool.
+
+    Arguments:
+        app (Flask): The application.
+        executor (str | None): "thread" or "process" to use a thread or
+            process pool, or None to always highlight serially.
+        max_workers (int | None): The size of the pool. Defaults to the
+            executor's default size.
+        min_blocks (int): The minimum number of code blocks.
+        min_bytes (int): The minimum total size of the code blocks.
+    """
+    parallel = _ParallelHighlighting(
+        executor,
+        max_workers,
+        min_blocks,
+        min_bytes
+    )
+    previous = app.extensions.get('hydra.parallel_highlighting')
+    app.extensions['hydra.parallel_highlighting'] = parallel
+
+    if previous is not None:
+        previous.shutdown()
+
+
+def convert_document(
+    document: str,
+    headings: bool = False
+) -> tuple[str, tuple | None]:
+    """
+    Converts a Markdown document to HTML using the thread's converter.
+
+    The converter is reset afterwards, so it does not keep the document's
+    state, such as its stashed HTML blocks, alive until the next document.
+
+    Arguments:
+        document (str): The Markdown document, after fence processing.
+        headings (bool): If true, the document's headings are collected
+            using the HeadingsExtension.
+
+    Returns:
+        tuple[str, tuple | None]: The HTML, and the heading tree if
+            requested, or an empty tuple. The heading tree is None if the
+            document contains raw HTML headings.
+    """
+    converter = get_converter(headings=headings)
+
+    try:
+        return converter.convert(document), getattr(converter, 'headings', ())
+    finally:
+        converter.reset()
+
+
+def get_converter(headings: bool = False) -> 'Markdown':
+    """
+    Returns a reset Markdown converter for the current thread.
+
+    Each thread keeps its own converters for each application's
+    configuration (see configure_markdown), which are built once and reset
+    before each use rather than constructed for every document. Outside of
+    an application context, converters have no extensions. A converter must
+    not be shared with other threads.
+
+    Arguments:
+        headings (bool): If true, the converter includes the
+            HeadingsExtension, and the headings of each converted document
+            are available as its headings attribute.
+
+    Returns:
+        Markdown: The converter.
+    """
+    return _get_converters().get(headings).reset()
+
+
+def get_converter_generation() -> int:
+    """
+    Returns a number identifying the current converter configuration.
+
+    Each call to configure_markdown() is numbered, so output cached by a
+    process can be keyed by the configuration used to convert it.
+
+    Returns:
+        int: The configuration number.
+    """
+    return _get_converters().generation
+
+
+def iter_fenced_segment_spans(
+    document: str
+) -> Iterator[tuple[TextSegment | CodeSegment, int, int]]:
+    """
+    Splits a Markdown document into segments, with their offsets.
+
+    See iter_fenced_segments(). The offsets of a code block span its opening
+    and closing fences.
+
+    Arguments:
+        document (str): The Markdown document.
+
+    Yields:
+        tuple[TextSegment | CodeSegment, int, int]: Each segment, with its
+            start and end offsets in the document.
+    """
+    position = 0
+    length = len(document)
+
+    while position < length:
+        text_start = position
+        opening = _opening_fence_pattern.search(document, position)
+
+        if opening is None:
+            break
+
+        fence = opening.group('backticks') or opening.group('tildes')
+        info = opening.group('backtick_info') or opening.group('tilde_info')
+        words = (info or '').split(maxsplit=1)
+        language = words[0] if words else ''
+        body_start = min(opening.end() + 1, length)
+        closing = _closing_fence_pattern(fence).search(document, body_start)
+
+        if closing is None:
+            body_end = length
+            position = length
+
+            if document.endswith('\n', body_start):
+                body_end -= 1
+        else:
+            body_end = max(closing.start() - 1, body_start)
+            position = closing.end()
+
+        if opening.start() > text_start:
+            yield (
+                TextSegment(document[text_start:opening.start()]),
+                text_start,
+                opening.start(),
+            )
+
+        code = document[body_start:body_end]
+
+        # Code lines keep no carriage returns, as when splitting by line.
+        if '\r' in code:
+            code = code.replace('\r\n', '\n').removesuffix('\r')
+
+        segment = CodeSegment(
+            _dedent(code, len(opening.group('indent'))),
+            language
+        )
+
+        yield segment, opening.start(), position
+
+    if position < length:
+        yield TextSegment(document[position:]), position, length
+
+
+def iter_fenced_segments(
+    document: str
+) -> Iterator[TextSegment | CodeSegment]:
+    """
+    Splits a Markdown document into text and fenced code block segments.
+
+    Code fences are recognized at the start of a line, optionally indented,
+    and consist of at least three backticks or tildes. A block is closed by
+    a line containing a fence of the same character that is at least as long
+    as the opening fence; an unclosed block extends to the end of the
+    document. The indentation of the opening fence is removed from each line
+    of the block.
+
+    The document is scanned by offset, rather than split into lines, and
+    each segment copies its span of the document. Windows line endings
+    (CRLF) in code blocks are converted to line feeds.
+
+    Arguments:
+        document (str): The Markdown document.
+
+    Yields:
+        TextSegment | CodeSegment: The segments of the document, in order.
+            Text following a code block starts with the line break after
+            the closing fence.
+    """
+    for segment, _, _ in iter_fenced_segment_spans(document):
+        yield segment
 
 
 def process_fenced_code_blocks(raw_markdown: str) -> str:
     """
-    Naïvely processes a Markdown document to apply fenced code blocks.
+    Processes a Markdown document to apply fenced code blocks.
 
-    Fenced code blocks are wrapped by three backticks and may have an
-    optional language identifier:
+    Fenced code blocks are wrapped by three or more backticks (or tildes) and
+    may have an optional language identifier:
 
     ```python
     def example_function():
@@ -57,7 +485,10 @@ def process_fenced_code_blocks(raw_markdown: str) -> str:
     ```
 
     If the code block has a language identifier, the wrapped code will
-    be processed using Pygments.
+    be processed using Pygments. The code blocks are collected in a single
+    scan of the document and then highlighted, concurrently for large
+    documents (see configure_parallel_highlighting). See
+    iter_fenced_segments() for how fences are recognized.
 
     Arguments:
         raw_markdown (str): The raw markdown file to process.
@@ -66,32 +497,25 @@ def process_fenced_code_blocks(raw_markdown: str) -> str:
         str: The processed markdown.
     """
     output = []
-    buffer = []
-    indent = 0
-    language = ''
-    in_fence = False
-
-    for line in str.splitlines(raw_markdown):
-        if '```' not in line:
-            if not in_fence:
-                output.append(line)
-            else:
-                buffer.append(line[indent:])
+    blocks = []
+    block_indices = []
+    segment = None
+
+    for segment in iter_fenced_segments(raw_markdown):
+        if isinstance(segment, TextSegment):
+            output.append(segment.text)
 
             continue
 
-        if in_fence:
-            print('Ending code block...')
+        block_indices.append(len(output))
+        output.append('')
+        blocks.append(segment)
 
-            output.append(_generate_code_block(buffer, language=language))
-            buffer = []
-            in_fence = False
-        else:
-            in_fence = True
-            match = search(_fence_pattern, line)
-            indent = match.start()
-            language = line[match.end():]
+    for index, html in zip(block_indices, _generate_code_blocks(blocks)):
+        output[index] = html
 
-            print(f'Starting code block (language={language})...')
+    # Drop the trailing line break of the document, if any.
+    if isinstance(segment, TextSegment) and output[-1].endswith('\n'):
+        output[-1] = output[-1][:-1]
 
-    return '\n'.join(output)
+    return ''.join(output)
@@ -0,0 +1,234 @@
+from threading import Lock
+from typing import Any, Callable, NamedTuple
+
+from hydra.utils.timing_utils import observe_stages
+
+
+# The types of the objects created while rendering a page, which should not
+# outlive the render unless a cache holds them.
+RENDER_TYPES = (
+    'bs4.BeautifulSoup',
+    'bs4.element.Tag',
+    'bs4.element.NavigableString',
+    'markdown.core.Markdown',
+    'xml.etree.ElementTree.Element',
+)
+
+# tracemalloc is process-wide, so reports are taken one at a time.
+_lock = Lock()
+
+
+class Allocation(NamedTuple):
+    """
+    The memory allocated at a source line and still alive.
+
+    Arguments:
+        location (str): The file name and line number.
+        size (int): The total size of the allocations, in bytes.
+        count (int): The number of allocations.
+    """
+    location: str
+    size: int
+    count: int
+
+
+class StageMemory(NamedTuple):
+    """
+    The memory allocated by a rendering stage.
+
+    Arguments:
+        calls (int): The number of times the stage ran.
+        peak (int): The largest increase in allocated memory during a run
+            of the stage, in bytes.
+        retained (int): The total memory allocated by the runs of the stage
+            and still allocated when they ended, in bytes.
+    """
+    calls: int
+    peak: int
+    retained: int
+
+
+class MemoryReport(NamedTuple):
+    """
+    The memory allocated by a call, by stage.
+
+    Arguments:
+        peak (int): The largest increase in allocated memory during the
+            call, in bytes.
+        retained (int): The memory allocated by the call and still allocated
+            after it returned and its result was released, in bytes.
+        stages (dict[str, StageMemory]): The memory of each timed stage.
+        leaks (list[Allocation]): The source lines with the most memory
+            retained after the call, largest first.
+        objects (dict[str, int]): The number of instances of RENDER_TYPES
+            created by the call and still alive after it, by type.
+    """
+    peak: int
+    retained: int
+    stages: dict[str, StageMemory]
+    leaks: list[Allocation]
+    objects: dict[str, int]
+
+    def to_dict(self) -> dict:
+        """
+        Returns the report as JSON-compatible values.
+
+        Returns:
+            dict: The report, with sizes in bytes.
+        """
+        return {
+            'peak': self.peak,
+            'retained': self.retained,
+            'stages': {
+                stage: memory._asdict()
+                for stage, memory in self.stages.items()
+            },
+            'leaks': [allocation._asdict() for allocation in self.leaks],
+            'objects': self.objects,
+        }
+
+
+class _StageTracker:
+    # Tracks the peak memory of nested stages. tracemalloc has a single
+    # peak, so a stage's running peak is saved before the peak is reset for
+    # each nested stage, and propagated to the enclosing stage on exit.
+
+    def __init__(self):
+        self.frames = []
+        self.stages = {}
+
+    def enter(self, stage: str) -> None:
+        from tracemalloc import get_traced_memory, reset_peak
+
+        current, peak = get_traced_memory()
+
+        if self.frames:
+            self.frames[-1][2] = max(self.frames[-1][2], peak)
+
+        reset_peak()
+        self.frames.append([stage, current, current])
+
+    def exit(self, stage: str) -> None:
+        from tracemalloc import get_traced_memory
+
+        current, peak = get_traced_memory()
+        _, start, frame_peak = self.frames.pop()
+        frame_peak = max(frame_peak, peak)
+
+        if self.frames:
+            self.frames[-1][2] = max(self.frames[-1][2], frame_peak)
+
+        calls, stage_peak, retained = self.stages.get(stage, (0, 0, 0))
+        self.stages[stage] = StageMemory(
+            calls + 1,
+            max(stage_peak, frame_peak - start),
+            retained + current - start,
+        )
+
+
+def _count_objects(type_names: tuple[str, ...]) -> dict[str, int]:
+    from gc import get_objects
+
+    counts = dict.fromkeys(type_names, 0)
+
+    for instance in get_objects():
+        cls = type(instance)
+        name = f'{cls.__module__}.{cls.__qualname__}'
+
+        if name in counts:
+            counts[name] += 1
+
+    return counts
+
+
+def profile_memory(
+    function: Callable[..., Any],
+    *args: Any,
+    limit: int = 10,
+    **kwargs: Any
+) -> MemoryReport:
+    """
+    Reports the memory allocated by a call, by rendering stage.
+
+    Allocations are traced with tracemalloc while the function runs. The
+    stages are the blocks timed with timing_utils.timed(), e.g. fences,
+    markdown, parse, postprocess and serialize. After the function returns,
+    its result is released and garbage is collected, so the retained memory
+    and surviving objects are those kept by caches or leaked. Run the
+    function once beforehand to exclude caches filled on first use.
+
+    Tracing slows the function down several times, and allocations made by
+    other threads while it runs are included.
+
+    Arguments:
+        function (Callable): The function to call.
+        args: The positional arguments of the function.
+        limit (int): The number of source lines to report in leaks.
+        kwargs: The keyword arguments of the function.
+
+    Returns:
+        MemoryReport: The report.
+    """
+    import tracemalloc
+    from gc import collect
+
+    with _lock:
+        started = not tracemalloc.is_tracing()
+
+        if started:
+            tracemalloc.start()
+
+        try:
+            tracker = _StageTracker()
+
+            collect()
+            objects_before = _count_objects(RENDER_TYPES)
+            snapshot_before = tracemalloc.take_snapshot()
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            with observe_stages(tracker):
+                result = function(*args, **kwargs)
+
+            _, peak = tracemalloc.get_traced_memory()
+            del result
+            collect()
+
+            current, _ = tracemalloc.get_traced_memory()
+            snapshot_after = tracemalloc.take_snapshot()
+            objects_after = _count_objects(RENDER_TYPES)
+        finally:
+            if started:
+                tracemalloc.stop()
+
+    filters = [
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen *>'),
+    ]
+    differences = snapshot_after.filter_traces(filters).compare_to(
+        snapshot_before.filter_traces(filters),
+        'lineno'
+    )
+    leaks = [
+        Allocation(
+            f'{difference.traceback[0].filename}:'
+            f'{difference.traceback[0].lineno}',
+            difference.size_diff,
+            difference.count_diff,
+        )
+        for difference in differences
+        if difference.size_diff > 0
+    ]
+
+    return MemoryReport(
+        peak=peak - baseline,
+        retained=current - baseline,
+        stages=tracker.stages,
+        leaks=leaks[:limit],
+        objects={
+            name: objects_after[name] - objects_before[name]
+            for name in RENDER_TYPES
+            if objects_after[name] > objects_before[name]
+        },
+    )
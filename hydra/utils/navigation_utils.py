@@ -0,0 +1,112 @@
+from typing import Any, Iterable, NamedTuple
+
+
+class Heading(NamedTuple):
+    """
+    A heading in the navigation tree of a page.
+
+    Headings are immutable and hashable, so identical navigation trees can
+    be compared and cached cheaply. For code written against the previous
+    dict-based headings, fields can also be read by name, e.g.
+    heading['label'] or heading.get('label'), "label" in heading is true,
+    and to_dict() returns the previous dict form. Iterating over a heading
+    yields its values, and headings serialize to JSON as arrays.
+
+    Arguments:
+        label (str): The text of the heading.
+        url (str): The fragment URL of the heading, e.g. "#examples".
+        children (tuple[Heading, ...]): The nested headings.
+    """
+    label: str
+    url: str
+    children: tuple['Heading', ...] = ()
+
+    def __contains__(self, key: Any) -> bool:
+        if isinstance(key, str):
+            return key in self._fields
+
+        return tuple.__contains__(self, key)
+
+    def __getitem__(self, key: Any) -> Any:
+        if not isinstance(key, str):
+            return tuple.__getitem__(self, key)
+
+        if key not in self._fields:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Returns a field by name, like dict.get().
+
+        Arguments:
+            key (str): The name of the field.
+            default: The value returned for unknown names.
+
+        Returns:
+            Any: The value of the field, or the default.
+        """
+        if key not in self._fields:
+            return default
+
+        return getattr(self, key)
+
+    def keys(self) -> tuple[str, ...]:
+        """
+        Returns the names of the fields, so dict(heading) maps them.
+
+        Returns:
+            tuple[str, ...]: The field names.
+        """
+        return self._fields
+
+    def to_dict(self) -> dict:
+        """
+        Converts the heading and its children to the previous dict form.
+
+        Returns:
+            dict: The label, URL and a list of children, as dicts.
+        """
+        return {
+            'label': self.label,
+            'url': self.url,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+def _freeze(items: list) -> tuple[Heading, ...]:
+    return tuple(
+        Heading(label, url, _freeze(children))
+        for label, url, children in items
+    )
+
+
+def build_headings(
+    entries: Iterable[tuple[int, str, str]]
+) -> tuple[Heading, ...]:
+    """
+    Builds a navigation tree from a flat sequence of headings.
+
+    Each heading is nested under the closest preceding heading of a lower
+    level. Headings whose parent level is missing (e.g. an h4 directly
+    following an h2) attach to the deepest available parent.
+
+    Arguments:
+        entries (Iterable[tuple[int, str, str]]): The level (1 for h2, 2 for
+            h3, etc.), label and URL of each heading, in document order.
+
+    Returns:
+        tuple[Heading, ...]: The top-level headings.
+    """
+    headings = []
+    parents = [headings]
+
+    for level, label, url in entries:
+        children = []
+
+        del parents[level:]
+        parents[-1].append((label, url, children))
+        parents.append(children)
+
+    return _freeze(headings)
@@ -0,0 +1,64 @@
+from pickle import PicklingError, dumps
+
+import flask
+
+
+_worker_app = None
+
+
+def get_worker_app() -> flask.Flask:
+    """
+    Returns the application created for the current worker process.
+
+    Returns:
+        Flask: The worker application.
+    """
+    if _worker_app is None:
+        raise RuntimeError('worker application has not been initialized')
+
+    return _worker_app
+
+
+def get_worker_config(app: flask.Flask) -> dict:
+    """
+    Returns the configuration used to create worker applications.
+
+    Configuration values that cannot be sent to another process are omitted.
+
+    Arguments:
+        app (Flask): The parent application.
+
+    Returns:
+        dict: The picklable configuration values.
+    """
+    config = {}
+
+    for key, value in app.config.items():
+        try:
+            dumps(value)
+        except (AttributeError, PicklingError, TypeError):
+            continue
+
+        config[key] = value
+
+    return config
+
+
+def init_worker_app(config: dict) -> None:
+    """
+    Creates the application for a worker process.
+
+    Intended to be used as the initializer of a process pool, so that each
+    worker creates its application once rather than once per task. Worker
+    applications never warm their caches in the background.
+
+    Arguments:
+        config (dict): The configuration for the worker application.
+    """
+    global _worker_app
+
+    from hydra import create_app
+
+    _worker_app = create_app(
+        injected_config={**config, 'HYDRA_WARM_CACHE': False}
+    )
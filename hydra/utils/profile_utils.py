@@ -0,0 +1,217 @@
+from hmac import compare_digest
+from os import makedirs, remove, scandir
+from os.path import basename, join
+from random import random
+from re import compile
+from threading import Lock
+from time import time_ns
+from typing import TYPE_CHECKING
+
+import flask
+
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+    from pstats import Stats
+
+
+# The request header carrying the token that requests a profile.
+PROFILE_HEADER = 'X-Hydra-Profile'
+
+_unsafe_pattern = compile(r'[^\w.-]+')
+
+# Call paths contributing less than this many microseconds are omitted from
+# the collapsed stacks, and the stacks are truncated at this depth.
+_MIN_MICROSECONDS = 1
+_MAX_DEPTH = 128
+
+
+class _Profiler:
+    __slots__ = ('directory', 'max_files', 'token', 'sample_rate', 'lock')
+
+    def __init__(
+        self,
+        directory: str,
+        max_files: int | None,
+        token: str | None,
+        sample_rate: float,
+    ):
+        self.directory = directory
+        self.max_files = max_files
+        self.token = token
+        self.sample_rate = sample_rate
+        self.lock = Lock()
+
+    def should_profile(self, request: flask.Request) -> bool:
+        if self.token:
+            value = request.headers.get(PROFILE_HEADER)
+
+            if value and compare_digest(value.encode(), self.token.encode()):
+                return True
+
+        return self.sample_rate > 0 and random() < self.sample_rate
+
+    def save(self, profile: 'Profile', endpoint: str | None) -> str:
+        from pstats import Stats
+
+        name = f'{time_ns()}-{_unsafe_pattern.sub("-", endpoint or "none")}'
+        stats = Stats(profile)
+
+        with self.lock:
+            makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(join(self.directory, f'{name}.prof'))
+
+            with open(
+                join(self.directory, f'{name}.collapsed'),
+                'w',
+                encoding='utf-8'
+            ) as file:
+                for line in collapse_stacks(stats):
+                    file.write(f'{line}\n')
+
+            self._prune()
+
+        return name
+
+    def _prune(self) -> None:
+        if self.max_files is None:
+            return
+
+        names = sorted(
+            entry.name.removesuffix('.prof')
+            for entry in scandir(self.directory)
+            if entry.name.endswith('.prof')
+        )
+
+        for name in names[:max(len(names) - self.max_files, 0)]:
+            for extension in ('.prof', '.collapsed'):
+                try:
+                    remove(join(self.directory, f'{name}{extension}'))
+                except OSError:
+                    pass
+
+
+def _frame_label(function: tuple[str, int, str]) -> str:
+    filename, line, name = function
+
+    if filename == '~':
+        label = name
+    else:
+        label = f'{name} ({basename(filename)}:{line})'
+
+    return label.replace(';', ',')
+
+
+def collapse_stacks(stats: 'Stats') -> list[str]:
+    """
+    Converts profile statistics to collapsed stacks for flame graphs.
+
+    cProfile records the time spent in each function by caller, rather than
+    full call stacks, so the time of a function reached from several paths is
+    split between them in proportion to the time spent in each call edge.
+
+    Arguments:
+        stats (Stats): The profile statistics.
+
+    Returns:
+        list[str]: Lines of semicolon-separated frames, from the outermost
+            call, followed by the self time in microseconds.
+    """
+    entries = stats.stats
+    callees = {}
+
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((function, edge[3]))
+
+    totals = {}
+    roots = [
+        function
+        for function, (_, _, _, _, callers) in entries.items()
+        if not any(caller in entries for caller in callers)
+    ]
+
+    def visit(function, stack, share):
+        _, _, self_time, cumulative_time, _ = entries[function]
+        stack = (*stack, _frame_label(function))
+        microseconds = round(self_time * share * 1e6)
+
+        if microseconds >= _MIN_MICROSECONDS:
+            key = ';'.join(stack)
+            totals[key] = totals.get(key, 0) + microseconds
+
+        if len(stack) >= _MAX_DEPTH:
+            return
+
+        for callee, edge_time in callees.get(function, ()):
+            callee_time = entries[callee][3]
+
+            if callee_time <= 0 or _frame_label(callee) in stack:
+                continue
+
+            callee_share = edge_time * share / callee_time
+
+            if edge_time * share * 1e6 >= _MIN_MICROSECONDS:
+                visit(callee, stack, callee_share)
+
+    for root in roots:
+        visit(root, (), 1.0)
+
+    return [f'{stack} {count}' for stack, count in totals.items()]
+
+
+def init_profiling(app: flask.Flask) -> None:
+    """
+    Profiles selected requests to the application with cProfile.
+
+    Requests whose X-Hydra-Profile header matches HYDRA_PROFILE_TOKEN, and a
+    random HYDRA_PROFILE_SAMPLE_RATE fraction of all requests, are profiled.
+    Each profile is written to HYDRA_PROFILE_DIR as a .prof file, readable
+    with pstats or snakeviz, and as collapsed stacks for flame graph tools.
+    Only the newest HYDRA_PROFILE_MAX_FILES profiles are kept. The name of a
+    profile is returned in the X-Hydra-Profile response header.
+
+    Work offloaded to other threads or processes is not profiled.
+
+    Arguments:
+        app (Flask): The application.
+    """
+    profiler = _Profiler(
+        app.config['HYDRA_PROFILE_DIR'] or join(app.instance_path, 'profiles'),
+        app.config['HYDRA_PROFILE_MAX_FILES'],
+        app.config['HYDRA_PROFILE_TOKEN'],
+        app.config['HYDRA_PROFILE_SAMPLE_RATE'],
+    )
+    app.extensions['hydra.profiler'] = profiler
+
+    @app.before_request
+    def start_profile():
+        from cProfile import Profile
+
+        if profiler.should_profile(flask.request):
+            profile = flask.g.hydra_profile = Profile()
+            profile.enable()
+
+    @app.after_request
+    def finish_profile(response: flask.Response) -> flask.Response:
+        profile = flask.g.pop('hydra_profile', None)
+
+        if profile is None:
+            return response
+
+        profile.disable()
+        response.headers[PROFILE_HEADER] = profiler.save(
+            profile,
+            flask.request.endpoint
+        )
+
+        return response
+
+    @app.teardown_request
+    def stop_profile(exception: BaseException | None) -> None:
+        # Saves the profile of requests that failed before after_request.
+        profile = flask.g.pop('hydra_profile', None)
+
+        if profile is not None:
+            profile.disable()
+            profiler.save(profile, flask.request.endpoint)
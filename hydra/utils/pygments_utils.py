@@ -0,0 +1,113 @@
+from threading import Lock, local
+from typing import TYPE_CHECKING, Any, Iterable
+
+# Pygments is imported on first use, so importing Hydra stays cheap.
+if TYPE_CHECKING:
+    from pygments.formatters import HtmlFormatter
+    from pygments.lexer import Lexer
+
+
+_lexer_classes: dict[str, 'type[Lexer] | None'] = {}
+_formatters: dict[tuple, 'HtmlFormatter'] = {}
+_lock = Lock()
+
+# Lexers may keep state while tokenizing (e.g. HttpLexer's content type), so
+# each thread keeps its own instances.
+_lexers = local()
+
+
+def _find_lexer_class(language: str) -> 'type[Lexer] | None':
+    from pygments.lexers import find_lexer_class_by_name
+    from pygments.util import ClassNotFound
+
+    try:
+        return find_lexer_class_by_name(language)
+    except ClassNotFound:
+        return None
+
+
+def _get_lexer_class(language: str) -> 'type[Lexer] | None':
+    try:
+        return _lexer_classes[language]
+    except KeyError:
+        pass
+
+    with _lock:
+        if language not in _lexer_classes:
+            _lexer_classes[language] = _find_lexer_class(language)
+
+        return _lexer_classes[language]
+
+
+def get_formatter(**options: Any) -> 'HtmlFormatter':
+    """
+    Returns the shared HTML formatter for the given options.
+
+    Each distinct set of options builds its formatter (and style) once per
+    process. The returned formatter must not be modified.
+
+    Arguments:
+        options: The options to pass to the formatter.
+
+    Returns:
+        HtmlFormatter: The configured formatter.
+    """
+    key = tuple(sorted(options.items()))
+    formatter = _formatters.get(key)
+
+    if formatter is not None:
+        return formatter
+
+    with _lock:
+        formatter = _formatters.get(key)
+
+        if formatter is None:
+            from pygments.formatters import HtmlFormatter
+
+            formatter = HtmlFormatter(**options)
+            _formatters[key] = formatter
+
+    return formatter
+
+
+def get_lexer(language: str) -> 'Lexer | None':
+    """
+    Returns the current thread's lexer for the given language alias.
+
+    Each alias is resolved to a lexer class once per process, and each
+    thread builds its own lexer from the class once. A lexer must not be
+    shared with other threads. Unknown aliases are cached as missing and
+    return None.
+
+    Arguments:
+        language (str): The language alias, e.g. "python" or "js".
+
+    Returns:
+        Lexer | None: The matching lexer, if any.
+    """
+    lexers = getattr(_lexers, 'lexers', None)
+
+    if lexers is None:
+        lexers = _lexers.lexers = {}
+
+    try:
+        return lexers[language]
+    except KeyError:
+        pass
+
+    lexer_class = _get_lexer_class(language)
+    lexer = None if lexer_class is None else lexer_class(stripall=True)
+    lexers[language] = lexer
+
+    return lexer
+
+
+def preload_lexers(languages: Iterable[str]) -> None:
+    """
+    Resolves the lexers for the given language aliases ahead of time.
+
+    Arguments:
+        languages (Iterable[str]): The language aliases to resolve.
+    """
+    for language in languages:
+        get_lexer(language)
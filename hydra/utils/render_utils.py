@@ -1,26 +1,484 @@
-from typing import Any
-from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from hashlib import sha256
+from itertools import islice
+from sys import getsizeof
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+from zlib import DEFLATED, compressobj
 import flask
-from markdown import markdown
 from markupsafe import Markup
 
-from hydra.utils.html_utils import add_header_ids, parse_headings
-from hydra.utils.markdown_utils import process_fenced_code_blocks
+from hydra.utils.cache_utils import (
+    LRUCache,
+    SQLiteCache,
+    create_cache,
+    stable_hash,
+)
+from hydra.utils.fragment_utils import FragmentStore
+from hydra.utils.html_utils import process_headings
+from hydra.utils.markdown_utils import (
+    convert_document,
+    process_fenced_code_blocks,
+)
+from hydra.utils.process_utils import (
+    get_worker_app,
+    get_worker_config,
+    init_worker_app,
+)
+from hydra.utils.section_utils import render_sections
+from hydra.utils.template_utils import template_digest
+from hydra.utils.timing_utils import timed
+from hydra.utils.version_utils import render_version
+
+# BeautifulSoup is imported on first use, so importing Hydra stays cheap.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+_PAGE_TEMPLATES = ('page/navigation.html', 'page.html')
+
+# Configuration values that change a cached page: its rendered output, or
+# its compressed copy.
+_RENDER_CONFIG_KEYS = (
+    'HYDRA_MARKDOWN_ENGINE',
+    'HYDRA_MARKDOWN_EXTENSIONS',
+    'HYDRA_MARKDOWN_EXTENSION_CONFIGS',
+    'HYDRA_PAGE_GZIP_LEVEL',
+)
+
+# Selects the gzip container for zlib (see zlib.compressobj).
+_GZIP_WBITS = 31
+
+# The number of pages submitted to each worker process ahead of the results
+# being consumed, which bounds the finished pages held in memory.
+_PENDING_PER_PROCESS = 2
+
+
+class RenderedPage:
+    """
+    A rendered page, with an optional gzip-compressed copy of its HTML.
+
+    Arguments:
+        html (str): The rendered page.
+        gzip (bytes | None): The UTF-8 encoded page, gzip-compressed.
+    """
+
+    __slots__ = ('html', 'gzip')
+
+    def __init__(self, html: str, gzip: bytes | None = None):
+        self.html = html
+        self.gzip = gzip
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + getsizeof(self.html)
+            + (0 if self.gzip is None else getsizeof(self.gzip))
+        )
+
+
+def _get_fragment_store(app: flask.Flask) -> FragmentStore | None:
+    store = app.extensions.get('hydra.fragment_store')
+
+    if store is not None:
+        return store
+
+    directory = app.config['HYDRA_FRAGMENT_CACHE_DIR']
+
+    if directory is None:
+        return None
+
+    store = FragmentStore(
+        directory,
+        max_bytes=app.config['HYDRA_FRAGMENT_CACHE_MAX_BYTES'],
+    )
+
+    return app.extensions.setdefault('hydra.fragment_store', store)
+
+
+def _get_navigation_cache(app: flask.Flask) -> LRUCache | None:
+    cache = app.extensions.get('hydra.navigation_cache')
+
+    if cache is not None:
+        return cache
+
+    max_entries = app.config['HYDRA_NAVIGATION_CACHE_MAX_ENTRIES']
+
+    if not max_entries:
+        return None
+
+    cache = LRUCache(max_entries=max_entries)
+
+    return app.extensions.setdefault('hydra.navigation_cache', cache)
+
+
+def _group_pairs(
+    pairs: Iterable[tuple[str, dict | None]]
+) -> list[tuple[str, dict, list[int]]]:
+    groups = {}
+
+    for index, (template_name, context) in enumerate(pairs):
+        context = context or {}
+
+        # Contexts that cannot be hashed are never deduplicated.
+        key = (template_name, stable_hash(context) or index)
+
+        groups.setdefault(key, (template_name, context, []))[2].append(index)
+
+    return list(groups.values())
+
+
+def _parse_document(raw_text: str) -> tuple['BeautifulSoup', tuple]:
+    # Converts a whole document, without splitting it into sections.
+    from bs4 import BeautifulSoup
+
+    processed = _pre_process_markdown(raw_text)
+
+    with timed('markdown'):
+        rendered, _ = convert_document(processed)
+
+    with timed('parse'):
+        fragment = BeautifulSoup(rendered, features="html.parser")
+
+    return _post_process_markdown(fragment)
 
 
 def _pre_process_markdown(document: str) -> str:
-    document = process_fenced_code_blocks(document)
+    with timed('fences'):
+        document = process_fenced_code_blocks(document)
 
     return document
 
 
-def _post_process_markdown(fragment: BeautifulSoup) -> BeautifulSoup:
-    fragment = add_header_ids(fragment)
+def _post_process_markdown(
+    fragment: 'BeautifulSoup'
+) -> tuple['BeautifulSoup', tuple]:
+    with timed('postprocess'):
+        return process_headings(fragment)
 
-    return fragment
 
+def _parse_fragment(
+    template_name: str,
+    **context: Any
+) -> tuple['BeautifulSoup', tuple]:
+    key = fragment_key(template_name, 'soup', context)
+    stored = load_fragment(key)
+
+    if stored is not None:
+        from bs4 import BeautifulSoup
+
+        html, headings = stored
+
+        with timed('parse'):
+            return BeautifulSoup(html, features="html.parser"), headings
+
+    fragment, headings = convert_fragment(
+        render_jinja(template_name, **context)
+    )
+
+    save_fragment(key, str(fragment), headings)
+
+    return fragment, headings
+
+
+def _render_content(template_name: str, **context: Any) -> tuple[str, tuple]:
+    engine = flask.current_app.config['HYDRA_MARKDOWN_ENGINE']
+    key = fragment_key(template_name, engine, context)
+    stored = load_fragment(key)
+
+    if stored is not None:
+        return stored
+
+    content = convert_markdown(render_jinja(template_name, **context), engine)
+
+    save_fragment(key, *content)
+
+    return content
+
+
+def _render_groups(
+    groups: list[tuple[str, dict, list[int]]],
+    return_exceptions: bool,
+) -> Iterator[tuple[int, 'str | Exception']]:
+    for template_name, context, indices in groups:
+        try:
+            result = render_page(template_name, **context)
+        except Exception as exception:
+            if not return_exceptions:
+                raise
+
+            result = exception
+
+        for index in indices:
+            yield index, result
+
+
+def _render_groups_in_pool(
+    groups: list[tuple[str, dict, list[int]]],
+    processes: int,
+    config: dict,
+    return_exceptions: bool,
+) -> Iterator[tuple[int, 'str | Exception']]:
+    if not groups:
+        return
+
+    processes = min(processes, len(groups))
+    remaining = iter(groups)
+    pending = {}
 
-def parse_markdown(template_name: str, **context: Any) -> BeautifulSoup:
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=init_worker_app,
+        initargs=(config,),
+    ) as executor:
+        while True:
+            capacity = processes * _PENDING_PER_PROCESS - len(pending)
+
+            for template_name, context, indices in islice(remaining, capacity):
+                future = executor.submit(
+                    _render_in_worker,
+                    template_name,
+                    context
+                )
+                pending[future] = indices
+
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                indices = pending.pop(future)
+
+                try:
+                    result = future.result()
+                except Exception as exception:
+                    if not return_exceptions:
+                        raise
+
+                    result = exception
+
+                for index in indices:
+                    yield index, result
+
+
+def _render_in_worker(template_name: str, context: dict) -> str:
+    with get_worker_app().app_context():
+        return render_page(template_name, **context)
+
+
+def _render_navigation(headings: tuple) -> str:
+    app = flask.current_app
+    cache = _get_navigation_cache(app)
+
+    if cache is None:
+        return flask.render_template(
+            'page/navigation.html',
+            navigation=headings
+        )
+
+    # Heading trees are hashable, so identical outlines share an entry for
+    # as long as the navigation template is unchanged.
+    key = (template_digest(app.jinja_env, 'page/navigation.html'), headings)
+    navigation = cache.get(key)
+
+    if navigation is None:
+        navigation = flask.render_template(
+            'page/navigation.html',
+            navigation=headings
+        )
+
+        cache.set(key, navigation)
+
+    return navigation
+
+
+def _render_page(template_name: str, **context: Any) -> str:
+    return render_layout(*_render_content(template_name, **context))
+
+
+def compress_page(html: str, level: int | None) -> bytes | None:
+    """
+    Compresses a rendered page with gzip.
+
+    Arguments:
+        html (str): The rendered page.
+        level (int | None): The compression level, from 0 to 9, or None to
+            skip compression.
+
+    Returns:
+        bytes | None: The UTF-8 encoded page, gzip-compressed, or None.
+    """
+    if level is None:
+        return None
+
+    with timed('gzip'):
+        compressor = compressobj(level, DEFLATED, _GZIP_WBITS)
+
+        return compressor.compress(html.encode()) + compressor.flush()
+
+
+def convert_fragment(raw_text: str) -> tuple['BeautifulSoup', tuple]:
+    """
+    Converts a Jinja-rendered Markdown document to intermediate HTML.
+
+    The document's code blocks are highlighted, it is converted to HTML and
+    parsed, and its headings are given ids and collected. Large documents
+    are rendered section by section (see section_utils.render_sections).
+
+    Arguments:
+        raw_text (str): The Markdown document, after Jinja rendering.
+
+    Returns:
+        tuple[BeautifulSoup, tuple]: The intermediate HTML representation
+            and the heading tree.
+    """
+    from bs4 import BeautifulSoup
+
+    sectioned = render_sections(raw_text)
+
+    if sectioned is not None:
+        html, headings = sectioned
+
+        with timed('parse'):
+            return BeautifulSoup(html, features="html.parser"), headings
+
+    return _parse_document(raw_text)
+
+
+def convert_markdown(raw_text: str, engine: str) -> tuple[str, tuple]:
+    """
+    Converts a Jinja-rendered Markdown document to HTML.
+
+    Arguments:
+        raw_text (str): The Markdown document, after Jinja rendering.
+        engine (str): The engine to convert with, see
+            HYDRA_MARKDOWN_ENGINE.
+
+    Returns:
+        tuple[str, tuple]: The HTML and the heading tree.
+    """
+    if engine not in ('soup', 'tree'):
+        raise ValueError(f'invalid HYDRA_MARKDOWN_ENGINE {engine!r}')
+
+    if engine == 'tree':
+        processed = _pre_process_markdown(raw_text)
+
+        with timed('markdown'):
+            html, headings = convert_document(processed, headings=True)
+
+        # Documents with raw HTML headings are converted by the soup engine,
+        # which gives those headings ids and navigation entries.
+        if headings is not None:
+            return html, headings
+
+    sectioned = render_sections(raw_text)
+
+    if sectioned is not None:
+        return sectioned
+
+    fragment, headings = _parse_document(raw_text)
+
+    with timed('serialize'):
+        return str(fragment), headings
+
+
+def fragment_key(
+    template_name: str,
+    engine: str,
+    context: dict
+) -> str | None:
+    """
+    Generates the key of a converted Markdown fragment in the fragment store.
+
+    The key is derived from the template name and sources, a hash of the
+    context, and the conversion options. See HYDRA_FRAGMENT_CACHE_DIR.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        engine (str): The engine the fragment is converted with.
+        context (dict): The variables to make available in the template.
+
+    Returns:
+        str | None: The key, or None if the application has no fragment
+            store or the context cannot be hashed.
+    """
+    app = flask.current_app
+
+    if _get_fragment_store(app) is None:
+        return None
+
+    context_hash = stable_hash(context)
+    options_hash = stable_hash([
+        engine,
+        app.config['HYDRA_MARKDOWN_EXTENSIONS'],
+        app.config['HYDRA_MARKDOWN_EXTENSION_CONFIGS'],
+    ])
+
+    if context_hash is None or options_hash is None:
+        return None
+
+    hasher = sha256(template_name.encode())
+
+    hasher.update(template_digest(app.jinja_env, template_name).encode())
+    hasher.update(context_hash.encode())
+    hasher.update(options_hash.encode())
+
+    return hasher.hexdigest()
+
+
+def get_page_cache(app: flask.Flask) -> LRUCache | SQLiteCache | None:
+    """
+    Returns an application's page cache, creating it on first use.
+
+    Arguments:
+        app (Flask): The application.
+
+    Returns:
+        LRUCache | SQLiteCache | None: The cache, or None if page caching is
+            disabled.
+    """
+    cache = app.extensions.get('hydra.page_cache')
+
+    if cache is not None:
+        return cache
+
+    max_entries = app.config['HYDRA_PAGE_CACHE_MAX_ENTRIES']
+
+    if not max_entries:
+        return None
+
+    cache = create_cache(
+        app.config['HYDRA_CACHE_BACKEND'],
+        namespace='pages',
+        path=app.config['HYDRA_CACHE_PATH'],
+        max_entries=max_entries,
+        max_bytes=app.config['HYDRA_PAGE_CACHE_MAX_BYTES'],
+    )
+
+    return app.extensions.setdefault('hydra.page_cache', cache)
+
+
+def load_fragment(key: str | None) -> tuple[str, tuple] | None:
+    """
+    Reads a converted Markdown fragment from the fragment store.
+
+    Reading the store is blocking file I/O.
+
+    Arguments:
+        key (str | None): The key of the fragment, see fragment_key().
+
+    Returns:
+        tuple[str, tuple] | None: The HTML and the heading tree, or None if
+            the fragment is not stored.
+    """
+    if key is None:
+        return None
+
+    with timed('fragment'):
+        return _get_fragment_store(flask.current_app).get(key)
+
+
+def parse_markdown(template_name: str, **context: Any) -> 'BeautifulSoup':
     """
     Renders a Markdown file to intermediate HTML.
 
@@ -31,11 +489,7 @@ def parse_markdown(template_name: str, **context: Any) -> BeautifulSoup:
     Returns:
         BeautifulSoup: The intermediate HTML representation.
     """
-    raw_text = flask.render_template(template_name, **context)
-    processed = _pre_process_markdown(raw_text)
-    rendered = markdown(processed)
-    fragment = BeautifulSoup(rendered, features="html.parser")
-    fragment = _post_process_markdown(fragment)
+    fragment, _ = _parse_fragment(template_name, **context)
 
     return fragment
 
@@ -44,6 +498,13 @@ def render_markdown(template_name: str, **context: Any) -> Markup:
     """
     Renders a Markdown file to HTML with Jinja2 template support.
 
+    The HTML is generated by the engine set in HYDRA_MARKDOWN_ENGINE. The
+    "soup" engine post-processes the HTML using BeautifulSoup (see
+    parse_markdown), while the "tree" engine processes the document inside
+    the Markdown conversion and emits the final HTML in a single pass.
+    Documents with raw HTML headings are always converted by the "soup"
+    engine.
+
     Arguments:
         template_name (str): The name of the template to render.
         context: The variables to make available in the template.
@@ -51,13 +512,207 @@ def render_markdown(template_name: str, **context: Any) -> Markup:
     Returns:
         Markup: The generated HTML.
     """
-    return Markup(parse_markdown(template_name, **context))
+    content, _ = _render_content(template_name, **context)
+
+    return Markup(content)
+
+
+def page_cache_key(template_name: str, **context: Any) -> str | None:
+    """
+    Generates the cache key for a rendered page.
+
+    The key is derived from the template name, the sources of the template,
+    the page templates and any templates they reference, a hash of the
+    context, the rendering configuration and render_version(), so pages
+    cached in a persistent backend are re-rendered after an upgrade or a
+    configuration change. Contexts that are not JSON-serializable cannot be
+    keyed. The variables Flask injects into every template, such as request,
+    session, g and those of context processors, are not part of the key.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        str | None: The cache key, or None if the page cannot be cached.
+    """
+    context_hash = stable_hash(context)
+
+    if context_hash is None:
+        return None
+
+    app = flask.current_app
+    config_hash = stable_hash(
+        {name: app.config[name] for name in _RENDER_CONFIG_KEYS}
+    )
+    hasher = sha256(template_name.encode())
+
+    for name in (template_name, *_PAGE_TEMPLATES):
+        hasher.update(template_digest(app.jinja_env, name).encode())
+
+    hasher.update(context_hash.encode())
+    hasher.update(f'\0{config_hash}\0{render_version()}'.encode())
+
+    return hasher.hexdigest()
+
+
+def page_cache_stats() -> dict:
+    """
+    Returns the counters for the current application's page cache.
+
+    Returns:
+        dict: The hits, misses, evictions, entries and bytes.
+    """
+    cache = get_page_cache(flask.current_app)
+
+    if cache is None:
+        return {}
+
+    return cache.stats()
+
+
+def render_jinja(template_name: str, **context: Any) -> str:
+    """
+    Renders a Markdown template with Jinja, before its conversion.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        str: The Markdown document.
+    """
+    with timed('jinja'):
+        return flask.render_template(template_name, **context)
+
+
+def render_layout(content: str, headings: tuple) -> str:
+    """
+    Renders converted Markdown into a page with content and navigation.
+
+    Arguments:
+        content (str): The converted HTML.
+        headings (tuple): The heading tree of the content.
+
+    Returns:
+        str: The rendered page.
+    """
+    with timed('navigation'):
+        navigation = _render_navigation(headings)
+
+    with timed('page'):
+        return flask.render_template(
+            'page.html',
+            content=Markup(content),
+            navigation=Markup(navigation)
+        )
+
+
+def render_many(
+    pairs: Iterable[tuple[str, dict | None]],
+    processes: int | None = None,
+    return_exceptions: bool = False,
+) -> Iterator[tuple[int, 'str | Exception']]:
+    """
+    Renders many templates to pages, yielding each page as it is rendered.
+
+    Identical pairs (the same template and a JSON-equal context) are
+    rendered once, and their page is yielded for each of their indices. By
+    default, pages are rendered in order in the current process and app
+    context, reusing its Markdown converter, lexers, formatters and caches.
+    With several processes, pages are rendered by a pool of worker
+    applications created from the current configuration, and yielded in the
+    order they finish. Only a few pages per process are rendered ahead of
+    the results being consumed.
+
+    Must be called in an app context, which must stay pushed while pages
+    rendered in the current process are consumed. Raises a RuntimeError
+    outside an app context, and a ValueError if processes is less than 1.
+
+    Arguments:
+        pairs (Iterable[tuple[str, dict | None]]): The template names and
+            contexts to render. Contexts sent to worker processes must be
+            picklable.
+        processes (int | None): The number of worker processes, at least 1,
+            or None to render in the current process.
+        return_exceptions (bool): Whether to yield the exception raised by a
+            page in place of the page, rather than raising it.
+
+    Returns:
+        Iterator[tuple[int, str | Exception]]: The index of each pair in
+            pairs, and its rendered page or exception.
+    """
+    if processes is not None and processes < 1:
+        raise ValueError(f'processes must be at least 1, got {processes}')
+
+    if not flask.has_app_context():
+        raise RuntimeError('render_many requires an app context')
+
+    groups = _group_pairs(pairs)
+
+    if processes is None:
+        return _render_groups(groups, return_exceptions)
+
+    return _render_groups_in_pool(
+        groups,
+        processes,
+        get_worker_config(flask.current_app),
+        return_exceptions
+    )
+
+
+def render_cached_page(template_name: str, **context: Any) -> RenderedPage:
+    """
+    Renders a template to a page, including its compressed copy if cached.
+
+    Rendered pages are cached by template and context, and re-rendered when
+    the template or any template it references changes. Pages that depend
+    on request state, e.g. through the request or session variables or a
+    context processor, must not be cached. See the HYDRA_PAGE_CACHE_*
+    configuration values. Each cached page is stored with a gzip-compressed
+    copy, compressed once at the level set in HYDRA_PAGE_GZIP_LEVEL, which
+    responses can serve directly. Pages that are not cached have no
+    compressed copy.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        RenderedPage: The rendered page.
+    """
+    app = flask.current_app
+
+    with timed('render'):
+        cache = get_page_cache(app)
+        key = None
+
+        if cache is not None:
+            key = page_cache_key(template_name, **context)
+
+        if key is None:
+            return RenderedPage(_render_page(template_name, **context))
+
+        page = cache.get(key)
+
+        if page is None:
+            html = _render_page(template_name, **context)
+            page = RenderedPage(
+                html,
+                compress_page(html, app.config['HYDRA_PAGE_GZIP_LEVEL'])
+            )
+
+            cache.set(key, page)
+
+        return page
 
 
 def render_page(template_name: str, **context: Any) -> str:
     """
     Renders a template to a page with content and navigation.
 
+    Rendered pages are cached, see render_cached_page().
+
     Arguments:
         template_name (str): The name of the template to render.
         context: The variables to make available in the template.
@@ -65,14 +720,23 @@ def render_page(template_name: str, **context: Any) -> str:
     Returns:
         str: The rendered page.
     """
-    fragment = parse_markdown(template_name, **context)
-    navigation = flask.render_template(
-        'page/navigation.html',
-        navigation=parse_headings(fragment)
-    )
+    return render_cached_page(template_name, **context).html
 
-    return flask.render_template(
-        'page.html',
-        content=Markup(fragment),
-        navigation=Markup(navigation)
-    )
+
+def save_fragment(key: str | None, html: str, headings: tuple) -> None:
+    """
+    Writes a converted Markdown fragment to the fragment store.
+
+    Writing the store is blocking file I/O.
+
+    Arguments:
+        key (str | None): The key of the fragment, see fragment_key(). The
+            fragment is not stored if the key is None.
+        html (str): The converted HTML.
+        headings (tuple): The heading tree of the fragment.
+    """
+    if key is None:
+        return
+
+    with timed('fragment'):
+        _get_fragment_store(flask.current_app).set(key, html, headings)
@@ -0,0 +1,105 @@
+from typing import Any
+
+import flask
+
+from hydra.utils.render_utils import page_cache_key, render_cached_page
+
+
+def _accepts_gzip(request: flask.Request) -> bool:
+    return request.accept_encodings['gzip'] > 0
+
+
+def _gzip_etag(etag: str, level: int) -> str:
+    # Strong ETags must differ between content codings, and between the
+    # bytes compressed at different levels.
+    return f'{etag}-gzip{level}'
+
+
+def page_etag(template_name: str, **context: Any) -> str | None:
+    """
+    Generates a strong ETag for a rendered page, without rendering it.
+
+    The ETag is derived from the page cache key (the template sources, the
+    context, the rendering configuration and render_version()), so it
+    changes whenever the rendered page could change. Like the key, it does
+    not cover the variables Flask injects into every template, such as
+    request, session, g and those of context processors. Pages that depend
+    on them would be answered with 304 Not Modified for another request's
+    ETag, so they must not use it.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        str | None: The ETag, or None if the context cannot be hashed.
+    """
+    key = page_cache_key(template_name, **context)
+
+    if key is None:
+        return None
+
+    return key[:32]
+
+
+def render_page_response(template_name: str, **context: Any) -> flask.Response:
+    """
+    Renders a page as a response supporting conditional requests.
+
+    The response carries a strong ETag. Requests whose If-None-Match header
+    matches the ETag are answered with 304 Not Modified before the page is
+    rendered. If the ETag cannot be derived from the inputs (see page_etag),
+    it is computed from the rendered page instead. Pages that depend on
+    request state outside of the context must not be served this way, see
+    page_etag.
+
+    Cached pages are stored with a gzip-compressed copy (see
+    render_cached_page), which is served as is to clients accepting the gzip
+    content coding. Its ETag includes HYDRA_PAGE_GZIP_LEVEL, as the
+    compressed bytes change with the level.
+
+    Arguments:
+        template_name (str): The name of the template to render.
+        context: The variables to make available in the template.
+
+    Returns:
+        Response: The page response, or a 304 response.
+    """
+    request = flask.request
+    app = flask.current_app
+    response_class = app.response_class
+    level = app.config['HYDRA_PAGE_GZIP_LEVEL']
+    etag = page_etag(template_name, **context)
+
+    if etag is not None:
+        candidates = [etag]
+
+        if level is not None:
+            candidates.append(_gzip_etag(etag, level))
+
+        for candidate in candidates:
+            if request.if_none_match.contains_weak(candidate):
+                response = response_class(status=304)
+                response.set_etag(candidate)
+                response.vary.add('Accept-Encoding')
+
+                return response
+
+    page = render_cached_page(template_name, **context)
+
+    if page.gzip is not None and _accepts_gzip(request):
+        response = response_class(page.gzip, mimetype='text/html')
+        response.content_encoding = 'gzip'
+    else:
+        response = response_class(page.html, mimetype='text/html')
+
+    response.vary.add('Accept-Encoding')
+
+    if etag is None:
+        response.add_etag()
+    elif response.content_encoding == 'gzip':
+        response.set_etag(_gzip_etag(etag, level))
+    else:
+        response.set_etag(etag)
+
+    return response.make_conditional(request)
@@ -0,0 +1,289 @@
+from hashlib import sha256
+from re import compile
+from sys import getsizeof
+from typing import Any, NamedTuple
+
+import flask
+
+from hydra.utils.cache_utils import LRUCache
+from hydra.utils.markdown_utils import (
+    TextSegment,
+    convert_document,
+    get_converter_generation,
+    iter_fenced_segment_spans,
+    process_fenced_code_blocks,
+)
+from hydra.utils.navigation_utils import Heading, build_headings
+from hydra.utils.string_utils import kebab_case, unique_slug
+from hydra.utils.timing_utils import timed
+
+
+_HEADING_TAGS = ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']
+
+# Python-Markdown extensions whose output depends on the whole document, e.g.
+# the table of contents of the toc extension's [TOC] marker, by module name.
+_DOCUMENT_EXTENSIONS = frozenset({'footnotes', 'toc'})
+
+# Matches an h1 or h2 ATX heading line, which starts a new section. Python-
+# Markdown does not require a space after the hashes, or allow indentation.
+_section_pattern = compile(r'(?m)^#{1,2}(?!#)')
+
+# Matches Markdown that can affect other sections when split: reference
+# link, footnote and abbreviation definitions, and raw HTML blocks, which
+# may contain heading lines.
+_unsplittable_pattern = compile(r'(?m)^ {0,3}(?:\[[^\]\n]+\]:|\*\[|<)')
+
+
+class _Section(NamedTuple):
+    html: str
+    entries: tuple[tuple[int, str, str], ...]
+    slugs: tuple[str, ...]
+    bases: tuple[str, ...]
+
+
+def _sizeof(value: '_Section | str') -> int:
+    if isinstance(value, str):
+        return getsizeof(value)
+
+    return getsizeof(value.html) + 64 * len(value.slugs)
+
+
+class _SectionRendering:
+    # The section cache of an application. Documents with fewer than
+    # min_sections sections are rendered as a whole.
+
+    __slots__ = ('cache', 'min_sections')
+
+    def __init__(self, cache: LRUCache | None, min_sections: int):
+        self.cache = cache
+        self.min_sections = min_sections
+
+
+class _SlugIndex:
+    # Tracks the heading ids used so far in a document, indexed by the base
+    # slug they could have been derived from, e.g. "examples-2" is indexed
+    # under both "examples-2" and "examples".
+
+    def __init__(self):
+        self._slugs = {}
+
+    def add(self, slug: str) -> None:
+        self._slugs.setdefault(slug, set()).add(slug)
+
+        stem, _, suffix = slug.rpartition('-')
+
+        if stem and suffix.isdigit():
+            self._slugs.setdefault(stem, set()).add(slug)
+
+    def conflicts(self, bases: tuple[str, ...]) -> frozenset[str]:
+        conflicts = set()
+
+        for base in set(bases):
+            conflicts.update(self._slugs.get(base, ()))
+
+        return frozenset(conflicts)
+
+
+def _convert_section(text: str) -> str:
+    with timed('fences'):
+        processed = process_fenced_code_blocks(text)
+
+    with timed('markdown'):
+        return convert_document(processed)[0]
+
+
+def _extension_name(extension: Any) -> str:
+    # Extensions are named by module, e.g. "toc" or
+    # "markdown.extensions.toc:TocExtension", or given as instances.
+    if not isinstance(extension, str):
+        extension = type(extension).__module__
+
+    return extension.partition(':')[0].rpartition('.')[2]
+
+
+def _get_section(
+    cache: LRUCache,
+    text: str,
+    digest: str,
+    used: frozenset[str],
+) -> _Section:
+    key = ('section', digest, tuple(sorted(used)))
+    section = cache.get(key)
+
+    if section is not None:
+        return section
+
+    # The converted Markdown is cached separately, so a section whose ids
+    # collide with earlier sections is only post-processed again.
+    rendered = cache.get(('markdown', digest))
+
+    if rendered is None:
+        rendered = _convert_section(text)
+
+        cache.set(('markdown', digest), rendered)
+
+    section = _process_section(rendered, used)
+
+    cache.set(key, section)
+
+    return section
+
+
+def _process_section(rendered: str, used: frozenset[str]) -> _Section:
+    from bs4 import BeautifulSoup
+
+    with timed('parse'):
+        fragment = BeautifulSoup(rendered, features='html.parser')
+
+    with timed('postprocess'):
+        entries = []
+        slugs = []
+        bases = []
+        seen = set(used)
+
+        for tag in fragment.find_all(_HEADING_TAGS):
+            label = tag.text
+            base = kebab_case(label)
+            slug = unique_slug(base, seen)
+            tag.attrs['id'] = slug
+
+            slugs.append(slug)
+            bases.append(base)
+
+            if tag.parent is not fragment or tag.name == 'h1':
+                continue
+
+            level = _HEADING_TAGS.index(tag.name)
+
+            entries.append((level, label, f'#{slug}'))
+
+    with timed('serialize'):
+        html = str(fragment)
+
+    return _Section(html, tuple(entries), tuple(slugs), tuple(bases))
+
+
+def _section_digest(text: str) -> str:
+    hasher = sha256(text.encode())
+
+    hasher.update(f'\0{get_converter_generation()}'.encode())
+
+    return hasher.hexdigest()
+
+
+def configure_section_rendering(
+    app: flask.Flask,
+    max_entries: int | None = 1024,
+    max_bytes: int | None = None,
+    min_sections: int = 8,
+    extensions: list[Any] | tuple[Any, ...] = (),
+) -> None:
+    """
+    Configures an application's cache of rendered document sections.
+
+    Arguments:
+        app (Flask): The application.
+        max_entries (int | None): The maximum number of cached sections.
+            Set to 0 to render documents as a whole.
+        max_bytes (int | None): The maximum total size of the cached
+            sections.
+        min_sections (int): The minimum number of sections in a document
+            rendered by section. Smaller documents are rendered as a whole.
+        extensions (list | tuple): The Python-Markdown extensions the
+            application converts with. If any of them depends on the whole
+            document, such as toc or footnotes, documents are rendered as a
+            whole.
+    """
+    cache = None
+    whole = any(
+        _extension_name(extension) in _DOCUMENT_EXTENSIONS
+        for extension in extensions
+    )
+
+    if max_entries != 0 and not whole:
+        cache = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=_sizeof,
+        )
+
+    app.extensions['hydra.sections'] = _SectionRendering(cache, min_sections)
+
+
+def render_sections(document: str) -> tuple[str, tuple[Heading, ...]] | None:
+    """
+    Renders a Markdown document section by section, reusing cached sections.
+
+    The document is split before each h1 or h2 ATX heading outside of code
+    blocks. Each section is rendered on its own and cached by its content,
+    so editing one section of a large document only re-renders that section.
+    Heading ids are deduplicated across the whole document; a section whose
+    ids collide with those of earlier sections is post-processed again, and
+    cached, for the colliding ids only. The output and headings are the same
+    as rendering the document as a whole.
+
+    Documents using Markdown that spans sections (reference definitions or
+    raw HTML blocks), or with fewer sections than configured, are not split.
+    Outside of an application context, if the application has no section
+    cache, or if it converts with an extension that depends on the whole
+    document (see configure_section_rendering), documents are never split.
+
+    Arguments:
+        document (str): The Markdown document, after Jinja rendering.
+
+    Returns:
+        tuple[str, tuple[Heading, ...]] | None: The HTML and the headings, or
+            None if the document should be rendered as a whole.
+    """
+    if not flask.has_app_context():
+        return None
+
+    rendering = flask.current_app.extensions.get('hydra.sections')
+
+    if rendering is None or rendering.cache is None:
+        return None
+
+    cache = rendering.cache
+
+    boundaries = [0]
+
+    for segment, start, _ in iter_fenced_segment_spans(document):
+        if not isinstance(segment, TextSegment):
+            continue
+
+        if _unsplittable_pattern.search(segment.text):
+            return None
+
+        boundaries.extend(
+            start + match.start()
+            for match in _section_pattern.finditer(segment.text)
+            if start + match.start() > 0
+        )
+
+    if len(boundaries) < rendering.min_sections:
+        return None
+
+    boundaries.append(len(document))
+
+    used = _SlugIndex()
+    html = []
+    entries = []
+
+    for start, end in zip(boundaries, boundaries[1:]):
+        text = document[start:end]
+        digest = _section_digest(text)
+        section = _get_section(cache, text, digest, frozenset())
+        conflicts = used.conflicts(section.bases)
+
+        if conflicts:
+            section = _get_section(cache, text, digest, conflicts)
+
+        for slug in section.slugs:
+            used.add(slug)
+
+        if section.html:
+            html.append(section.html)
+
+        entries.extend(section.entries)
+
+    return '\n'.join(html), build_headings(entries)
@@ -0,0 +1,143 @@
+from subprocess import run
+from sys import executable
+from typing import Iterable, NamedTuple
+
+
+# Separates the import phase from the app factory phase in the output of
+# the profiled interpreter.
+_PHASE_MARKER = 'hydra-startup:'
+
+_PROFILE_SCRIPT = f'''
+import sys
+from time import perf_counter
+
+start = perf_counter()
+import {{module}}
+imported = perf_counter()
+print({_PHASE_MARKER!r}, 'create_app', file=sys.stderr, flush=True)
+{{module}}.{{factory}}()
+created = perf_counter()
+print({_PHASE_MARKER!r}, imported - start, created - imported, file=sys.stderr)
+'''
+
+
+class ImportTiming(NamedTuple):
+    """
+    The time spent importing a module, as reported by -X importtime.
+
+    Arguments:
+        module (str): The name of the module.
+        self_time (float): The time spent in the module itself, in seconds.
+        cumulative_time (float): The time including the modules it imported,
+            in seconds.
+        depth (int): The nesting level of the import.
+    """
+    module: str
+    self_time: float
+    cumulative_time: float
+    depth: int
+
+
+class StartupProfile(NamedTuple):
+    """
+    The startup timings of an application.
+
+    Arguments:
+        import_time (float): The time spent importing the application
+            module, in seconds.
+        factory_time (float): The time spent in the app factory, in seconds.
+        imports (list[ImportTiming]): The modules imported by the import.
+        factory_imports (list[ImportTiming]): The modules imported by the
+            app factory.
+    """
+    import_time: float
+    factory_time: float
+    imports: list[ImportTiming]
+    factory_imports: list[ImportTiming]
+
+
+def _parse_import_line(line: str) -> ImportTiming | None:
+    if not line.startswith('import time:'):
+        return None
+
+    fields = line.removeprefix('import time:').split('|')
+
+    if len(fields) != 3 or not fields[0].strip().isdigit():
+        return None
+
+    name = fields[2].rstrip()
+    module = name.lstrip()
+
+    return ImportTiming(
+        module,
+        int(fields[0]) / 1e6,
+        int(fields[1]) / 1e6,
+        (len(name) - len(module) - 1) // 2,
+    )
+
+
+def package_times(imports: Iterable[ImportTiming]) -> dict[str, float]:
+    """
+    Totals the time spent importing each top-level package.
+
+    Arguments:
+        imports (Iterable[ImportTiming]): The imported modules.
+
+    Returns:
+        dict[str, float]: The total self time of the modules in each
+            package, in seconds, slowest first.
+    """
+    totals = {}
+
+    for timing in imports:
+        package = timing.module.partition('.')[0]
+        totals[package] = totals.get(package, 0.0) + timing.self_time
+
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def profile_startup(
+    module: str = 'hydra',
+    factory: str = 'create_app'
+) -> StartupProfile:
+    """
+    Profiles importing an application module and calling its app factory.
+
+    The import runs in a fresh interpreter with -X importtime, so modules
+    already imported by the calling process are included.
+
+    Arguments:
+        module (str): The module that defines the app factory.
+        factory (str): The name of the app factory.
+
+    Returns:
+        StartupProfile: The timings.
+    """
+    script = _PROFILE_SCRIPT.format(module=module, factory=factory)
+    result = run(
+        [executable, '-X', 'importtime', '-c', script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    phases = [[], []]
+    phase = 0
+    durations = (0.0, 0.0)
+
+    for line in result.stderr.splitlines():
+        if line.startswith(_PHASE_MARKER):
+            values = line.removeprefix(_PHASE_MARKER).split()
+
+            if values[0] == 'create_app':
+                phase = 1
+            else:
+                durations = (float(values[0]), float(values[1]))
+
+            continue
+
+        timing = _parse_import_line(line)
+
+        if timing is not None:
+            phases[phase].append(timing)
+
+    return StartupProfile(durations[0], durations[1], *phases)
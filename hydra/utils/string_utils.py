@@ -1,13 +1,15 @@
-from re import split, sub
+from functools import lru_cache
+from re import compile
+from typing import Iterable
 
 
-def _kebab_case_word(word: str) -> str:
-    normal = sub(r'[^\w]+', '', word)
-    chars = (f'-{char.lower()}' if char.isupper() else char for char in normal)
+# Strings matching this pattern are already in kebab-case.
+_kebab_case_pattern = compile(r'[a-z0-9]*')
 
-    return sub(r'^-', '', ''.join(chars))
+_separators = frozenset(' -_')
 
 
+@lru_cache(maxsize=4096)
 def kebab_case(string: str) -> str:
     """
     Converts a string to kebab-case.
@@ -21,13 +23,80 @@ def kebab_case(string: str) -> str:
 
     Finally, joins the words with dash characters.
 
+    The conversion is performed in a single pass over the characters, and
+    results are memoized for recently converted strings.
+
     Arguments:
         string (str): The input to process.
 
     Returns:
         str: The input string in kebab-case.
     """
-    words = split(r'[ \-_]', string)
-    words = (_kebab_case_word(word) for word in words)
+    if _kebab_case_pattern.fullmatch(string):
+        return string
+
+    chars = []
+    word_start = True
+
+    for char in string:
+        if char in _separators:
+            chars.append('-')
+            word_start = True
+        elif not char.isalnum():
+            continue
+        elif char.isupper():
+            if not word_start:
+                chars.append('-')
+
+            chars.append(char.lower())
+            word_start = False
+        else:
+            chars.append(char)
+            word_start = False
+
+    return ''.join(chars)
+
+
+def kebab_case_unique(strings: Iterable[str]) -> list[str]:
+    """
+    Converts each string in a document to a unique kebab-case slug.
+
+    Repeated slugs are deduplicated in order using unique_slug(), e.g. two
+    "Examples" headings become "examples" and "examples-1".
+
+    Arguments:
+        strings (Iterable[str]): The inputs to process, in document order.
+
+    Returns:
+        list[str]: The unique slugs, in order.
+    """
+    used = set()
+
+    return [unique_slug(kebab_case(string), used) for string in strings]
+
+
+def unique_slug(slug: str, used: set[str]) -> str:
+    """
+    Ensures a slug is unique within a set of previously used slugs.
+
+    If the slug has already been used, appends the lowest numeric suffix that
+    produces an unused slug, e.g. "examples-1". The returned slug is added to
+    the used set.
+
+    Arguments:
+        slug (str): The slug to process.
+        used (set[str]): The slugs already used in the document.
+
+    Returns:
+        str: The unique slug.
+    """
+    candidate = slug
+    index = 0
+
+    while candidate in used:
+        index += 1
+        candidate = f'{slug}-{index}'
+
+    used.add(candidate)
 
-    return '-'.join(words)
+    return candidate
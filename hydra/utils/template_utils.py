@@ -0,0 +1,151 @@
+from fnmatch import fnmatch
+from hashlib import sha256
+from threading import Lock
+from typing import Callable, Iterable
+from weakref import WeakKeyDictionary
+
+from jinja2 import Environment, TemplateNotFound, meta
+
+
+_dependency_caches = WeakKeyDictionary()
+_dependency_caches_lock = Lock()
+
+
+class _TemplateDigest:
+    __slots__ = ('digest', 'checks')
+
+    def __init__(self, digest: str, checks: list[Callable[[], bool]]):
+        self.digest = digest
+        self.checks = checks
+
+    def is_up_to_date(self) -> bool:
+        return all(check() for check in self.checks)
+
+
+def _get_dependency_cache(environment: Environment) -> dict:
+    cache = _dependency_caches.get(environment)
+
+    if cache is not None:
+        return cache
+
+    with _dependency_caches_lock:
+        return _dependency_caches.setdefault(environment, {})
+
+
+def _missing_check(environment: Environment, template_name: str) -> Callable:
+    def check() -> bool:
+        try:
+            environment.loader.get_source(environment, template_name)
+        except TemplateNotFound:
+            return True
+
+        return False
+
+    return check
+
+
+def _collect_dependencies(
+    environment: Environment,
+    template_name: str,
+    hasher,
+    checks: list,
+    seen: set,
+) -> None:
+    seen.add(template_name)
+    hasher.update(template_name.encode())
+    hasher.update(b'\0')
+
+    try:
+        source, _, uptodate = environment.loader.get_source(
+            environment,
+            template_name
+        )
+    except TemplateNotFound:
+        hasher.update(b'\1missing\0')
+        checks.append(_missing_check(environment, template_name))
+
+        return
+
+    hasher.update(source.encode())
+    hasher.update(b'\0')
+
+    if uptodate is not None:
+        checks.append(uptodate)
+
+    for reference in meta.find_referenced_templates(environment.parse(source)):
+        # Dynamic references (e.g. {% include variable %}) cannot be resolved
+        # statically, so any template using them is rehashed on every check.
+        if reference is None:
+            checks.append(lambda: False)
+
+            continue
+
+        if reference in seen:
+            continue
+
+        _collect_dependencies(environment, reference, hasher, checks, seen)
+
+
+def _build_digest(environment: Environment, template_name: str):
+    hasher = sha256()
+    checks = []
+
+    _collect_dependencies(environment, template_name, hasher, checks, set())
+
+    return _TemplateDigest(hasher.hexdigest(), checks)
+
+
+def list_markdown_templates(
+    environment: Environment,
+    exclude: Iterable[str] = ()
+) -> list[str]:
+    """
+    Lists the Markdown templates available to an environment.
+
+    Arguments:
+        environment (Environment): The Jinja environment.
+        exclude (Iterable[str]): Glob patterns for template names to skip,
+            e.g. "mocks/*".
+
+    Returns:
+        list[str]: The names of the Markdown templates.
+    """
+    exclude = list(exclude)
+
+    return [
+        template_name
+        for template_name in environment.list_templates(extensions=['md'])
+        if not any(fnmatch(template_name, pattern) for pattern in exclude)
+    ]
+
+
+def template_digest(environment: Environment, template_name: str) -> str:
+    """
+    Generates a hash of a template's source and the sources it references.
+
+    The referenced templates include any templates pulled in using the
+    extends, include, import or from tags, recursively. Missing templates
+    are hashed as missing, rather than raising an exception.
+
+    Digests are cached per environment and recomputed once the loader
+    reports that any of the sources is out of date (e.g. a changed file
+    modification time).
+
+    Arguments:
+        environment (Environment): The Jinja environment used to load the
+            templates.
+        template_name (str): The name of the template to hash.
+
+    Returns:
+        str: The hex digest of the template and its dependencies.
+    """
+    cache = _get_dependency_cache(environment)
+    cached = cache.get(template_name)
+
+    if cached is not None and cached.is_up_to_date():
+        return cached.digest
+
+    cached = _build_digest(environment, template_name)
+    cache[template_name] = cached
+
+    return cached.digest
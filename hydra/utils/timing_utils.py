@@ -0,0 +1,212 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Any, Iterator
+
+import flask
+
+
+# The upper bounds of the histogram buckets, in milliseconds.
+BUCKET_BOUNDS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_stage_observer = ContextVar('hydra_stage_observer', default=None)
+
+
+class RequestTimings:
+    """
+    Accumulates the time spent in each rendering stage during a request.
+    """
+
+    def __init__(self):
+        self.durations = {}
+
+    def record(self, stage: str, duration: float) -> None:
+        """
+        Adds the duration to the total for the stage.
+
+        Arguments:
+            stage (str): The name of the stage.
+            duration (float): The elapsed time, in seconds.
+        """
+        self.durations[stage] = self.durations.get(stage, 0.0) + duration
+
+    def server_timing(self) -> str:
+        """
+        Formats the timings as a Server-Timing header value.
+
+        Returns:
+            str: The header value, with durations in milliseconds.
+        """
+        return ', '.join(
+            f'{stage};dur={duration * 1000:.3f}'
+            for stage, duration in self.durations.items()
+        )
+
+
+class TimingHistogram:
+    """
+    Aggregates stage durations across requests into bucketed histograms.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._stages = {}
+
+    def add(self, timings: RequestTimings) -> None:
+        """
+        Adds the durations recorded during a request.
+
+        Arguments:
+            timings (RequestTimings): The request timings.
+        """
+        with self._lock:
+            for stage, duration in timings.durations.items():
+                milliseconds = duration * 1000
+                stage_data = self._stages.get(stage)
+
+                if stage_data is None:
+                    stage_data = {
+                        'count': 0,
+                        'sum': 0.0,
+                        'buckets': [0] * (len(BUCKET_BOUNDS) + 1),
+                    }
+                    self._stages[stage] = stage_data
+
+                stage_data['count'] += 1
+                stage_data['sum'] += milliseconds
+                stage_data['buckets'][
+                    bisect_left(BUCKET_BOUNDS, milliseconds)
+                ] += 1
+
+    def to_dict(self) -> dict:
+        """
+        Returns the aggregated histograms.
+
+        Returns:
+            dict: The count, sum (in milliseconds) and bucket counts for each
+                stage. Each bucket is keyed by its upper bound.
+        """
+        bounds = [str(bound) for bound in BUCKET_BOUNDS] + ['+Inf']
+
+        with self._lock:
+            return {
+                stage: {
+                    'count': data['count'],
+                    'sum': data['sum'],
+                    'buckets': dict(zip(bounds, data['buckets'])),
+                }
+                for stage, data in self._stages.items()
+            }
+
+
+def _get_request_timings() -> RequestTimings | None:
+    if not flask.has_request_context():
+        return None
+
+    return flask.g.get('hydra_timings')
+
+
+def get_timing_histogram(app: flask.Flask) -> TimingHistogram:
+    """
+    Returns the aggregated stage timings for the application.
+
+    Arguments:
+        app (Flask): The application.
+
+    Returns:
+        TimingHistogram: The aggregated timings.
+    """
+    histogram = app.extensions.get('hydra.timings')
+
+    if histogram is None:
+        histogram = app.extensions.setdefault(
+            'hydra.timings',
+            TimingHistogram()
+        )
+
+    return histogram
+
+
+def init_timings(app: flask.Flask) -> None:
+    """
+    Records stage timings for each request to the application.
+
+    The timings for each request are returned in a Server-Timing response
+    header and aggregated into the application's timing histogram.
+
+    Arguments:
+        app (Flask): The application.
+    """
+    histogram = get_timing_histogram(app)
+
+    @app.before_request
+    def start_timings():
+        flask.g.hydra_timings = RequestTimings()
+
+    @app.after_request
+    def finish_timings(response: flask.Response) -> flask.Response:
+        timings = flask.g.pop('hydra_timings', None)
+
+        if timings is None or not timings.durations:
+            return response
+
+        histogram.add(timings)
+        response.headers.add('Server-Timing', timings.server_timing())
+
+        return response
+
+
+@contextmanager
+def observe_stages(observer: Any) -> Iterator[None]:
+    """
+    Notifies an observer of the stages timed in the wrapped block.
+
+    The observer's enter(stage) and exit(stage) methods are called around
+    each timed() block run in the current context, inside or outside of a
+    request, e.g. to measure the memory allocated by each stage.
+
+    Arguments:
+        observer: The object to notify.
+    """
+    token = _stage_observer.set(observer)
+
+    try:
+        yield
+    finally:
+        _stage_observer.reset(token)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Records the time spent in the wrapped block for the current request.
+
+    Outside of a request with timings enabled, the block runs untimed.
+
+    Arguments:
+        stage (str): The name of the stage. Must be a valid Server-Timing
+            metric name.
+    """
+    timings = _get_request_timings()
+    observer = _stage_observer.get()
+
+    if timings is None and observer is None:
+        yield
+
+        return
+
+    if observer is not None:
+        observer.enter(stage)
+
+    start = perf_counter()
+
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.record(stage, perf_counter() - start)
+
+        if observer is not None:
+            observer.exit(stage)
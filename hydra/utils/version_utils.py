@@ -0,0 +1,45 @@
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from sys import version_info
+
+
+_RENDERING_PACKAGES = ('beautifulsoup4', 'jinja2', 'markdown', 'pygments')
+
+
+def package_version(name: str) -> str:
+    """
+    Looks up the installed version of a package.
+
+    Arguments:
+        name (str): The distribution name of the package.
+
+    Returns:
+        str: The installed version, or 'unknown' if it is not installed.
+    """
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=1)
+def render_version() -> str:
+    """
+    Identifies the versions of the code used to render pages.
+
+    Persistent caches and validators should include this value, so that
+    upgrading Hydra or one of its rendering dependencies invalidates output
+    rendered by the previous versions.
+
+    Returns:
+        str: The Python, Hydra and rendering package versions.
+    """
+    from hydra import __version__
+
+    versions = [
+        f'python={version_info.major}.{version_info.minor}',
+        f'hydra={__version__}',
+        *(f'{name}={package_version(name)}' for name in _RENDERING_PACKAGES),
+    ]
+
+    return ';'.join(versions)
@@ -0,0 +1,256 @@
+from json import load
+from os import getpid
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
+from time import perf_counter
+
+import flask
+
+from hydra.utils.render_utils import render_cached_page
+from hydra.utils.template_utils import list_markdown_templates
+
+
+class CacheWarmer:
+    """
+    Pre-renders an application's Markdown templates in background threads.
+
+    Each template is rendered through render_cached_page(), so its page,
+    highlighted code and converted Markdown are cached as if it had been
+    requested. The threads are daemon threads, and never delay shutdown.
+    Threads do not survive a fork, so a process forked after warming started,
+    e.g. a worker of a pre-forking server that preloads the app, starts
+    warming again on its first request (see ensure_started).
+
+    Arguments:
+        app (Flask): The application.
+        template_names (list[str]): The templates to render, in order.
+        workers (int): The number of rendering threads.
+        ready_ratio (float): The fraction of the templates that must be
+            processed before the warmer reports ready.
+    """
+
+    def __init__(
+        self,
+        app: flask.Flask,
+        template_names: list[str],
+        workers: int = 2,
+        ready_ratio: float = 1.0,
+    ):
+        self.app = app
+        self.template_names = template_names
+        self.workers = max(1, min(workers, len(template_names)))
+        self.ready_ratio = ready_ratio
+        self._start_lock = Lock()
+        self._pid = None
+        self._reset()
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        bool: Whether enough templates have been processed.
+        """
+        total = len(self.template_names)
+
+        return self._done.is_set() or (
+            total > 0
+            and (self.warmed + self.failed) / total >= self.ready_ratio
+        )
+
+    def ensure_started(self) -> None:
+        """
+        Starts rendering the templates, unless this process already has.
+        """
+        if self._pid == getpid():
+            return
+
+        with self._start_lock:
+            if self._pid != getpid():
+                self._reset()
+                self.start()
+
+    def progress(self) -> dict:
+        """
+        Returns the warming progress.
+
+        Returns:
+            dict: The number of templates in total, warmed and failed,
+                whether warming is done and the warmer is ready, and the
+                elapsed time in seconds.
+        """
+        with self._lock:
+            if self._duration is not None:
+                elapsed = self._duration
+            elif self._start is not None:
+                elapsed = perf_counter() - self._start
+            else:
+                elapsed = 0.0
+
+            return {
+                'total': len(self.template_names),
+                'warmed': self.warmed,
+                'failed': self.failed,
+                'done': self._done.is_set(),
+                'ready': self.is_ready,
+                'elapsed': elapsed,
+            }
+
+    def start(self) -> None:
+        """
+        Starts rendering the templates in the background.
+        """
+        self._pid = getpid()
+
+        if not self.template_names:
+            self._done.set()
+
+            return
+
+        for template_name in self.template_names:
+            self._queue.put(template_name)
+
+        with self._lock:
+            self._start = perf_counter()
+            self._running = self.workers
+
+        for index in range(self.workers):
+            thread = Thread(
+                target=self._work,
+                name=f'hydra-warm-{index}',
+                daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Waits for every template to be processed.
+
+        Arguments:
+            timeout (float | None): The maximum time to wait, in seconds.
+
+        Returns:
+            bool: Whether warming is done.
+        """
+        return self._done.wait(timeout)
+
+    def _reset(self) -> None:
+        # The lock may have been held by a thread that did not survive a
+        # fork, so it is replaced rather than acquired.
+        self._lock = Lock()
+        self._queue = SimpleQueue()
+        self._done = Event()
+        self._threads = []
+        self._running = 0
+        self._start = None
+        self._duration = None
+        self.warmed = 0
+        self.failed = 0
+
+    def _warm(self, template_name: str) -> None:
+        try:
+            with self.app.app_context():
+                render_cached_page(template_name)
+        except Exception:
+            self.app.logger.exception(
+                'Failed to warm the cache for %s',
+                template_name
+            )
+
+            with self._lock:
+                self.failed += 1
+        else:
+            with self._lock:
+                self.warmed += 1
+
+    def _work(self) -> None:
+        while True:
+            try:
+                template_name = self._queue.get_nowait()
+            except Empty:
+                break
+
+            self._warm(template_name)
+
+        with self._lock:
+            self._running -= 1
+
+            if self._running == 0:
+                self._duration = perf_counter() - self._start
+                self._done.set()
+
+
+def _load_hints(app: flask.Flask, path: str | None) -> dict[str, float]:
+    if not path:
+        return {}
+
+    try:
+        with open(path, encoding='utf-8') as file:
+            hints = load(file)
+    except (OSError, ValueError):
+        app.logger.warning('Unable to read the cache warming hints %s', path)
+
+        return {}
+
+    if not isinstance(hints, dict):
+        app.logger.warning('Ignoring invalid cache warming hints %s', path)
+
+        return {}
+
+    return {
+        name: count
+        for name, count in hints.items()
+        if isinstance(count, (int, float))
+    }
+
+
+def get_cache_warmer(app: flask.Flask) -> CacheWarmer | None:
+    """
+    Returns the application's cache warmer.
+
+    Arguments:
+        app (Flask): The application.
+
+    Returns:
+        CacheWarmer | None: The warmer, or None if warming is disabled.
+    """
+    return app.extensions.get('hydra.cache_warmer')
+
+
+def init_cache_warming(app: flask.Flask) -> CacheWarmer:
+    """
+    Starts pre-rendering the application's Markdown templates.
+
+    Templates matching HYDRA_BUILD_EXCLUDE are skipped. If the JSON file
+    set in HYDRA_WARM_CACHE_HINTS maps template names to request counts,
+    the most requested templates are rendered first. Warming starts now, and
+    again on the first request of each process forked from this one.
+
+    Arguments:
+        app (Flask): The application.
+
+    Returns:
+        CacheWarmer: The started warmer.
+    """
+    hints = _load_hints(app, app.config['HYDRA_WARM_CACHE_HINTS'])
+    template_names = sorted(
+        list_markdown_templates(
+            app.jinja_env,
+            exclude=app.config['HYDRA_BUILD_EXCLUDE']
+        ),
+        key=lambda template_name: -hints.get(template_name, 0)
+    )
+    warmer = CacheWarmer(
+        app,
+        template_names,
+        workers=app.config['HYDRA_WARM_CACHE_WORKERS'],
+        ready_ratio=app.config['HYDRA_WARM_CACHE_READY_RATIO'],
+    )
+
+    app.extensions['hydra.cache_warmer'] = warmer
+    warmer.start()
+
+    @app.before_request
+    def start_cache_warming():
+        warmer.ensure_started()
+
+    return warmer
@@ -0,0 +1,44 @@
+import pytest  # noqa: F401
+
+from hydra.bench.documents import SIZES, generate_document, generate_documents
+
+
+class TestGenerateDocument:
+    def test_default_document(self):
+        document = generate_document()
+
+        assert document.startswith('# Synthetic Reference Page\n')
+        assert document.count('\n## ') + document.count('\n### ') + document.count('\n#### ') == 10
+        assert document.count('```') == 10
+
+    def test_heading_depth(self):
+        document = generate_document(headings=6, depth=2, blocks=0)
+
+        assert document.count('\n## ') == 3
+        assert document.count('\n### ') == 3
+        assert '\n#### ' not in document
+
+    def test_code_blocks(self):
+        document = generate_document(
+            headings=2,
+            blocks=3,
+            block_lines=4,
+            languages=('python', '')
+        )
+
+        assert document.count('```python\n') == 2
+        assert document.count('```\nPlain text line 0') == 1
+        assert document.count('value_3 = ') == 2
+
+    def test_is_deterministic(self):
+        assert generate_document(**SIZES['medium']) == generate_document(**SIZES['medium'])
+
+
+class TestGenerateDocuments:
+    def test_default_sizes(self):
+        assert list(generate_documents()) == ['small', 'medium', 'large']
+
+    def test_selected_sizes(self):
+        documents = generate_documents(['small'])
+
+        assert documents == {'small': generate_document(**SIZES['small'])}
@@ -0,0 +1,136 @@
+import pytest
+from json import dump, load
+
+from hydra.bench.loadtest import (
+    _parse_server_timing,
+    _percentile,
+    build_loadtest_app,
+    main,
+    run_scenario,
+    run_workload,
+    scenario_pages,
+)
+
+
+SCENARIO = {
+    'sizes': ['small'],
+    'pages': {
+        '/small': 'bench/small.md',
+        '/mock': 'mocks/markdown_template.md',
+    },
+    'workloads': [
+        {
+            'name': 'warm',
+            'cache': 'warm',
+            'pages': {'/small': 3, '/mock': 1},
+            'requests': 8,
+            'concurrency': 2,
+        },
+        {
+            'name': 'cold',
+            'cache': 'cold',
+            'pages': ['/mock'],
+            'requests': 2,
+        },
+    ],
+}
+
+
+class TestRunWorkload:
+    def test_client(self):
+        result = run_workload(SCENARIO, SCENARIO['workloads'][0], 'client')
+
+        assert result['name'] == 'warm'
+        assert result['target'] == 'client'
+        assert result['requests'] == 8
+        assert result['errors'] == 0
+        assert result['throughput'] > 0
+        assert 0 < result['latency']['p50'] <= result['latency']['p99']
+        assert list(result['stages']) == ['render']
+
+    def test_server(self):
+        result = run_workload(SCENARIO, SCENARIO['workloads'][1], 'server')
+
+        assert result['requests'] == 2
+        assert result['errors'] == 0
+        assert 'markdown' in result['stages']
+
+    def test_invalid_target(self):
+        with pytest.raises(ValueError):
+            run_workload(SCENARIO, SCENARIO['workloads'][0], 'remote')
+
+
+class TestRunScenario:
+    def test_results(self):
+        results = run_scenario(SCENARIO, targets=('client',))
+        names = [result['name'] for result in results['results']]
+
+        assert names == ['warm', 'cold']
+        assert 'hydra=' in results['meta']['version']
+
+    def test_selected_workloads(self):
+        results = run_scenario(
+            SCENARIO,
+            targets=('client',),
+            workloads=['cold']
+        )
+
+        assert [result['name'] for result in results['results']] == ['cold']
+
+
+class TestBuildLoadtestApp:
+    def test_cold_cache(self):
+        app = build_loadtest_app(SCENARIO, 'cold')
+
+        assert app.config['HYDRA_PAGE_CACHE_MAX_ENTRIES'] == 0
+        assert app.config['HYDRA_SERVER_TIMING']
+
+    def test_invalid_cache(self):
+        with pytest.raises(ValueError):
+            build_loadtest_app(SCENARIO, 'lukewarm')
+
+    def test_default_pages(self):
+        assert scenario_pages({'sizes': ['small']}) == {'/bench/small': 'bench/small.md'}
+
+
+class TestParseServerTiming:
+    def test_stages(self):
+        assert _parse_server_timing('jinja;dur=1.5, render;desc="x";dur=4') == {
+            'jinja': 0.0015,
+            'render': 0.004,
+        }
+
+    def test_missing_header(self):
+        assert _parse_server_timing(None) == {}
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = [float(value) for value in range(1, 101)]
+
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 99) == 99.0
+        assert _percentile([1.0], 99) == 1.0
+        assert _percentile([], 50) == 0.0
+
+
+class TestMain:
+    def test_scenario_file(self, tmp_path):
+        scenario = tmp_path / 'scenario.json'
+        output = tmp_path / 'results.json'
+
+        with open(scenario, 'w') as file:
+            dump({**SCENARIO, 'workloads': SCENARIO['workloads'][1:]}, file)
+
+        assert main([str(scenario), '--target', 'client', '--output', str(output)]) == 0
+
+        with open(output) as file:
+            assert load(file)['results'][0]['name'] == 'cold'
+
+    def test_unknown_size(self, tmp_path):
+        scenario = tmp_path / 'scenario.json'
+
+        with open(scenario, 'w') as file:
+            dump({**SCENARIO, 'sizes': ['enormous']}, file)
+
+        assert main([str(scenario)]) == 2
@@ -0,0 +1,16 @@
+import pytest
+
+from hydra.bench.__main__ import main
+
+
+class TestMain:
+    @pytest.mark.parametrize('repeat', ['0', '-1', 'many'])
+    def test_invalid_repeat(self, repeat, capsys):
+        with pytest.raises(SystemExit) as error:
+            main(['--repeat', repeat])
+
+        assert error.value.code == 2
+        assert '--repeat' in capsys.readouterr().err
+
+    def test_unknown_size(self):
+        assert main(['--sizes', 'enormous']) == 2
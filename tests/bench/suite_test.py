@@ -0,0 +1,65 @@
+import pytest  # noqa: F401
+
+from hydra.bench.suite import compare_results, run_memory_suite, run_suite
+
+
+def _results(**medians):
+    return {
+        'results': [
+            {'name': name, 'median': median}
+            for name, median in medians.items()
+        ]
+    }
+
+
+class TestRunSuite:
+    def test_results(self):
+        results = run_suite(sizes=['small'], pattern='[small]', repeat=1)
+        names = [result['name'] for result in results['results']]
+
+        assert names == [
+            'process_fenced_code_blocks[small]',
+            'kebab_case[small]',
+            'add_header_ids[small]',
+            'parse_headings[small]',
+            'parse_markdown[small]',
+            'render_page[small]',
+        ]
+        assert results['meta']['repeat'] == 1
+        assert all(result['median'] > 0 for result in results['results'])
+
+    def test_mock_templates(self):
+        results = run_suite(sizes=[], pattern='render_page', repeat=1)
+        names = [result['name'] for result in results['results']]
+
+        assert names == [
+            'render_page[markdown_template]',
+            'render_page[code_block_template]',
+            'render_page[highlighted_code_block_template]',
+        ]
+
+
+class TestRunMemorySuite:
+    def test_results(self):
+        results = run_memory_suite(sizes=['small'], pattern='render_page[small]')
+        result, = results['results']
+
+        assert result['name'] == 'render_page[small]'
+        assert result['peak'] > 0
+        assert result['stages']['parse']['peak'] > 0
+        assert result['objects'] == {}
+        assert results['meta']['hydra']
+
+
+class TestCompareResults:
+    def test_comparison(self):
+        comparisons = compare_results(
+            _results(fast=1.0, slow=2.0, new=1.0),
+            _results(fast=1.0, slow=1.0, old=1.0),
+            threshold=0.1
+        )
+
+        assert comparisons == [
+            {'name': 'fast', 'baseline': 1.0, 'median': 1.0, 'ratio': 1.0, 'regressed': False},
+            {'name': 'slow', 'baseline': 1.0, 'median': 2.0, 'ratio': 2.0, 'regressed': True},
+        ]
@@ -0,0 +1,98 @@
+import pytest
+from json import loads
+from unittest.mock import patch
+
+from hydra import create_app
+
+
+def _mock_render_template(template_name, **context):
+    if template_name == 'page.html':
+        return f"<main>{context['content']}</main>"
+
+    if template_name == 'page/navigation.html':
+        return ''
+
+    return f'# {template_name}'
+
+
+@pytest.fixture
+def app():
+    return create_app(injected_config={'HYDRA_BUILD_EXCLUDE': []})
+
+
+@pytest.fixture
+def with_mocked_rendering():
+    with patch('flask.render_template', side_effect=_mock_render_template):
+        yield
+
+
+class TestBuildCommand:
+    def test_build(self, app, tmp_path, with_mocked_rendering):
+        runner = app.test_cli_runner()
+        args = ['build', '--output', str(tmp_path), '--jobs', '1']
+        result = runner.invoke(args=args)
+        page = (tmp_path / 'mocks' / 'markdown_template.html').read_text()
+        manifest = loads((tmp_path / '.hydra-build.json').read_text())
+
+        assert result.exit_code == 0
+        assert page == (
+            '<main><h1 id="mocksmarkdown-templatemd">'
+            'mocks/markdown_template.md</h1></main>'
+        )
+        assert sorted(manifest) == [
+            'mocks/code_block_template.md',
+            'mocks/empty_template.md',
+            'mocks/highlighted_code_block_template.md',
+            'mocks/markdown_template.md',
+        ]
+        assert 'Rendered 4 of 4 pages (0 unchanged, 0 failed)' in result.output
+
+    def test_incremental_build(self, app, tmp_path, with_mocked_rendering):
+        runner = app.test_cli_runner()
+        args = ['build', '--output', str(tmp_path), '--jobs', '1']
+        runner.invoke(args=args)
+
+        (tmp_path / 'mocks' / 'empty_template.html').unlink()
+
+        result = runner.invoke(args=args)
+
+        assert result.exit_code == 0
+        assert 'skipped  mocks/markdown_template.md' in result.output
+        assert 'Rendered 1 of 4 pages (3 unchanged, 0 failed)' in result.output
+
+    def test_forced_build(self, app, tmp_path, with_mocked_rendering):
+        runner = app.test_cli_runner()
+        args = ['build', '--output', str(tmp_path), '--jobs', '1']
+        runner.invoke(args=args)
+
+        result = runner.invoke(args=[*args, '--force'])
+
+        assert 'Rendered 4 of 4 pages (0 unchanged, 0 failed)' in result.output
+
+    def test_excluded_templates(self, tmp_path, with_mocked_rendering):
+        app = create_app()
+        runner = app.test_cli_runner()
+        args = ['build', '--output', str(tmp_path), '--jobs', '1']
+        result = runner.invoke(args=args)
+
+        assert result.exit_code == 0
+        assert 'Rendered 0 of 0 pages' in result.output
+
+    def test_failed_page(self, app, tmp_path):
+        runner = app.test_cli_runner()
+        args = ['build', '--output', str(tmp_path), '--jobs', '1']
+        result = runner.invoke(args=args)
+
+        assert result.exit_code == 1
+        assert 'failed  mocks/markdown_template.md' in result.output
+
+
+class TestStartupProfileCommand:
+    def test_startup_profile(self, app):
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=['hydra', 'startup-profile', '-n', '3'])
+
+        assert result.exit_code == 0
+        assert result.output.startswith('import hydra: ')
+        assert 'create_app(): ' in result.output
+        assert 'slowest modules' in result.output
@@ -0,0 +1,37 @@
+import pytest  # noqa: F401
+from subprocess import run
+from sys import executable
+
+
+def _imported_modules(code: str) -> set[str]:
+    script = f'import sys\n{code}\nprint(" ".join(sys.modules))'
+    result = run(
+        [executable, '-c', script],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    return set(result.stdout.split())
+
+
+class TestImports:
+    def test_import_is_lazy(self):
+        modules = _imported_modules('import hydra')
+
+        assert 'pygments' not in modules
+        assert 'bs4' not in modules
+        assert 'markdown' not in modules
+        assert 'sqlite3' not in modules
+        assert 'tracemalloc' not in modules
+        assert 'cProfile' not in modules
+        assert 'pstats' not in modules
+
+    def test_create_app_is_lazy(self):
+        modules = _imported_modules('import hydra\nhydra.create_app()')
+
+        assert 'pygments' not in modules
+        assert 'bs4' not in modules
+        assert 'sqlite3' not in modules
+        assert 'tracemalloc' not in modules
+        assert 'cProfile' not in modules
@@ -0,0 +1,126 @@
+import pytest  # noqa: F401
+from unittest.mock import patch
+
+from hydra import create_app
+from hydra.utils.render_utils import render_page
+from hydra.utils.warm_utils import CacheWarmer
+
+
+def _mock_render_template(template_name, **context):
+    return f'<p>{template_name}</p>'
+
+
+class TestMemory:
+    def test_disabled(self):
+        response = create_app().test_client().get(
+            '/_hydra/memory?template=mocks/markdown_template.md'
+        )
+
+        assert response.status_code == 404
+
+    def test_report(self):
+        app = create_app(injected_config={'HYDRA_MEMORY_REPORT': True})
+        client = app.test_client()
+        response = client.get(
+            '/_hydra/memory?template=mocks/markdown_template.md'
+            '&function=parse_markdown'
+        )
+
+        assert response.status_code == 200
+        assert 'parse' in response.json['stages']
+        assert response.json['objects'] == {}
+
+    def test_unknown_template(self):
+        app = create_app(injected_config={'HYDRA_MEMORY_REPORT': True})
+        response = app.test_client().get('/_hydra/memory?template=page.html')
+
+        assert response.status_code == 404
+
+    def test_unknown_function(self):
+        app = create_app(injected_config={'HYDRA_MEMORY_REPORT': True})
+        response = app.test_client().get(
+            '/_hydra/memory?template=mocks/markdown_template.md&function=eval'
+        )
+
+        assert response.status_code == 400
+
+
+class TestReady:
+    def test_disabled(self):
+        response = create_app().test_client().get('/_hydra/ready')
+
+        assert response.status_code == 404
+
+    def test_not_ready_while_warming(self):
+        app = create_app()
+        warmer = CacheWarmer(app, ['mocks/markdown_template.md'])
+        app.extensions['hydra.cache_warmer'] = warmer
+        response = app.test_client().get('/_hydra/ready')
+
+        assert response.status_code == 503
+        assert response.json['ready'] is False
+        assert response.json['total'] == 1
+
+    def test_ready_after_warming(self):
+        app = create_app()
+        warmer = CacheWarmer(app, ['mocks/markdown_template.md'])
+        app.extensions['hydra.cache_warmer'] = warmer
+
+        with patch('flask.render_template', side_effect=_mock_render_template):
+            warmer.start()
+            warmer.wait(10)
+
+        response = app.test_client().get('/_hydra/ready')
+
+        assert response.status_code == 200
+        assert response.json['warmed'] == 1
+
+
+class TestTimings:
+    def test_empty_timings(self):
+        app = create_app(injected_config={'HYDRA_SERVER_TIMING': True})
+        response = app.test_client().get('/_hydra/timings')
+
+        assert response.json == {}
+
+    def test_rendered_page_timings(self):
+        app = create_app(injected_config={'HYDRA_SERVER_TIMING': True})
+
+        @app.route('/page')
+        def page():
+            return render_page('mocks/markdown_template.md')
+
+        client = app.test_client()
+
+        with patch('flask.render_template', side_effect=_mock_render_template):
+            response = client.get('/page')
+
+        header = response.headers['Server-Timing']
+        stages = [metric.split(';')[0] for metric in header.split(', ')]
+
+        assert stages == [
+            'jinja',
+            'fences',
+            'markdown',
+            'parse',
+            'postprocess',
+            'serialize',
+            'navigation',
+            'page',
+            'gzip',
+            'render',
+        ]
+        assert client.get('/_hydra/timings').json['render']['count'] == 1
+
+    def test_disabled_timings(self):
+        app = create_app(injected_config={'HYDRA_SERVER_TIMING': False})
+
+        @app.route('/page')
+        def page():
+            return render_page('mocks/markdown_template.md')
+
+        with patch('flask.render_template', side_effect=_mock_render_template):
+            response = app.test_client().get('/page')
+
+        assert 'Server-Timing' not in response.headers
+        assert app.test_client().get('/_hydra/timings').status_code == 404
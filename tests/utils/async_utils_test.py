@@ -0,0 +1,241 @@
+import pytest
+from asyncio import gather, run
+from threading import current_thread
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from flask import render_template
+from markupsafe import Markup
+
+from hydra import create_app
+from hydra.utils.async_utils import (
+    async_parse_markdown,
+    async_render_markdown,
+    async_render_page,
+)
+from hydra.utils.render_utils import (
+    convert_markdown,
+    load_fragment,
+    page_cache_stats,
+    parse_markdown,
+    render_markdown,
+    render_page,
+)
+
+
+def _mock_render_template(template_name: str, **context) -> str:
+    if template_name == 'page/navigation.html':
+        labels = [item['label'] for item in context['navigation']]
+
+        return f'<nav>{", ".join(labels)}</nav>'
+
+    if template_name == 'page.html':
+        return f'{context["navigation"]}<article>{context["content"]}</article>'
+
+    return render_template(template_name, **context)
+
+
+@pytest.fixture
+def with_app_context():
+    with create_app().test_request_context():
+        yield
+
+
+@pytest.fixture
+def with_uncached_app_context():
+    config = {'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0}
+
+    with create_app(injected_config=config).test_request_context():
+        yield
+
+
+@pytest.fixture
+def with_mocked_rendering():
+    with patch('flask.render_template', side_effect=_mock_render_template):
+        yield
+
+
+@pytest.fixture
+def with_counted_conversions():
+    with patch(
+        'hydra.utils.async_utils.convert_markdown',
+        wraps=convert_markdown
+    ) as mock:
+        yield mock
+
+
+class TestAsyncParseMarkdown:
+    def test_markdown_template(self, with_app_context):
+        fragment = run(
+            async_parse_markdown(
+                'mocks/markdown_template.md',
+                name='Starfighter'
+            )
+        )
+        expected = parse_markdown(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+        assert type(fragment) is BeautifulSoup
+        assert str(fragment) == str(expected)
+
+    def test_fragment_store(self, tmp_path, with_mocked_rendering):
+        config = {'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path)}
+
+        with create_app(injected_config=config).test_request_context():
+            first = run(async_parse_markdown('mocks/markdown_template.md'))
+
+            with patch(
+                'hydra.utils.async_utils.render_jinja'
+            ) as async_mock, patch(
+                'hydra.utils.render_utils.render_jinja'
+            ) as sync_mock:
+                second = run(
+                    async_parse_markdown('mocks/markdown_template.md')
+                )
+                expected = parse_markdown('mocks/markdown_template.md')
+
+        assert not async_mock.called
+        assert not sync_mock.called
+        assert type(second) is BeautifulSoup
+        assert str(first) == str(second) == str(expected)
+
+
+class TestAsyncRenderMarkdown:
+    def test_code_block_template(self, with_app_context):
+        rendered = run(
+            async_render_markdown(
+                'mocks/highlighted_code_block_template.md',
+                name='Starfighter'
+            )
+        )
+        expected = render_markdown(
+            'mocks/highlighted_code_block_template.md',
+            name='Starfighter'
+        )
+
+        assert type(rendered) is Markup
+        assert rendered == expected
+
+    def test_configured_extensions(self):
+        config = {'HYDRA_MARKDOWN_EXTENSIONS': ['tables']}
+        source = '| Name |\n| ---- |\n| Grig |'
+
+        with create_app(injected_config=config).test_request_context():
+            with patch('flask.render_template', return_value=source):
+                rendered = run(
+                    async_render_markdown('mocks/markdown_template.md')
+                )
+
+        assert '<table>' in rendered
+
+    def test_invalid_executor(self):
+        config = {'HYDRA_ASYNC_EXECUTOR': 'fiber'}
+
+        with create_app(injected_config=config).test_request_context():
+            with pytest.raises(ValueError):
+                run(async_render_markdown('mocks/markdown_template.md'))
+
+
+class TestAsyncRenderPage:
+    def test_markdown_template(self, with_uncached_app_context, with_mocked_rendering):
+        rendered = run(
+            async_render_page(
+                'mocks/markdown_template.md',
+                name='Starfighter'
+            )
+        )
+
+        assert rendered == render_page(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+    def test_cached_page(self, with_app_context, with_mocked_rendering, with_counted_conversions):
+        first = run(async_render_page('mocks/markdown_template.md'))
+        second = run(async_render_page('mocks/markdown_template.md'))
+
+        assert first == second
+        assert with_counted_conversions.call_count == 1
+        assert page_cache_stats()['hits'] == 1
+
+    def test_concurrent_renders(self, with_uncached_app_context, with_mocked_rendering, with_counted_conversions):
+        async def render_concurrently():
+            return await gather(*(
+                async_render_page('mocks/markdown_template.md', name='Grig')
+                for _ in range(4)
+            ))
+
+        pages = run(render_concurrently())
+
+        assert len(set(pages)) == 1
+        assert with_counted_conversions.call_count == 1
+
+    def test_concurrent_failures(self, with_uncached_app_context, with_mocked_rendering):
+        async def render_concurrently():
+            return await gather(
+                *(async_render_page('mocks/markdown_template.md') for _ in range(2)),
+                return_exceptions=True
+            )
+
+        with patch(
+            'hydra.utils.async_utils.convert_markdown',
+            side_effect=RuntimeError('failed')
+        ):
+            results = run(render_concurrently())
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_uncacheable_context(self, with_app_context, with_mocked_rendering):
+        rendered = run(
+            async_render_page('mocks/markdown_template.md', name=object())
+        )
+
+        assert '<article>' in rendered
+        assert page_cache_stats()['entries'] == 0
+
+    def test_offloaded_fragment_store(self, tmp_path, with_mocked_rendering):
+        config = {
+            'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path),
+            'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+        }
+        threads = []
+
+        def load(key):
+            threads.append(current_thread().name)
+
+            return load_fragment(key)
+
+        with create_app(injected_config=config).test_request_context():
+            with patch(
+                'hydra.utils.async_utils.load_fragment',
+                side_effect=load
+            ):
+                first = run(async_render_page('mocks/markdown_template.md'))
+                second = run(async_render_page('mocks/markdown_template.md'))
+
+        assert first == second
+        assert len(threads) == 2
+        assert all(name.startswith('hydra-async') for name in threads)
+        assert list(tmp_path.iterdir())
+
+    def test_process_executor(self, with_mocked_rendering):
+        config = {
+            'HYDRA_ASYNC_EXECUTOR': 'process',
+            'HYDRA_ASYNC_WORKERS': 1,
+            'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+        }
+
+        with create_app(injected_config=config).test_request_context():
+            rendered = run(
+                async_render_page(
+                    'mocks/highlighted_code_block_template.md',
+                    name='Starfighter'
+                )
+            )
+            expected = render_page(
+                'mocks/highlighted_code_block_template.md',
+                name='Starfighter'
+            )
+
+        assert rendered == expected
@@ -0,0 +1,294 @@
+import pytest
+from multiprocessing import get_context
+from sqlite3 import OperationalError, connect
+from unittest.mock import patch
+from markupsafe import Markup
+
+from hydra.utils import cache_utils
+from hydra.utils.cache_utils import (
+    LRUCache,
+    SQLiteCache,
+    create_cache,
+    stable_hash,
+)
+
+
+def _set_in_process(path: str, key: str, value: str) -> None:
+    SQLiteCache(path, namespace='shared').set(key, value)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / 'cache.sqlite')
+
+
+class TestLRUCache:
+    def test_empty_cache(self):
+        cache = LRUCache()
+
+        assert len(cache) == 0
+        assert cache.get('key') is None
+        assert cache.get('key', 'default') == 'default'
+
+    def test_set_and_get(self):
+        cache = LRUCache()
+        cache.set('key', 'value')
+
+        assert 'key' in cache
+        assert cache.get('key') == 'value'
+
+    def test_delete(self):
+        cache = LRUCache(sizeof=len)
+        cache.set('key', 'value')
+        cache.delete('key')
+        cache.delete('other')
+
+        assert 'key' not in cache
+        assert cache.size == 0
+
+    def test_clear(self):
+        cache = LRUCache(sizeof=len)
+        cache.set('key', 'value')
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.size == 0
+
+    def test_evicts_by_entries(self):
+        cache = LRUCache(max_entries=2)
+        cache.set('first', 1)
+        cache.set('second', 2)
+        cache.get('first')
+        cache.set('third', 3)
+
+        assert 'first' in cache
+        assert 'second' not in cache
+        assert 'third' in cache
+        assert cache.evictions == 1
+
+    def test_evicts_by_bytes(self):
+        cache = LRUCache(max_bytes=10, sizeof=len)
+        cache.set('first', 'abcd')
+        cache.set('second', 'efgh')
+        cache.set('third', 'ijkl')
+
+        assert 'first' not in cache
+        assert cache.size == 8
+        assert cache.evictions == 1
+
+    def test_replaces_existing_entry(self):
+        cache = LRUCache(sizeof=len)
+        cache.set('key', 'abcd')
+        cache.set('key', 'ef')
+
+        assert cache.get('key') == 'ef'
+        assert cache.size == 2
+
+    def test_does_not_cache_oversized_value(self):
+        cache = LRUCache(max_bytes=4, sizeof=len)
+        cache.set('key', 'abcdefgh')
+
+        assert 'key' not in cache
+        assert cache.size == 0
+
+    def test_stats(self):
+        cache = LRUCache(max_entries=1, sizeof=len)
+        cache.set('first', 'abc')
+        cache.get('first')
+        cache.get('second')
+        cache.set('second', 'de')
+
+        assert cache.stats() == {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'entries': 1,
+            'bytes': 2,
+        }
+
+
+class TestSQLiteCache:
+    def test_empty_cache(self, database):
+        cache = SQLiteCache(database)
+
+        assert len(cache) == 0
+        assert cache.get('key') is None
+        assert cache.get('key', 'default') == 'default'
+
+    def test_set_and_get(self, database):
+        cache = SQLiteCache(database)
+        cache.set('key', {'html': '<p></p>', 'sizes': (1, 2)})
+
+        assert 'key' in cache
+        assert cache.get('key') == {'html': '<p></p>', 'sizes': (1, 2)}
+
+    def test_delete(self, database):
+        cache = SQLiteCache(database)
+        cache.set('key', 'value')
+        cache.delete('key')
+        cache.delete('other')
+
+        assert 'key' not in cache
+        assert cache.size == 0
+
+    def test_clear_only_namespace(self, database):
+        pages = SQLiteCache(database, namespace='pages')
+        highlight = SQLiteCache(database, namespace='highlight')
+        pages.set('key', 'page')
+        highlight.set('key', 'code')
+        pages.clear()
+
+        assert len(pages) == 0
+        assert highlight.get('key') == 'code'
+
+    def test_evicts_by_entries(self, database):
+        cache = SQLiteCache(database, max_entries=2)
+
+        with patch.object(cache_utils, '_ACCESS_RESOLUTION', -1):
+            cache.set('first', 1)
+            cache.set('second', 2)
+            cache.get('first')
+            cache.set('third', 3)
+
+        assert 'first' in cache
+        assert 'second' not in cache
+        assert 'third' in cache
+        assert cache.evictions == 1
+
+    def test_evicts_by_bytes(self, database):
+        cache = SQLiteCache(database)
+        cache.set('first', 'a' * 100)
+        size = cache.size
+        bounded = SQLiteCache(database, max_bytes=size * 2)
+        bounded.set('second', 'b' * 100)
+        bounded.set('third', 'c' * 100)
+
+        assert 'first' not in bounded
+        assert len(bounded) == 2
+        assert bounded.size == size * 2
+
+    def test_does_not_cache_oversized_value(self, database):
+        cache = SQLiteCache(database, max_bytes=16)
+        cache.set('key', 'a' * 100)
+
+        assert 'key' not in cache
+
+    def test_shared_by_instances(self, database):
+        SQLiteCache(database, namespace='shared').set('key', 'value')
+
+        assert SQLiteCache(database, namespace='shared').get('key') == 'value'
+        assert SQLiteCache(database, namespace='other').get('key') is None
+
+    def test_shared_by_processes(self, database):
+        cache = SQLiteCache(database, namespace='shared')
+        context = get_context('spawn')
+        processes = [
+            context.Process(
+                target=_set_in_process,
+                args=(database, f'key-{index}', f'value-{index}')
+            )
+            for index in range(4)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join()
+
+        assert [cache.get(f'key-{index}') for index in range(4)] == [
+            'value-0',
+            'value-1',
+            'value-2',
+            'value-3',
+        ]
+
+    def test_locked_database(self, database, caplog):
+        cache = SQLiteCache(database, timeout=0.01)
+        cache.set('first', 'value')
+        blocker = connect(database, isolation_level=None)
+        blocker.execute('BEGIN IMMEDIATE')
+
+        try:
+            cache.set('second', 'value')
+
+            with patch('hydra.utils.cache_utils.time', return_value=1e12):
+                assert cache.get('first') == 'value'
+        finally:
+            blocker.execute('ROLLBACK')
+            blocker.close()
+
+        assert 'second' not in cache
+        assert 'Unable to write' in caplog.text
+        assert 'Unable to refresh' in caplog.text
+
+        cache.set('second', 'value')
+
+        assert cache.get('second') == 'value'
+
+    def test_failed_read(self, database, caplog):
+        cache = SQLiteCache(database)
+        cache.set('key', 'value')
+
+        with patch.object(
+            cache,
+            '_connection',
+            side_effect=OperationalError('disk I/O error')
+        ):
+            assert cache.get('key', 'default') == 'default'
+
+        assert cache.stats()['misses'] == 1
+        assert 'Unable to read' in caplog.text
+
+    def test_stats(self, database):
+        cache = SQLiteCache(database, max_entries=1)
+        cache.set('first', 'abc')
+        cache.get('first')
+        cache.get('second')
+        cache.set('second', 'de')
+
+        stats = cache.stats()
+
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['evictions'] == 1
+        assert stats['entries'] == 1
+        assert stats['bytes'] == cache.size > 0
+
+
+class TestCreateCache:
+    def test_memory_backend(self):
+        cache = create_cache(max_entries=1, sizeof=len)
+
+        assert isinstance(cache, LRUCache)
+        assert cache.max_entries == 1
+
+    def test_sqlite_backend(self, database):
+        cache = create_cache('sqlite', namespace='pages', path=database)
+
+        assert isinstance(cache, SQLiteCache)
+        assert cache.namespace == 'pages'
+
+    def test_sqlite_backend_without_path(self):
+        with pytest.raises(ValueError):
+            create_cache('sqlite')
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            create_cache('redis')
+
+
+class TestStableHash:
+    def test_equal_values(self):
+        assert stable_hash({'a': 1, 'b': [2, 3]}) == stable_hash({'b': [2, 3], 'a': 1})
+
+    def test_different_values(self):
+        assert stable_hash({'a': 1}) != stable_hash({'a': 2})
+
+    def test_unserializable_value(self):
+        assert stable_hash({'a': object()}) is None
+
+    def test_markup_value(self):
+        assert stable_hash({'a': [Markup('<b>')]}) is None
+        assert stable_hash({Markup('<b>'): 1}) is None
+        assert stable_hash({'a': ['<b>']}) is not None
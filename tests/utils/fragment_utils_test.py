@@ -0,0 +1,120 @@
+import pytest  # noqa: F401
+from os import listdir, utime
+from unittest.mock import patch
+
+from hydra.utils.fragment_utils import FragmentStore
+from hydra.utils.navigation_utils import Heading
+
+
+_KEY = 'ab' * 32
+_OTHER_KEY = 'cd' * 32
+_HEADINGS = (
+    Heading('Usage', '#usage', (Heading('Examples', '#examples'),)),
+    Heading('License', '#license'),
+)
+
+
+class TestFragmentStore:
+    def test_missing_fragment(self, tmp_path):
+        store = FragmentStore(str(tmp_path))
+
+        assert store.get(_KEY) is None
+        assert store.stats()['misses'] == 1
+
+    def test_round_trip(self, tmp_path):
+        store = FragmentStore(str(tmp_path))
+
+        store.set(_KEY, '<h2 id="usage">Usage</h2>', _HEADINGS)
+        html, headings = store.get(_KEY)
+
+        assert html == '<h2 id="usage">Usage</h2>'
+        assert headings == _HEADINGS
+        assert type(headings[0]) is Heading
+        assert type(headings[0].children[0]) is Heading
+
+    def test_shared_between_stores(self, tmp_path):
+        writer = FragmentStore(str(tmp_path))
+        reader = FragmentStore(str(tmp_path))
+
+        assert reader.get(_KEY) is None
+
+        writer.set(_KEY, '<p>First</p>', ())
+        writer.set(_OTHER_KEY, '<p>Second</p>', ())
+
+        assert reader.get(_KEY) == ('<p>First</p>', ())
+        assert reader.get(_OTHER_KEY) == ('<p>Second</p>', ())
+        assert reader.stats()['entries'] == 2
+
+    def test_replaced_fragment(self, tmp_path):
+        store = FragmentStore(str(tmp_path))
+
+        store.set(_KEY, '<p>First</p>', ())
+        store.set(_KEY, '<p>Second</p>', ())
+
+        assert FragmentStore(str(tmp_path)).get(_KEY) == ('<p>Second</p>', ())
+
+    def test_version_change(self, tmp_path):
+        FragmentStore(str(tmp_path), version='1').set(_KEY, '<p>Old</p>', ())
+        store = FragmentStore(str(tmp_path), version='2')
+
+        assert store.get(_KEY) is None
+
+    def test_versions_side_by_side(self, tmp_path):
+        old = FragmentStore(str(tmp_path), version='1')
+        new = FragmentStore(str(tmp_path), version='2')
+
+        old.set(_KEY, '<p>Old</p>', ())
+        new.set(_KEY, '<p>New</p>', ())
+
+        for _ in range(2):
+            assert old.get(_KEY) == ('<p>Old</p>', ())
+            assert new.get(_KEY) == ('<p>New</p>', ())
+
+        old.set(_OTHER_KEY, '<p>Old</p>', ())
+
+        assert new.get(_KEY) == ('<p>New</p>', ())
+        assert old.stats()['misses'] == new.stats()['misses'] == 0
+
+    def test_max_versions(self, tmp_path):
+        for modified, version in enumerate(['1', '2', '3']):
+            existing = set(listdir(tmp_path))
+
+            FragmentStore(str(tmp_path), version=version).set(_KEY, '', ())
+
+            for name in set(listdir(tmp_path)) - existing:
+                utime(tmp_path / name, (modified, modified))
+
+        FragmentStore(str(tmp_path), version='4', max_versions=2)
+
+        assert FragmentStore(str(tmp_path), version='3').get(_KEY) is not None
+        assert FragmentStore(str(tmp_path), version='2').get(_KEY) is None
+
+    def test_max_bytes(self, tmp_path):
+        store = FragmentStore(str(tmp_path), max_bytes=100)
+        reader = FragmentStore(str(tmp_path), max_bytes=100)
+
+        store.set(_KEY, 'a' * 60, ())
+
+        assert reader.get(_KEY) is not None
+
+        store.set(_OTHER_KEY, 'b' * 60, ())
+
+        assert store.get(_KEY) is None
+        assert store.get(_OTHER_KEY) == ('b' * 60, ())
+        assert reader.get(_KEY) is None
+        assert reader.get(_OTHER_KEY) == ('b' * 60, ())
+        assert store.stats()['bytes'] <= 100
+
+    def test_oversized_fragment(self, tmp_path):
+        store = FragmentStore(str(tmp_path), max_bytes=10)
+
+        store.set(_KEY, 'a' * 60, ())
+
+        assert store.get(_KEY) is None
+
+    def test_without_file_locks(self, tmp_path):
+        with patch('hydra.utils.fragment_utils.flock', None):
+            store = FragmentStore(str(tmp_path))
+            store.set(_KEY, '<p>First</p>', ())
+
+            assert store.get(_KEY) == ('<p>First</p>', ())
@@ -0,0 +1,183 @@
+import pytest
+from unittest.mock import patch
+
+from hydra import create_app
+from hydra.utils.highlight_utils import (
+    HighlightCache,
+    configure_highlight_cache,
+    get_highlight_cache,
+    highlight_code,
+    highlight_key,
+)
+
+
+_CODE = "recruiter = 'Star League'"
+
+
+@pytest.fixture
+def highlight_cache():
+    app = create_app()
+
+    with app.app_context():
+        yield configure_highlight_cache(app)
+
+
+class TestHighlightCache:
+    def test_memory_cache(self):
+        cache = HighlightCache()
+        cache.set('key', '<pre></pre>')
+
+        assert cache.get('key') == '<pre></pre>'
+        assert cache.get('other') is None
+        assert cache.stats()['hit_rate'] == 0.5
+
+    def test_disabled_memory_cache(self):
+        cache = HighlightCache(max_entries=0)
+        cache.set('key', '<pre></pre>')
+
+        assert cache.get('key') is None
+        assert cache.stats() == {'memory': None, 'disk': None, 'hit_rate': 0.0}
+
+    def test_shared_cache(self, tmp_path):
+        path = str(tmp_path / 'cache.sqlite')
+        HighlightCache(backend='sqlite', path=path).set('key', '<pre></pre>')
+
+        cache = HighlightCache(backend='sqlite', path=path)
+
+        assert cache.get('key') == '<pre></pre>'
+        assert cache.stats()['memory']['hits'] == 1
+
+    def test_disk_cache(self, tmp_path):
+        cache = HighlightCache(directory=str(tmp_path))
+        cache.set('key', '<pre></pre>')
+
+        restarted = HighlightCache(directory=str(tmp_path))
+
+        assert restarted.get('key') == '<pre></pre>'
+        assert restarted.stats()['disk']['hits'] == 1
+
+    def test_disk_cache_promotes_to_memory(self, tmp_path):
+        HighlightCache(directory=str(tmp_path)).set('key', '<pre></pre>')
+
+        cache = HighlightCache(directory=str(tmp_path))
+        cache.get('key')
+        cache.get('key')
+
+        assert cache.stats()['memory']['hits'] == 1
+        assert cache.stats()['disk']['hits'] == 1
+
+    def test_disk_cache_size_limit(self, tmp_path):
+        cache = HighlightCache(
+            max_entries=0,
+            directory=str(tmp_path),
+            max_disk_bytes=25
+        )
+
+        for index in range(5):
+            cache.set(f'key-{index}', '0123456789')
+
+        stats = cache.stats()['disk']
+
+        assert stats['bytes'] <= 25
+        assert stats['evictions'] == 3
+        assert cache.get('key-4') == '0123456789'
+
+    def test_disk_cache_replaced_entry(self, tmp_path):
+        cache = HighlightCache(
+            max_entries=0,
+            directory=str(tmp_path),
+            max_disk_bytes=20
+        )
+        cache.set('first', '0123456789')
+        cache.set('second', '012345678')
+        cache.set('second', '876543210')
+
+        stats = cache.stats()['disk']
+
+        assert stats['bytes'] == 19
+        assert stats['evictions'] == 0
+        assert cache.get('first') == '0123456789'
+
+    def test_disk_cache_shared_size_limit(self, tmp_path):
+        caches = [
+            HighlightCache(
+                max_entries=0,
+                directory=str(tmp_path),
+                max_disk_bytes=25
+            )
+            for _ in range(2)
+        ]
+
+        with patch('hydra.utils.highlight_utils._RESCAN_INTERVAL', 0):
+            for index in range(4):
+                caches[index % 2].set(f'key-{index}', '0123456789')
+
+        assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 25
+        assert caches[1].get('key-3') == '0123456789'
+
+    def test_disk_cache_failed_write(self, tmp_path):
+        cache = HighlightCache(max_entries=0, directory=str(tmp_path))
+
+        with patch(
+            'hydra.utils.highlight_utils.replace',
+            side_effect=OSError('failed')
+        ):
+            with pytest.raises(OSError):
+                cache.set('key', '0123456789')
+
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestHighlightCode:
+    def test_unknown_language(self, highlight_cache):
+        assert highlight_code(_CODE, 'not-a-language') is None
+
+    def test_highlighted_code(self, highlight_cache):
+        highlighted = highlight_code(_CODE, 'python', style='native')
+
+        assert highlighted.startswith('<div class="highlight">')
+
+    def test_reuses_highlighted_code(self, highlight_cache):
+        first = highlight_code(_CODE, 'python', style='native')
+
+        with patch('pygments.highlight') as mock:
+            second = highlight_code(_CODE, 'python', style='native')
+
+        mock.assert_not_called()
+        assert second == first
+        assert highlight_cache.stats()['hit_rate'] == 0.5
+
+
+class TestGetHighlightCache:
+    def test_cache_per_app(self):
+        first = create_app()
+        second = create_app()
+
+        with first.app_context():
+            cache = get_highlight_cache()
+
+        with second.app_context():
+            assert get_highlight_cache() is not cache
+
+        with first.app_context():
+            assert get_highlight_cache() is cache
+
+    def test_default_cache(self):
+        with create_app().app_context():
+            cache = get_highlight_cache()
+
+        assert get_highlight_cache() is not cache
+
+
+class TestHighlightKey:
+    def test_same_inputs(self):
+        assert highlight_key(_CODE, 'python', style='native') == highlight_key(_CODE, 'python', style='native')
+
+    def test_different_code(self):
+        assert highlight_key(_CODE, 'python') != highlight_key('pass', 'python')
+
+    def test_different_language(self):
+        assert highlight_key(_CODE, 'python') != highlight_key(_CODE, 'ruby')
+
+    def test_different_options(self):
+        assert highlight_key(_CODE, 'python', linenos=True) != highlight_key(_CODE, 'python', linenos=False)
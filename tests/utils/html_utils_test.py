@@ -5,7 +5,9 @@ from bs4 import BeautifulSoup
 from hydra.utils.html_utils import (
     add_header_ids,
     parse_headings,
+    process_headings,
 )
+from hydra.utils.navigation_utils import Heading
 
 
 class TestAddHeaderIds:
@@ -95,13 +97,35 @@ class TestAddHeaderIds:
 
         assert str(processed) == expected
 
+    def test_html_with_duplicate_headings(self):
+        raw_html = cleandoc(
+            """
+            <h2>Examples</h2>
+
+            <h3>Examples</h3>
+
+            <h2>Examples</h2>
+            """
+        )
+        fragment = BeautifulSoup(raw_html, features="html.parser")
+        processed = add_header_ids(fragment)
+        expected = cleandoc(
+            """
+            <h2 id="examples">Examples</h2>
+            <h3 id="examples-1">Examples</h3>
+            <h2 id="examples-2">Examples</h2>
+            """
+        )
+
+        assert str(processed) == expected
+
 
 class TestParseHeadings:
     def test_empty_string(self):
         raw_html = ''
         fragment = BeautifulSoup(raw_html)
 
-        assert parse_headings(fragment) == []
+        assert parse_headings(fragment) == ()
 
     def test_html_without_headings(self):
         raw_html = cleandoc(
@@ -113,7 +137,7 @@ class TestParseHeadings:
         )
         fragment = BeautifulSoup(raw_html, features="html.parser")
 
-        assert parse_headings(fragment) == []
+        assert parse_headings(fragment) == ()
 
     def test_html_with_flat_headings(self):
         raw_html = cleandoc(
@@ -132,18 +156,10 @@ class TestParseHeadings:
             """
         )
         fragment = BeautifulSoup(raw_html, features="html.parser")
-        expected = [
-            {
-                'label': 'Middle Heading',
-                'url': '#middle-heading',
-                'children': [],
-            },
-            {
-                'label': 'Final Heading',
-                'url': '#final-heading',
-                'children': [],
-            },
-        ]
+        expected = (
+            Heading('Middle Heading', '#middle-heading'),
+            Heading('Final Heading', '#final-heading'),
+        )
 
         assert parse_headings(fragment) == expected
 
@@ -176,34 +192,99 @@ class TestParseHeadings:
             """
         )
         fragment = BeautifulSoup(raw_html, features="html.parser")
-        expected = [
-            {
-                'label': 'Middle Heading',
-                'url': '#middle-heading',
-                'children': [
-                    {
-                        'label': 'Inner Heading',
-                        'url': '#inner-heading',
-                        'children': [],
-                    },
-                    {
-                        'label': 'Another Inner Heading',
-                        'url': '#another-inner-heading',
-                        'children': [
-                            {
-                                'label': 'Nested Heading',
-                                'url': '#nested-heading',
-                                'children': [],
-                            },
-                        ],
-                    },
-                ],
-            },
-            {
-                'label': 'Final Heading',
-                'url': '#final-heading',
-                'children': [],
-            },
-        ]
+        expected = (
+            Heading(
+                'Middle Heading',
+                '#middle-heading',
+                (
+                    Heading('Inner Heading', '#inner-heading'),
+                    Heading(
+                        'Another Inner Heading',
+                        '#another-inner-heading',
+                        (
+                            Heading('Nested Heading', '#nested-heading'),
+                        ),
+                    ),
+                ),
+            ),
+            Heading('Final Heading', '#final-heading'),
+        )
 
         assert parse_headings(fragment) == expected
+
+
+class TestProcessHeadings:
+    def test_empty_fragment(self):
+        fragment = BeautifulSoup('', features="html.parser")
+        processed, headings = process_headings(fragment)
+
+        assert str(processed) == ''
+        assert headings == ()
+
+    def test_html_with_nested_headings(self):
+        raw_html = cleandoc(
+            """
+            <h1>Top Heading</h1>
+
+            <p>Introductory paragraph.</p>
+
+            <h2>Middle Heading</h2>
+
+            <h3>Inner Heading</h3>
+
+            <blockquote><h3>Quoted Heading</h3></blockquote>
+
+            <h4>Nested Heading</h4>
+
+            <h2>Final Heading</h2>
+            """
+        )
+        fragment = BeautifulSoup(raw_html, features="html.parser")
+        processed, headings = process_headings(fragment)
+        expected_html = cleandoc(
+            """
+            <h1 id="top-heading">Top Heading</h1>
+            <p>Introductory paragraph.</p>
+            <h2 id="middle-heading">Middle Heading</h2>
+            <h3 id="inner-heading">Inner Heading</h3>
+            <blockquote><h3 id="quoted-heading">Quoted Heading</h3></blockquote>
+            <h4 id="nested-heading">Nested Heading</h4>
+            <h2 id="final-heading">Final Heading</h2>
+            """
+        )
+        expected_headings = (
+            Heading(
+                'Middle Heading',
+                '#middle-heading',
+                (
+                    Heading(
+                        'Inner Heading',
+                        '#inner-heading',
+                        (
+                            Heading('Nested Heading', '#nested-heading'),
+                        ),
+                    ),
+                ),
+            ),
+            Heading('Final Heading', '#final-heading'),
+        )
+
+        assert str(processed) == expected_html
+        assert headings == expected_headings
+        assert parse_headings(processed) == expected_headings
+
+    def test_html_with_duplicate_headings(self):
+        raw_html = cleandoc(
+            """
+            <h2>Examples</h2>
+
+            <h2>Examples</h2>
+            """
+        )
+        fragment = BeautifulSoup(raw_html, features="html.parser")
+        _, headings = process_headings(fragment)
+
+        assert headings == (
+            Heading('Examples', '#examples'),
+            Heading('Examples', '#examples-1'),
+        )
@@ -0,0 +1,121 @@
+import pytest  # noqa: F401
+from inspect import cleandoc
+from markdown import Markdown
+
+from hydra.utils.markdown_extensions import HeadingsExtension
+from hydra.utils.navigation_utils import Heading
+
+
+def _convert(document: str) -> tuple[str, tuple]:
+    converter = Markdown(extensions=[HeadingsExtension()])
+    rendered = converter.convert(document)
+
+    return rendered, converter.headings
+
+
+class TestHeadingsExtension:
+    def test_empty_document(self):
+        assert _convert('') == ('', ())
+
+    def test_document_without_headings(self):
+        rendered, headings = _convert('**Fake Heading**\n\nReal paragraph.')
+
+        assert rendered == cleandoc(
+            """
+            <p><strong>Fake Heading</strong></p>
+            <p>Real paragraph.</p>
+            """
+        )
+        assert headings == ()
+
+    def test_document_with_nested_headings(self):
+        document = cleandoc(
+            """
+            # Top Heading
+
+            Introductory paragraph.
+
+            ## Middle Heading
+
+            ### Inner Heading
+
+            ### Another *Inner* Heading
+
+            #### Nested `Heading`
+
+            ## Final Heading
+            """
+        )
+        expected = cleandoc(
+            """
+            <h1 id="top-heading">Top Heading</h1>
+            <p>Introductory paragraph.</p>
+            <h2 id="middle-heading">Middle Heading</h2>
+            <h3 id="inner-heading">Inner Heading</h3>
+            <h3 id="another-inner-heading">Another <em>Inner</em> Heading</h3>
+            <h4 id="nested-heading">Nested <code>Heading</code></h4>
+            <h2 id="final-heading">Final Heading</h2>
+            """
+        )
+        rendered, headings = _convert(document)
+
+        assert rendered == expected
+        assert headings == (
+            Heading(
+                'Middle Heading',
+                '#middle-heading',
+                (
+                    Heading('Inner Heading', '#inner-heading'),
+                    Heading(
+                        'Another Inner Heading',
+                        '#another-inner-heading',
+                        (
+                            Heading('Nested Heading', '#nested-heading'),
+                        ),
+                    ),
+                ),
+            ),
+            Heading('Final Heading', '#final-heading'),
+        )
+
+    def test_heading_with_entities(self):
+        rendered, headings = _convert('## Tom &amp; Jerry <em>Show</em>')
+
+        assert rendered == '<h2 id="tom--jerry-show">Tom &amp; Jerry <em>Show</em></h2>'
+        assert headings[0]['label'] == 'Tom & Jerry Show'
+
+    def test_nested_heading_ids(self):
+        rendered, headings = _convert('> ## Quoted Heading')
+
+        assert 'id="quoted-heading"' in rendered
+        assert headings == ()
+
+    def test_duplicate_headings(self):
+        rendered, headings = _convert('## Examples\n\n## Examples')
+
+        assert rendered == cleandoc(
+            """
+            <h2 id="examples">Examples</h2>
+            <h2 id="examples-1">Examples</h2>
+            """
+        )
+        assert [heading['url'] for heading in headings] == ['#examples', '#examples-1']
+
+    def test_raw_html_headings(self):
+        rendered, headings = _convert('## Usage\n\n<h2>Raw Heading</h2>')
+
+        assert '<h2>Raw Heading</h2>' in rendered
+        assert headings is None
+
+    def test_escaped_html_headings(self):
+        rendered, headings = _convert('## Usage\n\n`<h2>` tags')
+
+        assert 'id="usage"' in rendered
+        assert [heading['label'] for heading in headings] == ['Usage']
+
+    def test_reset(self):
+        converter = Markdown(extensions=[HeadingsExtension()])
+        converter.convert('## Heading')
+        converter.reset()
+
+        assert converter.headings == ()
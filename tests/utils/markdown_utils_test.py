@@ -1,7 +1,56 @@
-import pytest  # noqa: F401
+import pytest
 from inspect import cleandoc
+from threading import Thread
+from unittest.mock import patch
 
-from hydra.utils.markdown_utils import process_fenced_code_blocks
+from hydra import create_app
+from hydra.utils import markdown_utils
+from hydra.utils.markdown_utils import (
+    CodeSegment,
+    TextSegment,
+    configure_markdown,
+    configure_parallel_highlighting,
+    convert_document,
+    get_converter,
+    get_converter_generation,
+    iter_fenced_segments,
+    process_fenced_code_blocks,
+)
+
+
+def _generate_document(count: int) -> str:
+    sections = []
+
+    for index in range(count):
+        language = ['python', 'ruby', '', 'not-a-language'][index % 4]
+        sections.append(
+            f"## Example {index}\n\n```{language}\nvalue = {index}\n```"
+        )
+
+    return '\n\n'.join(sections)
+
+
+@pytest.fixture
+def with_tables_extension():
+    config = {'HYDRA_MARKDOWN_EXTENSIONS': ['tables']}
+    app = create_app(injected_config=config)
+
+    with app.app_context():
+        yield app
+
+
+@pytest.fixture(params=['thread', 'process'])
+def with_parallel_highlighting(request):
+    config = {
+        'HYDRA_HIGHLIGHT_EXECUTOR': request.param,
+        'HYDRA_HIGHLIGHT_WORKERS': 2,
+        'HYDRA_HIGHLIGHT_PARALLEL_MIN_BLOCKS': 4,
+        'HYDRA_HIGHLIGHT_PARALLEL_MIN_BYTES': 0,
+    }
+    app = create_app(injected_config=config)
+
+    with app.app_context():
+        yield app
 
 
 class TestProcessFencedCodeBlocks:
@@ -90,3 +139,250 @@ class TestProcessFencedCodeBlocks:
         ) + '\n'
 
         assert process_fenced_code_blocks(document) == expected
+
+    def test_unknown_language_block(self):
+        document = cleandoc(
+            """
+            # Greetings, Starfighter!
+
+            ```not-a-language
+            recruiter = 'Star League'
+            ```
+            """
+        )
+        expected = cleandoc(
+            """
+            # Greetings, Starfighter!
+
+            <pre><code>recruiter = 'Star League'</code></pre>
+            """
+        )
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_inline_code_with_backticks(self):
+        document = cleandoc(
+            """
+            Use ```inline code``` in a sentence.
+
+            ```
+            recruiter = 'Star League'
+            ```
+            """
+        )
+        expected = cleandoc(
+            """
+            Use ```inline code``` in a sentence.
+
+            <pre><code>recruiter = 'Star League'</code></pre>
+            """
+        )
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_tilde_fence(self):
+        document = cleandoc(
+            """
+            ~~~
+            recruiter = 'Star League'
+            ```
+            ~~~
+            """
+        )
+        expected = cleandoc(
+            """
+            <pre><code>recruiter = 'Star League'
+            ```</code></pre>
+            """
+        )
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_long_backtick_fence(self):
+        document = cleandoc(
+            """
+            ````
+            ```
+            nested fence
+            ```
+            ````
+            """
+        )
+        expected = cleandoc(
+            """
+            <pre><code>```
+            nested fence
+            ```</code></pre>
+            """
+        )
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_indented_fence(self):
+        document = '- Item\n\n    ```\n    recruiter = 1\n      indented = 2\n    ```\n'
+        expected = '- Item\n\n<pre><code>recruiter = 1\n  indented = 2</code></pre>'
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_unclosed_fence(self):
+        document = 'Text\n```\nrecruiter = 1\n'
+        expected = 'Text\n<pre><code>recruiter = 1</code></pre>'
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_empty_code_block(self):
+        assert process_fenced_code_blocks('```\n```') == '<pre><code></code></pre>'
+
+    def test_trailing_line_break(self):
+        document = 'Text\n```\nrecruiter = 1\n```\nMore text\n'
+        expected = 'Text\n<pre><code>recruiter = 1</code></pre>\nMore text'
+
+        assert process_fenced_code_blocks(document) == expected
+
+    def test_windows_line_endings(self):
+        document = '```python\r\na = 1\r\nb = 2\r\n```\r\n'
+
+        assert '\r' not in process_fenced_code_blocks(document)
+
+
+class TestIterFencedSegments:
+    def test_empty_document(self):
+        assert list(iter_fenced_segments('')) == []
+
+    def test_text_document(self):
+        document = 'Greetings, Starfighter!\n'
+
+        assert list(iter_fenced_segments(document)) == [TextSegment(document)]
+
+    def test_document_with_code_blocks(self):
+        document = cleandoc(
+            """
+            # Greetings, Starfighter!
+
+            ```python title="example.py"
+            recruiter = 'Star League'
+            ```
+            ~~~
+            defend = 'the frontier'
+            ~~~
+
+            The end.
+            """
+        )
+
+        assert list(iter_fenced_segments(document)) == [
+            TextSegment('# Greetings, Starfighter!\n\n'),
+            CodeSegment("recruiter = 'Star League'", 'python'),
+            TextSegment('\n'),
+            CodeSegment("defend = 'the frontier'", ''),
+            TextSegment('\n\nThe end.'),
+        ]
+
+    def test_windows_line_endings(self):
+        document = 'Text\r\n```python\r\na = 1\r\nb = 2\r\n```\r\nMore'
+
+        assert list(iter_fenced_segments(document)) == [
+            TextSegment('Text\r\n'),
+            CodeSegment('a = 1\nb = 2', 'python'),
+            TextSegment('\nMore'),
+        ]
+
+    def test_unclosed_windows_line_endings(self):
+        document = '```\r\na = 1\r\n'
+
+        assert list(iter_fenced_segments(document)) == [
+            CodeSegment('a = 1', ''),
+        ]
+
+    def test_is_lazy(self):
+        segments = iter_fenced_segments('Text\n```\ncode\n```\nMore text')
+
+        assert next(segments) == TextSegment('Text\n')
+
+
+class TestParallelHighlighting:
+    def test_large_document(self, with_parallel_highlighting):
+        document = _generate_document(12)
+        processed = process_fenced_code_blocks(document)
+
+        configure_parallel_highlighting(with_parallel_highlighting)
+
+        assert processed == process_fenced_code_blocks(document)
+
+    def test_small_document(self, with_parallel_highlighting):
+        document = _generate_document(2)
+
+        with patch('hydra.utils.markdown_utils.highlight_many') as mock:
+            process_fenced_code_blocks(document)
+
+        mock.assert_not_called()
+
+    def test_invalid_executor(self):
+        with pytest.raises(ValueError):
+            configure_parallel_highlighting(create_app(), executor='fiber')
+
+
+class TestConvertDocument:
+    def test_converts_document(self):
+        assert convert_document('*Grig*') == ('<p><em>Grig</em></p>', ())
+
+    def test_headings(self):
+        html, headings = convert_document('## Heading', headings=True)
+
+        assert html == '<h2 id="heading">Heading</h2>'
+        assert headings[0]['label'] == 'Heading'
+
+    def test_releases_document_state(self):
+        convert_document('<div>\nraw\n</div>')
+        converter = markdown_utils._default_converters.local.converters[False]
+
+        assert converter.htmlStash.rawHtmlBlocks == []
+
+
+class TestGetConverter:
+    def test_reuses_converter(self):
+        assert get_converter() is get_converter()
+
+    def test_headings_converter(self):
+        converter = get_converter(headings=True)
+
+        assert converter is not get_converter()
+        assert converter.convert('## Heading') == '<h2 id="heading">Heading</h2>'
+        assert converter.headings[0]['label'] == 'Heading'
+
+    def test_resets_converter(self):
+        get_converter().convert('[star]: https://example.com/star-league')
+
+        assert get_converter().convert('[star]') == '<p>[star]</p>'
+
+    def test_converter_per_thread(self):
+        converters = []
+        thread = Thread(target=lambda: converters.append(get_converter()))
+        thread.start()
+        thread.join()
+
+        assert converters[0] is not get_converter()
+
+    def test_configured_extensions(self, with_tables_extension):
+        document = '| Name |\n| ---- |\n| Grig |'
+
+        assert '<table>' in get_converter().convert(document)
+
+    def test_reconfigured_extensions(self, with_tables_extension):
+        converter = get_converter()
+        generation = get_converter_generation()
+
+        configure_markdown(with_tables_extension)
+
+        assert get_converter() is not converter
+        assert get_converter_generation() != generation
+
+    def test_extensions_per_app(self, with_tables_extension):
+        document = '| Name |\n| ---- |\n| Grig |'
+        converter = get_converter()
+
+        with create_app().app_context():
+            assert '<table>' not in get_converter().convert(document)
+
+        assert get_converter() is converter
+        assert '<table>' in converter.convert(document)
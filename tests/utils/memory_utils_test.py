@@ -0,0 +1,93 @@
+import pytest
+import tracemalloc
+from bs4 import BeautifulSoup
+
+from hydra import create_app
+from hydra.utils.memory_utils import MemoryReport, profile_memory
+from hydra.utils.render_utils import parse_markdown
+from hydra.utils.timing_utils import timed
+
+
+_retained = []
+
+
+def _allocate(size: int) -> bytes:
+    with timed('outer'):
+        with timed('inner'):
+            data = bytes(size)
+
+        with timed('kept'):
+            _retained.append(bytes(size))
+
+    return data
+
+
+@pytest.fixture
+def retained():
+    yield _retained
+
+    _retained.clear()
+
+
+class TestProfileMemory:
+    def test_stages(self, retained):
+        report = profile_memory(_allocate, 100000)
+
+        assert report.stages['inner'].calls == 1
+        assert report.stages['inner'].peak >= 100000
+        assert report.stages['inner'].retained >= 100000
+        assert report.stages['outer'].peak >= 200000
+        assert report.stages['kept'].retained >= 100000
+        assert 100000 <= report.retained < 200000
+        assert report.peak >= 200000
+
+    def test_leaks(self, retained):
+        report = profile_memory(_allocate, 100000)
+        location, size, count = report.leaks[0]
+
+        assert location.endswith('memory_utils_test.py:20')
+        assert size >= 100000
+
+    def test_surviving_objects(self, retained):
+        report = profile_memory(
+            lambda: retained.append(BeautifulSoup('<p>a</p>', 'html.parser'))
+        )
+
+        assert report.objects['bs4.BeautifulSoup'] == 1
+        assert report.objects['bs4.element.Tag'] == 1
+
+    def test_released_objects(self):
+        report = profile_memory(BeautifulSoup, '<p>a</p>', 'html.parser')
+
+        assert report.objects == {}
+
+    def test_restores_tracing(self):
+        profile_memory(bytes, 10)
+
+        assert not tracemalloc.is_tracing()
+
+    def test_parse_markdown(self):
+        with create_app().app_context():
+            parse_markdown('mocks/markdown_template.md', name='Grig')
+            report = profile_memory(
+                parse_markdown,
+                'mocks/markdown_template.md',
+                name='Grig'
+            )
+
+        assert list(report.stages) == [
+            'jinja',
+            'fences',
+            'markdown',
+            'parse',
+            'postprocess',
+        ]
+        assert report.objects == {}
+
+    def test_to_dict(self, retained):
+        report = profile_memory(_allocate, 10)
+        values = report.to_dict()
+
+        assert isinstance(report, MemoryReport)
+        assert values['stages']['inner']['calls'] == 1
+        assert set(values['leaks'][0]) == {'location', 'size', 'count'}
@@ -0,0 +1,106 @@
+import pytest
+from jinja2 import Environment
+
+from hydra.utils.navigation_utils import Heading, build_headings
+
+
+class TestHeading:
+    def test_fields(self):
+        heading = Heading('Examples', '#examples')
+
+        assert heading.label == 'Examples'
+        assert heading.url == '#examples'
+        assert heading.children == ()
+
+    def test_item_access(self):
+        heading = Heading('Examples', '#examples')
+
+        assert heading['label'] == 'Examples'
+        assert heading['url'] == '#examples'
+        assert heading['children'] == ()
+        assert heading[0] == 'Examples'
+
+        with pytest.raises(KeyError):
+            heading['missing']
+
+    def test_dict_compatibility(self):
+        heading = Heading('Usage', '#usage', (Heading('Examples', '#examples'),))
+
+        assert 'label' in heading
+        assert 'missing' not in heading
+        assert heading.get('url') == '#usage'
+        assert heading.get('missing', 'default') == 'default'
+        assert dict(heading)['label'] == 'Usage'
+        assert heading.to_dict() == {
+            'label': 'Usage',
+            'url': '#usage',
+            'children': [
+                {'label': 'Examples', 'url': '#examples', 'children': []},
+            ],
+        }
+
+    def test_hashable(self):
+        first = Heading('Usage', '#usage', (Heading('Examples', '#examples'),))
+        second = Heading('Usage', '#usage', (Heading('Examples', '#examples'),))
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert len({first, second}) == 1
+
+    def test_template(self):
+        environment = Environment()
+        template = environment.from_string(
+            '{% for item in navigation %}'
+            '{{ item.label }}={{ item["url"] }}'
+            '{% for child in item.children %};{{ child.label }}{% endfor %}'
+            '{% endfor %}'
+        )
+        navigation = (
+            Heading('Usage', '#usage', (Heading('Examples', '#examples'),)),
+        )
+
+        assert template.render(navigation=navigation) == (
+            'Usage=#usage;Examples'
+        )
+
+
+class TestBuildHeadings:
+    def test_empty(self):
+        assert build_headings([]) == ()
+
+    def test_nested(self):
+        headings = build_headings([
+            (1, 'Usage', '#usage'),
+            (2, 'Examples', '#examples'),
+            (3, 'Basic', '#basic'),
+            (2, 'Options', '#options'),
+            (1, 'License', '#license'),
+        ])
+
+        assert headings == (
+            Heading(
+                'Usage',
+                '#usage',
+                (
+                    Heading(
+                        'Examples',
+                        '#examples',
+                        (Heading('Basic', '#basic'),),
+                    ),
+                    Heading('Options', '#options'),
+                ),
+            ),
+            Heading('License', '#license'),
+        )
+
+    def test_missing_levels(self):
+        headings = build_headings([
+            (3, 'Deep', '#deep'),
+            (1, 'Usage', '#usage'),
+            (3, 'Examples', '#examples'),
+        ])
+
+        assert headings == (
+            Heading('Deep', '#deep'),
+            Heading('Usage', '#usage', (Heading('Examples', '#examples'),)),
+        )
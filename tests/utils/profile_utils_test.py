@@ -0,0 +1,116 @@
+import pytest
+from cProfile import Profile
+from os import listdir
+from pstats import Stats
+from unittest.mock import patch
+
+from hydra import create_app
+from hydra.utils.profile_utils import PROFILE_HEADER, collapse_stacks
+
+
+def _leaf():
+    return sum(range(1000))
+
+
+def _branch():
+    return _leaf() + _leaf()
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    return tmp_path / 'profiles'
+
+
+def _create_app(profiles, **config):
+    app = create_app(injected_config={
+        'HYDRA_PROFILE': True,
+        'HYDRA_PROFILE_DIR': str(profiles),
+        'HYDRA_PROFILE_TOKEN': 'secret',
+        **config,
+    })
+
+    @app.route('/fail')
+    def fail():
+        raise RuntimeError('failed')
+
+    return app
+
+
+class TestInitProfiling:
+    def test_disabled_by_default(self):
+        app = create_app()
+        response = app.test_client().get('/', headers={PROFILE_HEADER: 'secret'})
+
+        assert PROFILE_HEADER not in response.headers
+        assert 'hydra.profiler' not in app.extensions
+
+    def test_authorized_request(self, profiles):
+        app = _create_app(profiles)
+        response = app.test_client().get('/', headers={PROFILE_HEADER: 'secret'})
+        name = response.headers[PROFILE_HEADER]
+
+        assert name.endswith('-index')
+        assert sorted(listdir(profiles)) == [f'{name}.collapsed', f'{name}.prof']
+        assert Stats(str(profiles / f'{name}.prof')).total_calls > 0
+
+    def test_unauthorized_request(self, profiles):
+        app = _create_app(profiles)
+        client = app.test_client()
+
+        assert PROFILE_HEADER not in client.get('/').headers
+        assert PROFILE_HEADER not in client.get('/', headers={PROFILE_HEADER: 'guess'}).headers
+        assert not profiles.exists()
+
+    def test_missing_token(self, profiles):
+        app = _create_app(profiles, HYDRA_PROFILE_TOKEN=None)
+        response = app.test_client().get('/', headers={PROFILE_HEADER: ''})
+
+        assert PROFILE_HEADER not in response.headers
+
+    def test_sampled_requests(self, profiles):
+        app = _create_app(profiles, HYDRA_PROFILE_SAMPLE_RATE=0.5)
+        client = app.test_client()
+
+        with patch('hydra.utils.profile_utils.random', side_effect=[0.2, 0.8]):
+            assert PROFILE_HEADER in client.get('/').headers
+            assert PROFILE_HEADER not in client.get('/').headers
+
+    def test_failed_request(self, profiles):
+        app = _create_app(profiles)
+        response = app.test_client().get('/fail', headers={PROFILE_HEADER: 'secret'})
+
+        assert response.status_code == 500
+        assert sorted(name.split('-', 1)[1] for name in listdir(profiles)) == [
+            'fail.collapsed',
+            'fail.prof',
+        ]
+
+    def test_bounded_directory(self, profiles):
+        app = _create_app(profiles, HYDRA_PROFILE_MAX_FILES=2)
+        client = app.test_client()
+        names = [
+            client.get('/', headers={PROFILE_HEADER: 'secret'}).headers[PROFILE_HEADER]
+            for _ in range(3)
+        ]
+
+        assert sorted(listdir(profiles)) == sorted(
+            f'{name}{extension}'
+            for name in names[1:]
+            for extension in ('.prof', '.collapsed')
+        )
+
+
+class TestCollapseStacks:
+    def test_stacks(self):
+        profile = Profile()
+        profile.enable()
+        _branch()
+        profile.disable()
+
+        lines = collapse_stacks(Stats(profile))
+        stacks = {line.rsplit(' ', 1)[0]: int(line.rsplit(' ', 1)[1]) for line in lines}
+        leaf = [stack for stack in stacks if stack.split(';')[-1].startswith('_leaf ')]
+
+        assert len(leaf) == 1
+        assert leaf[0].split(';')[-2].startswith('_branch (profile_utils_test.py:')
+        assert all(count > 0 for count in stacks.values())
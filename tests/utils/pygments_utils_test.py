@@ -0,0 +1,82 @@
+import pytest  # noqa: F401
+from threading import Thread
+from unittest.mock import patch
+
+from hydra.utils import pygments_utils
+from hydra.utils.pygments_utils import (
+    get_formatter,
+    get_lexer,
+    preload_lexers,
+)
+
+
+class TestGetFormatter:
+    def test_formatter_options(self):
+        formatter = get_formatter(linenos=False, style='native')
+
+        assert formatter.style.__name__ == 'NativeStyle'
+
+    def test_reuses_formatter(self):
+        formatter = get_formatter(linenos=False, style='native')
+
+        assert get_formatter(style='native', linenos=False) is formatter
+
+    def test_different_options(self):
+        formatter = get_formatter(linenos=False, style='native')
+
+        assert get_formatter(linenos=True, style='native') is not formatter
+
+
+class TestGetLexer:
+    def test_known_language(self):
+        lexer = get_lexer('python')
+
+        assert lexer.name == 'Python'
+        assert lexer.stripall is True
+
+    def test_reuses_lexer(self):
+        assert get_lexer('python') is get_lexer('python')
+
+    def test_unknown_language(self):
+        assert get_lexer('not-a-language') is None
+
+    def test_caches_unknown_language(self):
+        get_lexer('still-not-a-language')
+
+        with patch.object(pygments_utils, '_find_lexer_class') as mock:
+            assert get_lexer('still-not-a-language') is None
+
+        mock.assert_not_called()
+
+    def test_lexer_per_thread(self):
+        lexer = get_lexer('http')
+        lexers = []
+        thread = Thread(target=lambda: lexers.append(get_lexer('http')))
+
+        thread.start()
+        thread.join()
+
+        assert lexers[0] is not lexer
+        assert type(lexers[0]) is type(lexer)
+        assert lexers[0].stripall is True
+
+    def test_resolves_class_once(self):
+        get_lexer('python')
+
+        with patch.object(pygments_utils, '_find_lexer_class') as mock:
+            thread = Thread(target=get_lexer, args=('python',))
+            thread.start()
+            thread.join()
+
+        mock.assert_not_called()
+
+
+class TestPreloadLexers:
+    def test_preloads_languages(self):
+        preload_lexers(['ruby', 'javascript'])
+
+        with patch.object(pygments_utils, '_find_lexer_class') as mock:
+            get_lexer('ruby')
+            get_lexer('javascript')
+
+        mock.assert_not_called()
@@ -1,5 +1,7 @@
 import pytest
+from gzip import decompress
 from inspect import cleandoc
+from sys import getsizeof
 from typing import Any
 from unittest.mock import patch
 from bs4 import BeautifulSoup
@@ -9,7 +11,12 @@ from markupsafe import Markup
 
 from hydra import create_app
 from hydra.utils.render_utils import (
+    convert_markdown,
+    page_cache_key,
+    page_cache_stats,
     parse_markdown,
+    render_cached_page,
+    render_many,
     render_markdown,
     render_page,
 )
@@ -76,10 +83,48 @@ def with_app_context():
 
 @pytest.fixture
 def with_mocked_rendering():
-    with patch('flask.render_template', side_effect=_mock_render_template):
+    with patch('flask.render_template', side_effect=_mock_render_template) as mock:
+        yield mock
+
+
+@pytest.fixture
+def with_tree_engine_app_context():
+    config = {'HYDRA_MARKDOWN_ENGINE': 'tree'}
+
+    with create_app(injected_config=config).app_context():
+        yield
+
+
+@pytest.fixture
+def with_uncached_app_context():
+    config = {
+        'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+        'HYDRA_NAVIGATION_CACHE_MAX_ENTRIES': 0,
+    }
+
+    with create_app(injected_config=config).app_context():
         yield
 
 
+class TestConvertMarkdown:
+    def test_engines_match(self, with_app_context):
+        document = '# Title\n\n## Usage\n\nText\n\n## Usage'
+
+        assert convert_markdown(document, 'tree') == convert_markdown(document, 'soup')
+
+    def test_raw_html_headings(self, with_app_context):
+        document = '## Usage\n\n<h2>Raw Heading</h2>\n\nText'
+        html, headings = convert_markdown(document, 'tree')
+
+        assert (html, headings) == convert_markdown(document, 'soup')
+        assert '<h2 id="raw-heading">Raw Heading</h2>' in html
+        assert [heading.label for heading in headings] == ['Usage', 'Raw Heading']
+
+    def test_invalid_engine(self, with_app_context):
+        with pytest.raises(ValueError):
+            convert_markdown('# Title', 'regex')
+
+
 class TestParseMarkdown:
     def test_invalid_template(self, with_app_context):
         with pytest.raises(TemplateNotFound):
@@ -215,6 +260,45 @@ class TestRenderMarkdown:
         assert type(rendered) is Markup
         assert rendered == expected
 
+    def test_tree_engine_markdown_template(self, with_tree_engine_app_context):
+        rendered = render_markdown(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+        expected = cleandoc(
+            """
+            <h1 id="greetings-starfighter">Greetings, Starfighter!</h1>
+            <p>You have been recruited by the Star League to defend the
+            frontier against Xur and the Ko-Dan Armada.</p>
+            <h2 id="characters">Characters</h2>
+            <h3 id="the-partner">The Partner</h3>
+            <p>Grig</p>
+            <h3 id="the-recruiter">The Recruiter</h3>
+            <p>Centauri</p>
+            """
+        )
+
+        assert type(rendered) is Markup
+        assert rendered == expected
+
+    def test_tree_engine_highlighted_code_block_template(self, with_tree_engine_app_context):
+        rendered = render_markdown(
+            'mocks/highlighted_code_block_template.md',
+            name='Starfighter'
+        )
+        expected = cleandoc(
+            """
+            <h1 id="greetings-starfighter">Greetings, Starfighter!</h1>
+            <div class="highlight"><pre><span></span><span class="n">recruiter</span> <span class="o">=</span> <span class="s1">&#39;Star League&#39;</span>
+            <span class="n">defend</span> <span class="o">=</span> <span class="s1">&#39;the frontier&#39;</span>
+            <span class="n">enemies</span> <span class="o">=</span> <span class="s1">&#39;Xur and the Ko-Dan Armada&#39;</span>
+            </pre></div>
+            """
+        )
+
+        assert type(rendered) is Markup
+        assert rendered == expected
+
 
 class TestRenderPage:
     def test_invalid_template(self, with_app_context):
@@ -286,3 +370,330 @@ class TestRenderPage:
         pretty = BeautifulSoup(rendered, features="html.parser").prettify()
 
         assert pretty == expected
+
+    def test_tree_engine_markdown_template(self, with_tree_engine_app_context, with_mocked_rendering):
+        rendered = render_page(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+        with create_app().app_context():
+            expected = render_page(
+                'mocks/markdown_template.md',
+                name='Starfighter'
+            )
+
+        assert rendered == expected
+
+    def test_cached_page(self, with_app_context, with_mocked_rendering):
+        first = render_page('mocks/markdown_template.md', name='Starfighter')
+        call_count = with_mocked_rendering.call_count
+        second = render_page('mocks/markdown_template.md', name='Starfighter')
+
+        assert second == first
+        assert with_mocked_rendering.call_count == call_count
+        stats = page_cache_stats()
+
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['entries'] == 1
+
+    def test_cached_page_with_other_context(self, with_app_context, with_mocked_rendering):
+        first = render_page('mocks/markdown_template.md', name='Starfighter')
+        second = render_page('mocks/markdown_template.md', name='Centauri')
+
+        assert second != first
+        assert page_cache_stats()['misses'] == 2
+
+    def test_uncacheable_context(self, with_app_context, with_mocked_rendering):
+        render_page('mocks/markdown_template.md', name=object())
+
+        assert page_cache_stats()['entries'] == 0
+
+    def test_disabled_cache(self, with_uncached_app_context, with_mocked_rendering):
+        render_page('mocks/markdown_template.md', name='Starfighter')
+        call_count = with_mocked_rendering.call_count
+        render_page('mocks/markdown_template.md', name='Starfighter')
+
+        assert with_mocked_rendering.call_count == 2 * call_count
+        assert page_cache_stats() == {}
+
+
+class TestNavigationCache:
+    def test_same_outline(self, with_app_context, with_mocked_rendering):
+        render_page('mocks/markdown_template.md', name='Starfighter')
+        render_page('mocks/markdown_template.md', name='Centauri')
+        navigation_calls = [
+            call
+            for call in with_mocked_rendering.call_args_list
+            if call.args[0] == 'page/navigation.html'
+        ]
+
+        assert len(navigation_calls) == 1
+
+    def test_changed_navigation_template(self, with_mocked_rendering):
+        app = create_app()
+
+        with app.app_context():
+            first = render_page('mocks/markdown_template.md', name='Grig')
+
+            with patch(
+                'hydra.utils.render_utils.template_digest',
+                return_value='changed'
+            ):
+                render_page('mocks/markdown_template.md', name='Alex')
+
+        navigation_calls = [
+            call
+            for call in with_mocked_rendering.call_args_list
+            if call.args[0] == 'page/navigation.html'
+        ]
+
+        assert len(navigation_calls) == 2
+        assert '<ul class="navigation">' in first
+
+
+class TestFragmentCache:
+    def test_warm_start(self, tmp_path, with_mocked_rendering):
+        config = {
+            'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path),
+            'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0,
+        }
+
+        with create_app(injected_config=config).app_context():
+            first = render_page('mocks/markdown_template.md', name='Grig')
+
+        with create_app(injected_config=config).app_context():
+            with patch('hydra.utils.render_utils.convert_markdown') as mock:
+                second = render_page('mocks/markdown_template.md', name='Grig')
+
+        assert second == first
+        assert not mock.called
+
+    def test_parse_markdown(self, tmp_path):
+        config = {'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path)}
+
+        with create_app(injected_config=config).app_context():
+            first = parse_markdown(
+                'mocks/highlighted_code_block_template.md',
+                name='Grig'
+            )
+
+        with create_app(injected_config=config).app_context():
+            with patch('hydra.utils.render_utils.convert_fragment') as mock:
+                second = parse_markdown(
+                    'mocks/highlighted_code_block_template.md',
+                    name='Grig'
+                )
+
+        assert type(second) is BeautifulSoup
+        assert str(second) == str(first)
+        assert not mock.called
+
+    def test_other_context(self, tmp_path):
+        config = {'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path)}
+
+        with create_app(injected_config=config).app_context():
+            first = render_markdown('mocks/markdown_template.md', name='Grig')
+            second = render_markdown('mocks/markdown_template.md', name='Alex')
+
+        assert 'Grig' in first
+        assert 'Alex' in second
+
+    def test_other_engine(self, tmp_path):
+        rendered = []
+
+        for engine in ('soup', 'tree'):
+            config = {
+                'HYDRA_FRAGMENT_CACHE_DIR': str(tmp_path),
+                'HYDRA_MARKDOWN_ENGINE': engine,
+            }
+
+            with create_app(injected_config=config).app_context():
+                with patch(
+                    'hydra.utils.render_utils.convert_markdown',
+                    return_value=(engine, ())
+                ):
+                    rendered.append(
+                        render_markdown('mocks/markdown_template.md')
+                    )
+
+        assert rendered == ['soup', 'tree']
+
+
+class TestSharedPageCache:
+    def test_shared_by_apps(self, tmp_path, with_mocked_rendering):
+        config = {
+            'HYDRA_CACHE_BACKEND': 'sqlite',
+            'HYDRA_CACHE_PATH': str(tmp_path / 'cache.sqlite'),
+        }
+
+        with create_app(injected_config=config).app_context():
+            first = render_cached_page('mocks/markdown_template.md', name='Grig')
+
+        with create_app(injected_config=config).app_context():
+            with patch('hydra.utils.render_utils._render_page') as mock:
+                second = render_cached_page('mocks/markdown_template.md', name='Grig')
+
+            stats = page_cache_stats()
+
+        assert second.html == first.html
+        assert second.gzip == first.gzip
+        assert not mock.called
+        assert stats['hits'] == 1
+        assert stats['entries'] == 1
+
+
+class TestRenderCachedPage:
+    def test_compressed_copy(self, with_app_context, with_mocked_rendering):
+        page = render_cached_page(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+        assert decompress(page.gzip).decode() == page.html
+        assert render_cached_page(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        ) is page
+
+    def test_size_includes_compressed_copy(self, with_app_context, with_mocked_rendering):
+        page = render_cached_page('mocks/markdown_template.md')
+
+        assert page_cache_stats()['bytes'] == getsizeof(page)
+        assert getsizeof(page) > getsizeof(page.html) + len(page.gzip)
+
+    def test_disabled_compression(self, with_mocked_rendering):
+        config = {'HYDRA_PAGE_GZIP_LEVEL': None}
+
+        with create_app(injected_config=config).app_context():
+            page = render_cached_page('mocks/markdown_template.md')
+
+        assert page.gzip is None
+        assert page.html.startswith('<ul class="navigation">')
+
+    def test_uncached_page(self, with_uncached_app_context, with_mocked_rendering):
+        page = render_cached_page('mocks/markdown_template.md')
+
+        assert page.gzip is None
+
+
+class TestRenderMany:
+    def test_pages(self, with_app_context, with_mocked_rendering):
+        pairs = [
+            ('mocks/markdown_template.md', {'name': 'Starfighter'}),
+            ('mocks/code_block_template.md', None),
+        ]
+
+        assert list(render_many(pairs)) == [
+            (0, render_page('mocks/markdown_template.md', name='Starfighter')),
+            (1, render_page('mocks/code_block_template.md')),
+        ]
+
+    def test_identical_pairs(self, with_uncached_app_context, with_mocked_rendering):
+        render_page('mocks/markdown_template.md', name='Starfighter')
+        call_count = with_mocked_rendering.call_count
+        pairs = [
+            ('mocks/markdown_template.md', {'name': 'Starfighter'}),
+            ('mocks/markdown_template.md', {'name': 'Centauri'}),
+            ('mocks/markdown_template.md', {'name': 'Starfighter'}),
+        ]
+        results = list(render_many(pairs))
+
+        assert [index for index, _ in results] == [0, 2, 1]
+        assert results[0][1] == results[1][1] != results[2][1]
+        assert with_mocked_rendering.call_count == 3 * call_count
+
+    def test_unhashable_context(self, with_uncached_app_context, with_mocked_rendering):
+        render_page('mocks/markdown_template.md')
+        call_count = with_mocked_rendering.call_count
+        context = {'name': object()}
+        pairs = [
+            ('mocks/markdown_template.md', context),
+            ('mocks/markdown_template.md', context),
+        ]
+
+        assert [index for index, _ in render_many(pairs)] == [0, 1]
+        assert with_mocked_rendering.call_count == 3 * call_count
+
+    def test_failed_page(self, with_app_context, with_mocked_rendering):
+        pairs = [('mocks/missing_template.md', None)]
+
+        with pytest.raises(TemplateNotFound):
+            list(render_many(pairs))
+
+    def test_return_exceptions(self, with_app_context, with_mocked_rendering):
+        pairs = [
+            ('mocks/missing_template.md', None),
+            ('mocks/markdown_template.md', None),
+        ]
+        results = dict(render_many(pairs, return_exceptions=True))
+
+        assert isinstance(results[0], TemplateNotFound)
+        assert results[1] == render_page('mocks/markdown_template.md')
+
+    def test_processes(self, with_app_context, with_mocked_rendering):
+        pairs = [
+            ('mocks/markdown_template.md', {'name': 'Starfighter'}),
+            ('mocks/code_block_template.md', None),
+            ('mocks/missing_template.md', None),
+            ('mocks/markdown_template.md', {'name': 'Starfighter'}),
+        ]
+        results = dict(
+            render_many(pairs, processes=2, return_exceptions=True)
+        )
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert results[0] == results[3] == render_page(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+        assert results[1] == render_page('mocks/code_block_template.md')
+        assert isinstance(results[2], TemplateNotFound)
+
+    def test_no_pairs(self, with_app_context):
+        assert list(render_many([], processes=2)) == []
+
+    @pytest.mark.parametrize('processes', [0, -1])
+    def test_invalid_processes(self, with_app_context, processes):
+        with pytest.raises(ValueError):
+            render_many([('mocks/markdown_template.md', None)], processes=processes)
+
+    def test_without_app_context(self):
+        with pytest.raises(RuntimeError):
+            render_many([('mocks/markdown_template.md', None)])
+
+
+class TestPageCacheKey:
+    def test_same_inputs(self, with_app_context):
+        assert page_cache_key('mocks/markdown_template.md', name='Starfighter') == page_cache_key('mocks/markdown_template.md', name='Starfighter')
+
+    def test_different_template(self, with_app_context):
+        assert page_cache_key('mocks/markdown_template.md', name='Starfighter') != page_cache_key('mocks/code_block_template.md', name='Starfighter')
+
+    def test_different_context(self, with_app_context):
+        assert page_cache_key('mocks/markdown_template.md', name='Starfighter') != page_cache_key('mocks/markdown_template.md', name='Centauri')
+
+    def test_uncacheable_context(self, with_app_context):
+        assert page_cache_key('mocks/markdown_template.md', name=object()) is None
+
+    def test_markup_context(self, with_app_context):
+        assert page_cache_key('mocks/markdown_template.md', name=Markup('<b>Grig</b>')) is None
+        assert page_cache_key('mocks/markdown_template.md', name='<b>Grig</b>') is not None
+
+    def test_different_config(self):
+        keys = []
+
+        for engine in ('soup', 'tree'):
+            config = {'HYDRA_MARKDOWN_ENGINE': engine}
+
+            with create_app(injected_config=config).app_context():
+                keys.append(page_cache_key('mocks/markdown_template.md'))
+
+        assert keys[0] != keys[1]
+
+    def test_different_version(self, with_app_context):
+        key = page_cache_key('mocks/markdown_template.md')
+
+        with patch('hydra.utils.render_utils.render_version', return_value='hydra=0.0.0'):
+            assert page_cache_key('mocks/markdown_template.md') != key
@@ -0,0 +1,223 @@
+import pytest
+from gzip import decompress
+from unittest.mock import patch
+from flask import render_template
+
+from hydra import create_app
+from hydra.utils.render_utils import render_cached_page
+from hydra.utils.response_utils import page_etag, render_page_response
+from hydra.utils.version_utils import render_version
+
+
+def _mock_render_template(template_name: str, **context) -> str:
+    if template_name == 'page/navigation.html':
+        return '<ul></ul>'
+
+    if template_name == 'page.html':
+        return f'<article>{context["content"]}</article>'
+
+    return render_template(template_name, **context)
+
+
+@pytest.fixture
+def app():
+    app = create_app(injected_config={'HYDRA_PAGE_CACHE_MAX_ENTRIES': 0})
+
+    @app.route('/page')
+    def page():
+        return render_page_response(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+    @app.route('/unhashable')
+    def unhashable():
+        return render_page_response(
+            'mocks/markdown_template.md',
+            name='Starfighter',
+            value=object()
+        )
+
+    return app
+
+
+@pytest.fixture
+def cached_app():
+    app = create_app()
+
+    @app.route('/page')
+    def page():
+        return render_page_response(
+            'mocks/markdown_template.md',
+            name='Starfighter'
+        )
+
+    return app
+
+
+@pytest.fixture
+def with_mocked_rendering():
+    with patch('flask.render_template', side_effect=_mock_render_template):
+        with patch(
+            'hydra.utils.response_utils.render_cached_page',
+            wraps=render_cached_page
+        ) as mock:
+            yield mock
+
+
+class TestPageEtag:
+    def test_stable(self, app):
+        with app.app_context():
+            etag = page_etag('mocks/markdown_template.md', name='Starfighter')
+
+            assert len(etag) == 32
+            assert etag == page_etag(
+                'mocks/markdown_template.md',
+                name='Starfighter'
+            )
+
+    def test_context(self, app):
+        with app.app_context():
+            assert page_etag(
+                'mocks/markdown_template.md',
+                name='Starfighter'
+            ) != page_etag('mocks/markdown_template.md', name='Alex')
+
+    def test_config(self):
+        etags = []
+
+        for engine in ('soup', 'tree'):
+            config = {'HYDRA_MARKDOWN_ENGINE': engine}
+
+            with create_app(injected_config=config).app_context():
+                etags.append(page_etag('mocks/markdown_template.md'))
+
+        assert etags[0] != etags[1]
+
+    def test_unhashable_context(self, app):
+        with app.app_context():
+            assert page_etag(
+                'mocks/markdown_template.md',
+                value=object()
+            ) is None
+
+
+class TestRenderPageResponse:
+    def test_etag(self, app, with_mocked_rendering):
+        response = app.test_client().get('/page')
+
+        assert response.status_code == 200
+        assert b'Greetings, Starfighter!' in response.data
+
+        with app.app_context():
+            etag = page_etag('mocks/markdown_template.md', name='Starfighter')
+
+        assert response.get_etag() == (etag, False)
+
+    def test_not_modified(self, app, with_mocked_rendering):
+        client = app.test_client()
+        etag = client.get('/page').headers['ETag']
+
+        with_mocked_rendering.reset_mock()
+
+        response = client.get('/page', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+        assert response.data == b''
+        assert response.headers['ETag'] == etag
+        assert not with_mocked_rendering.called
+
+    def test_weak_match(self, app, with_mocked_rendering):
+        client = app.test_client()
+        etag = client.get('/page').headers['ETag']
+        response = client.get('/page', headers={'If-None-Match': f'W/{etag}'})
+
+        assert response.status_code == 304
+
+    def test_modified(self, app, with_mocked_rendering):
+        response = app.test_client().get(
+            '/page',
+            headers={'If-None-Match': '"outdated"'}
+        )
+
+        assert response.status_code == 200
+        assert with_mocked_rendering.called
+
+    def test_unhashable_context(self, app, with_mocked_rendering):
+        client = app.test_client()
+        response = client.get('/unhashable')
+        etag = response.headers['ETag']
+
+        assert response.status_code == 200
+
+        response = client.get('/unhashable', headers={'If-None-Match': etag})
+
+        assert response.status_code == 304
+
+    def test_gzip(self, cached_app, with_mocked_rendering):
+        client = cached_app.test_client()
+        plain = client.get('/page')
+        response = client.get('/page', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert response.mimetype == 'text/html'
+        assert decompress(response.data) == plain.data
+        assert response.headers['ETag'] != plain.headers['ETag']
+
+    def test_gzip_not_accepted(self, cached_app, with_mocked_rendering):
+        client = cached_app.test_client()
+        client.get('/page', headers={'Accept-Encoding': 'gzip'})
+        response = client.get(
+            '/page',
+            headers={'Accept-Encoding': 'gzip;q=0, identity'}
+        )
+
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert b'Greetings, Starfighter!' in response.data
+
+    def test_gzip_not_modified(self, cached_app, with_mocked_rendering):
+        client = cached_app.test_client()
+        headers = {'Accept-Encoding': 'gzip'}
+        etag = client.get('/page', headers=headers).headers['ETag']
+        response = client.get(
+            '/page',
+            headers={**headers, 'If-None-Match': etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+
+    def test_gzip_level(self, cached_app, with_mocked_rendering):
+        headers = {'Accept-Encoding': 'gzip'}
+        etag = cached_app.test_client().get(
+            '/page',
+            headers=headers
+        ).headers['ETag']
+        cached_app.config['HYDRA_PAGE_GZIP_LEVEL'] = 1
+        client = cached_app.test_client()
+        response = client.get('/page', headers={**headers, 'If-None-Match': etag})
+
+        assert etag.endswith('-gzip6"')
+        assert response.status_code == 200
+        assert response.headers['ETag'].endswith('-gzip1"')
+        assert decompress(response.data) == client.get('/page').data
+
+    def test_uncached_not_compressed(self, app, with_mocked_rendering):
+        response = app.test_client().get(
+            '/page',
+            headers={'Accept-Encoding': 'gzip'}
+        )
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
+
+
+class TestRenderVersion:
+    def test_versions(self):
+        version = render_version()
+
+        assert 'hydra=' in version
+        assert 'pygments=' in version
@@ -0,0 +1,144 @@
+import pytest
+from unittest.mock import patch
+
+from hydra import create_app
+from hydra.utils import section_utils
+from hydra.utils.render_utils import convert_markdown
+from hydra.utils.section_utils import (
+    configure_section_rendering,
+    render_sections,
+)
+
+
+def _document(sections: int, edited: int | None = None) -> str:
+    parts = ['Introductory paragraph.\n\n']
+
+    for index in range(sections):
+        label = 'Edited' if index == edited else 'Component'
+        parts.append(
+            f'## {label} {index}\n\n'
+            'Some *text* before the example.\n\n'
+            '### Examples\n\n'
+            '```python\n'
+            '## Not a heading\n'
+            'print("hello")\n'
+            '```\n\n'
+            '### Examples\n\n'
+            '- One\n'
+            '- Two\n\n'
+        )
+
+    return ''.join(parts)
+
+
+def _render_whole(document: str) -> tuple:
+    config = {'HYDRA_SECTION_CACHE_MAX_ENTRIES': 0}
+
+    with create_app(injected_config=config).app_context():
+        return convert_markdown(document, 'soup')
+
+
+@pytest.fixture(autouse=True)
+def app():
+    app = create_app(injected_config={'HYDRA_SECTION_MIN_SECTIONS': 2})
+
+    with app.app_context():
+        yield app
+
+
+class TestRenderSections:
+    def test_matches_whole_document(self):
+        document = _document(6)
+        html, headings = render_sections(document)
+
+        assert (html, headings) == _render_whole(document)
+        assert '<h3 id="examples-11">Examples</h3>' in html
+        assert '## Not a heading' in html
+
+    def test_edited_section(self):
+        render_sections(_document(6))
+
+        with patch.object(
+            section_utils,
+            '_convert_section',
+            wraps=section_utils._convert_section
+        ) as mock:
+            html, headings = render_sections(_document(6, edited=3))
+
+        assert mock.call_count == 1
+        assert (html, headings) == _render_whole(_document(6, edited=3))
+
+    def test_cached_sections(self):
+        render_sections(_document(6))
+
+        with patch.object(section_utils, '_process_section') as mock:
+            render_sections(_document(6))
+
+        assert not mock.called
+
+    def test_too_few_sections(self, app):
+        configure_section_rendering(app, min_sections=8)
+
+        assert render_sections(_document(6)) is None
+
+    def test_disabled(self, app):
+        configure_section_rendering(app, max_entries=0)
+
+        assert render_sections(_document(6)) is None
+
+    @pytest.mark.parametrize('markdown', [
+        'See [the docs][docs].\n\n[docs]: https://example.com\n',
+        '<div>\n\n## Inside HTML\n\n</div>\n',
+    ])
+    def test_unsplittable_document(self, markdown):
+        assert render_sections(_document(6) + markdown) is None
+
+    @pytest.mark.parametrize('extension', [
+        'toc',
+        'markdown.extensions.footnotes',
+        'markdown.extensions.toc:TocExtension',
+    ])
+    def test_document_extension(self, extension):
+        config = {
+            'HYDRA_MARKDOWN_EXTENSIONS': [extension],
+            'HYDRA_SECTION_MIN_SECTIONS': 2,
+        }
+
+        with create_app(injected_config=config).app_context():
+            assert render_sections('[TOC]\n\n' + _document(6)) is None
+
+    def test_table_of_contents(self):
+        config = {
+            'HYDRA_MARKDOWN_EXTENSIONS': ['toc'],
+            'HYDRA_SECTION_MIN_SECTIONS': 2,
+        }
+        document = '[TOC]\n\n' + _document(6)
+
+        with create_app(injected_config=config).app_context():
+            html, _ = convert_markdown(document, 'soup')
+
+        assert html.count('<div class="toc">') == 1
+        assert html.count('href="#component-5"') == 1
+
+    def test_cache_per_app(self):
+        render_sections(_document(6))
+        config = {'HYDRA_SECTION_MIN_SECTIONS': 2}
+
+        with create_app(injected_config=config).app_context():
+            with patch.object(
+                section_utils,
+                '_convert_section',
+                wraps=section_utils._convert_section
+            ) as mock:
+                render_sections(_document(6))
+
+        assert mock.called
+
+    def test_split_once(self):
+        with patch(
+            'hydra.utils.render_utils.render_sections',
+            wraps=render_sections
+        ) as mock:
+            convert_markdown('## Only section\n', 'soup')
+
+        assert mock.call_count == 1
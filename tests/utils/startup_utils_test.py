@@ -0,0 +1,54 @@
+import pytest  # noqa: F401
+
+from hydra.utils.startup_utils import (
+    ImportTiming,
+    _parse_import_line,
+    package_times,
+    profile_startup,
+)
+
+
+class TestParseImportLine:
+    def test_header(self):
+        line = 'import time: self [us] | cumulative | imported package'
+
+        assert _parse_import_line(line) is None
+
+    def test_nested_module(self):
+        line = 'import time:      1210 |      44220 |       flask.sansio.app'
+
+        assert _parse_import_line(line) == ImportTiming(
+            'flask.sansio.app',
+            0.00121,
+            0.04422,
+            3,
+        )
+
+    def test_other_output(self):
+        assert _parse_import_line('Traceback (most recent call last):') is None
+
+
+class TestPackageTimes:
+    def test_totals(self):
+        imports = [
+            ImportTiming('flask', 0.002, 0.01, 0),
+            ImportTiming('flask.app', 0.003, 0.005, 1),
+            ImportTiming('jinja2', 0.004, 0.004, 1),
+        ]
+
+        assert package_times(imports) == pytest.approx(
+            {'flask': 0.005, 'jinja2': 0.004}
+        )
+        assert list(package_times(imports)) == ['flask', 'jinja2']
+
+
+class TestProfileStartup:
+    def test_profile(self):
+        profile = profile_startup()
+        modules = {timing.module for timing in profile.imports}
+
+        assert profile.import_time > 0
+        assert profile.factory_time > 0
+        assert 'hydra' in modules
+        assert 'flask' in modules
+        assert 'pygments' not in modules
@@ -1,6 +1,20 @@
-import pytest  # noqa: F401
+import pytest
+from re import split, sub
 
-from hydra.utils.string_utils import kebab_case
+from hydra.utils.string_utils import kebab_case, kebab_case_unique, unique_slug
+
+
+def _legacy_kebab_case_word(word: str) -> str:
+    normal = sub(r'[^\w]+', '', word)
+    chars = (f'-{char.lower()}' if char.isupper() else char for char in normal)
+
+    return sub(r'^-', '', ''.join(chars))
+
+
+def _legacy_kebab_case(string: str) -> str:
+    words = split(r'[ \-_]', string)
+
+    return '-'.join(_legacy_kebab_case_word(word) for word in words)
 
 
 class TestKebabCase:
@@ -24,3 +38,56 @@ class TestKebabCase:
 
     def test_string_with_punctuation(self):
         assert kebab_case('Greetings, Programs!') == 'greetings-programs'
+
+    @pytest.mark.parametrize('string', [
+        '',
+        ' ',
+        '--',
+        '_leading underscore',
+        'Trailing space ',
+        'HTMLParser',
+        'Tom & Jerry',
+        'Ko-Dan  Armada',
+        'version 1.2.3',
+        'snake_Case_With_Caps',
+        'Ünïcödé Heading',
+        'ǅemal Title',
+        'Ⓐ Circled',
+        'Multi\nLine\tHeading',
+        '<code>Tagged</code>',
+        '日本語 Heading',
+    ])
+    def test_matches_legacy_implementation(self, string):
+        assert kebab_case(string) == _legacy_kebab_case(string)
+
+
+class TestKebabCaseUnique:
+    def test_empty_list(self):
+        assert kebab_case_unique([]) == []
+
+    def test_unique_strings(self):
+        assert kebab_case_unique(['Examples', 'Usage']) == ['examples', 'usage']
+
+    def test_duplicate_strings(self):
+        strings = ['Examples', 'Usage', 'Examples', 'examples']
+
+        assert kebab_case_unique(strings) == ['examples', 'usage', 'examples-1', 'examples-2']
+
+
+class TestUniqueSlug:
+    def test_unused_slug(self):
+        used = set()
+
+        assert unique_slug('examples', used) == 'examples'
+        assert used == {'examples'}
+
+    def test_used_slug(self):
+        used = {'examples'}
+
+        assert unique_slug('examples', used) == 'examples-1'
+        assert unique_slug('examples', used) == 'examples-2'
+
+    def test_suffixed_slug_already_used(self):
+        used = {'examples', 'examples-1'}
+
+        assert unique_slug('examples', used) == 'examples-2'
@@ -0,0 +1,61 @@
+import pytest
+from os import utime
+from jinja2 import Environment, FileSystemLoader
+
+from hydra.utils.template_utils import template_digest
+
+
+@pytest.fixture
+def templates(tmp_path):
+    (tmp_path / 'page.md').write_text("{% include 'partial.md' %}")
+    (tmp_path / 'partial.md').write_text('Partial content.')
+    (tmp_path / 'other.md').write_text('Other content.')
+
+    return tmp_path
+
+
+@pytest.fixture
+def environment(templates):
+    return Environment(loader=FileSystemLoader(templates))
+
+
+def _touch(path, content):
+    stat = path.stat()
+    path.write_text(content)
+
+    # Ensure the modification time changes on coarse-grained filesystems.
+    utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestTemplateDigest:
+    def test_is_stable(self, environment):
+        first = template_digest(environment, 'page.md')
+        second = template_digest(environment, 'page.md')
+
+        assert first == second
+
+    def test_differs_by_template(self, environment):
+        assert template_digest(environment, 'page.md') != template_digest(environment, 'other.md')
+
+    def test_missing_template(self, environment, templates):
+        missing = template_digest(environment, 'missing.md')
+
+        assert missing == template_digest(environment, 'missing.md')
+
+        (templates / 'missing.md').write_text('Found.')
+
+        assert template_digest(environment, 'missing.md') != missing
+
+    def test_template_changed(self, environment, templates):
+        digest = template_digest(environment, 'page.md')
+
+        _touch(templates / 'page.md', "{% include 'partial.md' %}\n")
+
+        assert template_digest(environment, 'page.md') != digest
+
+    def test_included_template_changed(self, environment, templates):
+        digest = template_digest(environment, 'page.md')
+
+        _touch(templates / 'partial.md', 'Changed content.')
+
+        assert template_digest(environment, 'page.md') != digest
@@ -0,0 +1,126 @@
+import pytest
+from flask import Flask
+from unittest.mock import Mock
+
+from hydra.utils.timing_utils import (
+    RequestTimings,
+    TimingHistogram,
+    get_timing_histogram,
+    init_timings,
+    observe_stages,
+    timed,
+)
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    init_timings(app)
+
+    @app.route('/timed')
+    def timed_view():
+        with timed('first'):
+            pass
+
+        with timed('second'):
+            pass
+
+        return 'Timed'
+
+    @app.route('/untimed')
+    def untimed_view():
+        return 'Untimed'
+
+    return app
+
+
+class TestRequestTimings:
+    def test_record(self):
+        timings = RequestTimings()
+        timings.record('jinja', 0.001)
+        timings.record('jinja', 0.002)
+
+        assert timings.durations == {'jinja': pytest.approx(0.003)}
+
+    def test_server_timing(self):
+        timings = RequestTimings()
+        timings.record('jinja', 0.001)
+        timings.record('markdown', 0.0025)
+
+        assert timings.server_timing() == 'jinja;dur=1.000, markdown;dur=2.500'
+
+
+class TestTimingHistogram:
+    def test_empty_histogram(self):
+        assert TimingHistogram().to_dict() == {}
+
+    def test_add(self):
+        histogram = TimingHistogram()
+
+        for duration in (0.0005, 0.003, 10.0):
+            timings = RequestTimings()
+            timings.record('jinja', duration)
+            histogram.add(timings)
+
+        stage = histogram.to_dict()['jinja']
+
+        assert stage['count'] == 3
+        assert stage['sum'] == pytest.approx(10003.5)
+        assert stage['buckets']['1'] == 1
+        assert stage['buckets']['5'] == 1
+        assert stage['buckets']['+Inf'] == 1
+        assert sum(stage['buckets'].values()) == 3
+
+
+class TestInitTimings:
+    def test_timed_request(self, app):
+        response = app.test_client().get('/timed')
+        header = response.headers['Server-Timing']
+
+        assert [metric.split(';')[0] for metric in header.split(', ')] == ['first', 'second']
+        assert get_timing_histogram(app).to_dict()['first']['count'] == 1
+
+    def test_untimed_request(self, app):
+        response = app.test_client().get('/untimed')
+
+        assert 'Server-Timing' not in response.headers
+        assert get_timing_histogram(app).to_dict() == {}
+
+
+class TestTimed:
+    def test_outside_request(self):
+        with timed('stage'):
+            pass
+
+
+class TestObserveStages:
+    def test_nested_stages(self):
+        events = []
+        observer = Mock()
+        observer.enter.side_effect = lambda stage: events.append(('enter', stage))
+        observer.exit.side_effect = lambda stage: events.append(('exit', stage))
+
+        with observe_stages(observer):
+            with timed('outer'):
+                with timed('inner'):
+                    pass
+
+        with timed('unobserved'):
+            pass
+
+        assert events == [
+            ('enter', 'outer'),
+            ('enter', 'inner'),
+            ('exit', 'inner'),
+            ('exit', 'outer'),
+        ]
+
+    def test_failed_stage(self):
+        observer = Mock()
+
+        with observe_stages(observer):
+            with pytest.raises(RuntimeError):
+                with timed('stage'):
+                    raise RuntimeError('failed')
+
+        observer.exit.assert_called_once_with('stage')
@@ -0,0 +1,163 @@
+import pytest
+from json import dump
+from threading import Event
+from unittest.mock import patch
+
+from hydra import create_app
+from hydra.utils.render_utils import render_page
+from hydra.utils.warm_utils import (
+    CacheWarmer,
+    get_cache_warmer,
+    init_cache_warming,
+)
+
+
+def _mock_render_template(template_name, **context):
+    return f'<p>{template_name}</p>'
+
+
+@pytest.fixture
+def with_mocked_rendering():
+    with patch('flask.render_template', side_effect=_mock_render_template) as mock:
+        yield mock
+
+
+def _create_app(**config):
+    return create_app(injected_config={'HYDRA_BUILD_EXCLUDE': [], **config})
+
+
+class TestCacheWarmer:
+    def test_warms_page_cache(self, with_mocked_rendering):
+        app = _create_app()
+        warmer = CacheWarmer(app, ['mocks/markdown_template.md'])
+        warmer.start()
+
+        assert warmer.wait(10)
+        assert warmer.progress()['warmed'] == 1
+
+        with app.app_context():
+            with patch('hydra.utils.render_utils._render_page') as mock:
+                render_page('mocks/markdown_template.md')
+
+        assert not mock.called
+
+    def test_failed_template(self):
+        app = _create_app()
+        warmer = CacheWarmer(app, ['invalid_template.md'])
+        warmer.start()
+        warmer.wait(10)
+
+        progress = warmer.progress()
+
+        assert progress['failed'] == 1
+        assert progress['done']
+        assert progress['ready']
+
+    def test_ready_ratio(self, with_mocked_rendering):
+        app = _create_app()
+        release = Event()
+        warmer = CacheWarmer(
+            app,
+            ['mocks/markdown_template.md', 'mocks/empty_template.md'],
+            workers=1,
+            ready_ratio=0.5,
+        )
+
+        def warm(template_name):
+            if warmer.warmed:
+                release.wait(10)
+
+            with warmer._lock:
+                warmer.warmed += 1
+
+        with patch.object(warmer, '_warm', side_effect=warm):
+            assert not warmer.is_ready
+
+            warmer.start()
+
+            while not warmer.warmed:
+                pass
+
+            assert warmer.is_ready
+            assert not warmer.progress()['done']
+
+            release.set()
+            warmer.wait(10)
+
+        assert warmer.progress()['done']
+
+    def test_started_once(self, with_mocked_rendering):
+        warmer = CacheWarmer(_create_app(), ['mocks/markdown_template.md'])
+        warmer.start()
+        warmer.wait(10)
+
+        with patch.object(warmer, 'start') as mock:
+            warmer.ensure_started()
+
+        mock.assert_not_called()
+
+    def test_restarted_after_fork(self, with_mocked_rendering):
+        with patch('hydra.utils.warm_utils.Thread'):
+            app = _create_app(HYDRA_WARM_CACHE=True)
+
+        warmer = get_cache_warmer(app)
+        client = app.test_client()
+
+        assert not warmer.is_ready
+
+        with patch('hydra.utils.warm_utils.getpid', return_value=-1):
+            client.get('/_hydra/ready')
+
+            assert warmer.wait(10)
+            assert client.get('/_hydra/ready').status_code == 200
+
+    def test_no_templates(self):
+        warmer = CacheWarmer(_create_app(), [])
+        warmer.start()
+
+        assert warmer.is_ready
+        assert warmer.progress()['total'] == 0
+
+
+class TestInitCacheWarming:
+    def test_disabled_by_default(self):
+        assert get_cache_warmer(create_app()) is None
+
+    def test_enabled(self, with_mocked_rendering):
+        app = _create_app(HYDRA_WARM_CACHE=True)
+        warmer = get_cache_warmer(app)
+
+        assert warmer.wait(10)
+        assert warmer.progress()['warmed'] == len(warmer.template_names) > 0
+
+    def test_excluded_templates(self):
+        app = create_app()
+
+        with patch.object(CacheWarmer, 'start'):
+            warmer = init_cache_warming(app)
+
+        assert warmer.template_names == []
+
+    def test_hints(self, tmp_path):
+        hints = tmp_path / 'hints.json'
+
+        with open(hints, 'w') as file:
+            dump({'mocks/empty_template.md': 10, 'mocks/markdown_template.md': 5}, file)
+
+        app = _create_app(HYDRA_WARM_CACHE_HINTS=str(hints))
+
+        with patch.object(CacheWarmer, 'start'):
+            warmer = init_cache_warming(app)
+
+        assert warmer.template_names[:2] == [
+            'mocks/empty_template.md',
+            'mocks/markdown_template.md',
+        ]
+
+    def test_invalid_hints(self, tmp_path):
+        app = _create_app(HYDRA_WARM_CACHE_HINTS=str(tmp_path / 'missing.json'))
+
+        with patch.object(CacheWarmer, 'start'):
+            warmer = init_cache_warming(app)
+
+        assert len(warmer.template_names) == 4